@@ -0,0 +1 @@
+"""Benchmarks - standalone scripts, run from the app directory with python -m."""
@@ -0,0 +1,42 @@
+"""
+Throughput of per-row encrypt_value against encrypt_series.
+
+Usage (from the app directory):
+    python -m benchmarks.bench_crypto --rows 500000 --workers 1 2 4
+"""
+import argparse
+import time
+import polars as pl
+from src.utils.crypto import encrypt_value, encrypt_series, decrypt_series, shutdown_executor
+
+
+def rate(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:>12,.0f} rows/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    series = pl.Series("password", [f"password-{i}" for i in range(args.rows)])
+
+    start = time.perf_counter()
+    series.map_elements(encrypt_value, return_dtype=pl.Binary)
+    print(f"{'map_elements':<24}{rate(args.rows, time.perf_counter() - start)}")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        tokens = encrypt_series(series, workers=workers)
+        encrypt_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decrypt_series(tokens, workers=workers)
+        decrypt_time = time.perf_counter() - start
+        print(f"{f'encrypt_series x{workers}':<24}{rate(args.rows, encrypt_time)}")
+        print(f"{f'decrypt_series x{workers}':<24}{rate(args.rows, decrypt_time)}")
+    shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+End-to-end throughput of the example CSV and JSON pipelines.
+
+Every (pipeline, sink, rows) case runs ETLOrchestrator.run in its own
+process over deterministic sources from benchmarks.generators, so peak
+memory is per case. Sinks are Parquet files (FileLoader) and SQLite as a
+local database stand-in (DatabaseLoader). Results are written as JSON and
+compared against a baseline results file; slower or larger cases beyond
+the tolerance are reported and make the exit status 1.
+
+Usage (from the app directory):
+    python -m benchmarks.bench_pipeline --rows 10000 100000 1000000 \\
+        --output results.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+import polars as pl
+from benchmarks.generators import source_files
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.adapters.loaders.database_loader import DatabaseLoader
+from src.adapters.loaders.file_loader import FileLoader
+from src.domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from src.ports.loader import Loader
+from src.utils.crypto import encrypt_value
+from src.utils.logger import ETLLogger
+from src.utils.transform_helpers import handle_paid_amount, str_to_bool, convert_to_timestamp
+
+PIPELINES = ("csv", "json")
+SINKS = ("file", "sqlite")
+# metric -> True if larger is better
+COMPARED = {"rows_per_s": True, "load_rows_per_s": True, "peak_rss_mb": False}
+
+
+def csv_pipeline(source_path: str):
+    """The test.csv -> tests job of main.py."""
+    return ETLConfig(
+        source_type=DataSourceType.CSV,
+        source_path=source_path,
+        storage_type=StorageType.DATABASE,
+        storage_config={"table_name": "tests", "create_table": True, "mode": "insert"},
+        unnest_config={},
+        transformer_config={
+            "exp_value_transforms": {"last_login": pl.from_epoch(pl.col("last_login"), time_unit="s")},
+            "value_transforms": {"paid_amount": handle_paid_amount,
+                                 "is_claimed": str_to_bool,
+                                 "created_at": convert_to_timestamp},
+        }
+    )
+
+
+def json_pipeline(source_path: str):
+    """The test.json -> users, telephone_numbers, jobs_history job of main.py."""
+    def target(table_name, path, transformer_config):
+        return ETLConfig(
+            source_type=DataSourceType.JSON,
+            source_path=source_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": table_name, "create_table": True, "mode": "insert"},
+            unnest_config={"path": path},
+            transformer_config=transformer_config,
+        )
+    return MultiTargetETLConfig(targets=[
+        target("users", "user_details.*", {
+            "columns_to_select": ["user_id", "name", "dob", "address", "username", "password",
+                                  "national_id", "created_at", "updated_at", "logged_at"],
+            "exp_value_transforms": {"logged_at": pl.from_epoch(pl.col("logged_at"), time_unit="s"),
+                                     "dob": pl.col("dob").str.to_date("%Y-%m-%d")},
+            "value_transforms": {"updated_at": convert_to_timestamp,
+                                 "created_at": convert_to_timestamp,
+                                 "national_id": encrypt_value,
+                                 "password": encrypt_value},
+        }),
+        target("telephone_numbers", "user_details.telephone_numbers[]", {
+            "columns_to_select": ["user_id", "telephone_numbers"],
+            "field_mappings": {"telephone_numbers": "telephone_number"},
+        }),
+        target("jobs_history", "jobs_history[].*", {
+            "columns_to_select": ["user_id", "occupation", "is_fulltime", "start", "end"],
+            "exp_value_transforms": {"start": pl.col("start").str.to_date("%Y-%m-%d"),
+                                     "end": pl.col("end").str.to_date("%Y-%m-%d")},
+        }),
+    ])
+
+
+class TimedLoader(Loader):
+    """Loader adding up the time and rows of another loader's loads."""
+
+    def __init__(self, loader: Loader, file_dir: Optional[str] = None):
+        self.loader = loader
+        self.file_dir = file_dir
+        self.seconds = 0.0
+        self.rows = 0
+
+    def load(self, records, config):
+        if self.file_dir:
+            # one Parquet dataset per table instead of a database table
+            config = {"path": os.path.join(self.file_dir, config["table_name"]), "format": "parquet"}
+        start = time.perf_counter()
+        success = self.loader.load(records, config)
+        self.seconds += time.perf_counter() - start
+        self.rows += records.height
+        return success
+
+    def validate_connection(self, config):
+        return True
+
+
+def run_case(pipeline: str, sink: str, source_path: str, work_dir: str, batch_size: int) -> Dict[str, Any]:
+    """Run one case in this process and measure it."""
+    ETLLogger.configure(log_level="WARNING")
+    if sink == "file":
+        loader = TimedLoader(FileLoader(), file_dir=work_dir)
+    else:
+        loader = TimedLoader(DatabaseLoader(database_uri=f"sqlite:///{os.path.join(work_dir, 'bench.db')}"))
+    if pipeline == "csv":
+        extractor, config = CsvExtractor(), csv_pipeline(source_path)
+    else:
+        extractor, config = JsonExtractor(), json_pipeline(source_path)
+    config.execution_config = {"batch_size": batch_size}
+
+    start = time.perf_counter()
+    success = ETLOrchestrator(extractor=extractor, loader=loader).run(config)
+    wall = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(f"{pipeline} -> {sink} failed")
+    return {
+        "wall_s": wall,
+        "extract_transform_s": wall - loader.seconds,
+        "load_s": loader.seconds,
+        "rows_loaded": loader.rows,
+        "load_rows_per_s": loader.rows / loader.seconds if loader.seconds else None,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def measure(pipeline: str, sink: str, rows: int, source_path: str, batch_size: int) -> Dict[str, Any]:
+    """Run one case in a fresh process."""
+    work_dir = tempfile.mkdtemp(prefix=f"bench-{pipeline}-{sink}-")
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_pipeline", "--run-case", pipeline, sink,
+             source_path, work_dir, str(batch_size)],
+            capture_output=True, text=True, check=True
+        ).stdout
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    result = {"pipeline": pipeline, "sink": sink, "rows": rows, **json.loads(output.strip().splitlines()[-1])}
+    result["rows_per_s"] = rows / result["wall_s"]
+    result["extract_transform_rows_per_s"] = rows / result["extract_transform_s"]
+    return result
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """Cases worse than their baseline by more than tolerance."""
+    previous = {(case["pipeline"], case["sink"], case["rows"]): case for case in baseline}
+    regressions = []
+    for case in results:
+        before = previous.get((case["pipeline"], case["sink"], case["rows"]))
+        if before is None:
+            continue
+        for metric, higher_is_better in COMPARED.items():
+            old, new = before.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{case['pipeline']} -> {case['sink']} @ {case['rows']:,} rows: "
+                    f"{metric} {old:,.1f} -> {new:,.1f} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--run-case":
+        pipeline, sink, source_path, work_dir, batch_size = sys.argv[2:7]
+        print(json.dumps(run_case(pipeline, sink, source_path, work_dir, int(batch_size))))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument("--sinks", nargs="+", choices=SINKS, default=list(SINKS))
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "etl-bench-data"))
+    parser.add_argument("--output", default="bench_pipeline_results.json")
+    parser.add_argument("--baseline", default=None, help="results file of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        sources = source_files(args.data_dir, rows, args.seed)
+        for pipeline in args.pipelines:
+            for sink in args.sinks:
+                case = measure(pipeline, sink, rows, sources[pipeline], args.batch_size)
+                results.append(case)
+                print(f"{pipeline:<6}{sink:<8}{rows:>12,} rows{case['wall_s']:>9.2f}s"
+                      f"{case['rows_per_s']:>14,.0f} rows/s{case['peak_rss_mb']:>9.0f} MB")
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "polars": pl.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "settings": {"batch_size": args.batch_size, "seed": args.seed},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
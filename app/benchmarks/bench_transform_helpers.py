@@ -0,0 +1,67 @@
+"""
+Benchmark map_elements over transform_helpers against transform_expressions.
+
+Usage (from the app directory):
+    python -m benchmarks.bench_transform_helpers --rows 1000000
+"""
+import argparse
+import random
+import time
+import polars as pl
+from src.utils.transform_helpers import (
+    handle_paid_amount,
+    str_to_bool,
+    convert_to_timestamp,
+    convert_date
+)
+from src.utils.transform_expressions import (
+    handle_paid_amount_expr,
+    str_to_bool_expr,
+    convert_to_timestamp_expr,
+    convert_date_expr
+)
+
+PAID_AMOUNTS = ["12.345", "99.999", "abc", "", "100", "-3.456", "0.01"]
+IS_CLAIMED = ["true", "false", "TRUE!", "f@lse", "truee", "no"]
+CREATED_AT = ["2024-01-15 10:30:00", "2024-01-15th 10:30:00", "20001-01-01",
+              "2024-01-15TEST", "2023-07-04", "Jan 15, 2024", "invalid"]
+DATES = ["2024-01-15", "2023-12-31", "01/15/2024", "invalid"]
+
+CASES = [
+    ("paid_amount", handle_paid_amount, handle_paid_amount_expr, PAID_AMOUNTS),
+    ("is_claimed", str_to_bool, str_to_bool_expr, IS_CLAIMED),
+    ("created_at", convert_to_timestamp, convert_to_timestamp_expr, CREATED_AT),
+    ("dob", convert_date, convert_date_expr, DATES),
+]
+
+
+def make_frame(rows: int, seed: int = 0) -> pl.DataFrame:
+    """Dirty string columns shaped like test.csv."""
+    rng = random.Random(seed)
+    return pl.DataFrame({
+        name: [rng.choice(pool) for _ in range(rows)]
+        for name, _, _, pool in CASES
+    })
+
+
+def timed(df: pl.DataFrame, expr: pl.Expr) -> float:
+    start = time.perf_counter()
+    df.select(expr)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"{'column':<12}{'map_elements':>14}{'expression':>14}{'speedup':>10}")
+    for name, func, expr_builder, _ in CASES:
+        scalar = timed(df, pl.col(name).map_elements(func))
+        vectorized = timed(df, expr_builder(name))
+        print(f"{name:<12}{scalar:>13.3f}s{vectorized:>13.3f}s{scalar / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
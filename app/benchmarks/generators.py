@@ -0,0 +1,132 @@
+"""
+Deterministic synthetic sources shaped like test.csv and test.json.
+
+Rows are derived from their index with integer hashing, so a file is the
+same for a given size and seed on every machine, and files of any size are
+written chunk by chunk in bounded memory.
+
+Usage (from the app directory):
+    python -m benchmarks.generators --rows 1000000 --out /tmp/bench-data
+"""
+import argparse
+import os
+from typing import List
+import polars as pl
+
+CHUNK_ROWS = 1_000_000
+
+NAMES = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+COLORS = ["red", "blue", "green", "black", "white", None]
+ADDRESSES = ["12 Long Road, Springfield", "7 Hill St\nShelbyville", "", None]
+# the dirty values the example transforms exist for
+PAID_AMOUNTS = ["12.345", "99.999", "abc", "", "100", "-3.456", "0.01", None]
+IS_CLAIMED = ["true", "false", "TRUE!", "f@lse", "truee", "no"]
+CREATED_AT = ["2024-01-15 10:30:00", "2024-01-15th 10:30:00", "20001-01-01", "2024-01-15TEST",
+              "2023-07-04", "Jan 15, 2024", "1st Jan 2020", "2024-02-29T23:59:59", "invalid"]
+OCCUPATIONS = ["engineer", "teacher", "nurse", "driver", "chef"]
+
+
+def _hash(index: pl.Expr, seed: int, salt: int) -> pl.Expr:
+    """Deterministic 31-bit pseudo-random integer per row index."""
+    mixed = (index * 2654435761 + seed * 97 + salt * 7919) % 2147483647
+    return (mixed * 48271) % 2147483647
+
+
+def _pick(index: pl.Expr, pool: List, seed: int, salt: int) -> pl.Expr:
+    """One value of pool per row."""
+    dtype = pl.String if all(isinstance(value, str) or value is None for value in pool) else None
+    return pl.lit(pl.Series(pool, dtype=dtype)).gather(_hash(index, seed, salt) % len(pool))
+
+
+def tests_chunk(start: int, rows: int, seed: int = 0) -> pl.DataFrame:
+    """Rows start..start+rows of the test.csv shaped table."""
+    i = pl.int_range(start, start + rows, dtype=pl.Int64)
+    return pl.select(
+        id=i,
+        name=_pick(i, NAMES, seed, 1),
+        address=_pick(i, ADDRESSES, seed, 2),
+        color=_pick(i, COLORS, seed, 3),
+        created_at=_pick(i, CREATED_AT, seed, 4),
+        last_login=1_700_000_000 + _hash(i, seed, 5) % 10_000_000,
+        is_claimed=_pick(i, IS_CLAIMED, seed, 6),
+        paid_amount=_pick(i, PAID_AMOUNTS, seed, 7),
+    )
+
+
+def users_chunk(start: int, rows: int, seed: int = 0) -> pl.DataFrame:
+    """Rows start..start+rows of the nested test.json users documents."""
+    i = pl.int_range(start, start + rows, dtype=pl.Int64)
+    user_id = pl.format("user-{}", i)
+    phones = pl.concat_list([pl.format("+94 77 {} {}", i, pl.lit(n)) for n in range(3)])
+    jobs = pl.concat_list([
+        pl.struct(
+            occupation=_pick(i + n, OCCUPATIONS, seed, 20 + n),
+            is_fulltime=_hash(i, seed, 30 + n) % 2 == 0,
+            start=pl.format("20{}-0{}-1{}", 10 + n * 4, 1 + n, n),
+            end=pl.format("20{}-0{}-2{}", 12 + n * 4, 2 + n, n),
+        )
+        for n in range(3)
+    ])
+    return pl.select(
+        user_id=user_id,
+        user_details=pl.struct(
+            name=_pick(i, NAMES, seed, 11),
+            dob=pl.format("19{}-0{}-1{}", 60 + _hash(i, seed, 12) % 40, 1 + _hash(i, seed, 13) % 9, _hash(i, seed, 14) % 10),
+            address=_pick(i, ADDRESSES, seed, 15),
+            username=pl.format("{}{}", _pick(i, NAMES, seed, 11), i),
+            password=pl.format("secret-{}", _hash(i, seed, 16) % 1000),
+            national_id=pl.format("{}V", 900000000 + i),
+            created_at=_pick(i, CREATED_AT, seed, 17),
+            updated_at=_pick(i, CREATED_AT, seed, 18),
+            logged_at=1_700_000_000 + _hash(i, seed, 19) % 10_000_000,
+            telephone_numbers=phones.list.head(_hash(i, seed, 8) % 4),
+        ),
+        jobs_history=jobs.list.head(_hash(i, seed, 9) % 4),
+    )
+
+
+def _write_chunks(path: str, rows: int, seed: int, chunk, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        for start in range(0, rows, CHUNK_ROWS):
+            write(chunk(start, min(CHUNK_ROWS, rows - start), seed), handle, start == 0)
+    os.replace(tmp_path, path)
+
+
+def write_tests_csv(path: str, rows: int, seed: int = 0) -> str:
+    """Write (or reuse) a test.csv shaped file of rows rows."""
+    if not os.path.exists(path):
+        _write_chunks(path, rows, seed, tests_chunk,
+                      lambda df, handle, first: df.write_csv(handle, include_header=first))
+    return path
+
+
+def write_users_json(path: str, rows: int, seed: int = 0) -> str:
+    """Write (or reuse) an NDJSON file of rows test.json shaped users."""
+    if not os.path.exists(path):
+        _write_chunks(path, rows, seed, users_chunk, lambda df, handle, first: df.write_ndjson(handle))
+    return path
+
+
+def source_files(directory: str, rows: int, seed: int = 0) -> dict:
+    """Paths of both sources for rows and seed, generated on first use."""
+    os.makedirs(directory, exist_ok=True)
+    return {
+        "csv": write_tests_csv(os.path.join(directory, f"tests-{rows}-{seed}.csv"), rows, seed),
+        "json": write_users_json(os.path.join(directory, f"users-{rows}-{seed}.ndjson"), rows, seed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmarks/data")
+    args = parser.parse_args()
+    for rows in args.rows:
+        for name, path in source_files(args.out, rows, args.seed).items():
+            print(f"{name:<6}{rows:>14,} rows  {os.path.getsize(path) / 2 ** 20:>10.1f} MB  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,19 @@ import multiprocessing as mp
 from app.src.etl.orchestrator import ETLOrchestrator
 from app.src.adapters.loaders.storage_loader_factory import StorageLoaderFactory
 from app.src.adapters.extractors.source_extractor_factory import SourceExtractorFactory
-from app.src.domain.entities import ETLConfig, DataSourceType, StorageType
+from app.src.domain.entities import ETLConfig, ETLJob, MultiTargetETLConfig, DataSourceType, StorageType
+from app.src.etl.scheduler import ETLScheduler
 from app.src.adapters.loaders.database_loader import DatabaseLoader
+from app.src.adapters.loaders.file_loader import FileLoader
 from app.src.adapters.extractors.csv_extractor import CsvExtractor
 from app.src.adapters.extractors.json_extractor import JsonExtractor
+from app.src.adapters.extractors.parquet_extractor import ParquetExtractor
+from app.src.adapters.extractors.ipc_extractor import IpcExtractor
 from app.src.utils.transform_helpers import handle_paid_amount,str_to_bool,convert_to_timestamp,convert_date
 from app.src.utils.crypto import encrypt_value
 from app.src.utils.logger import ETLLogger
-def example_json_to_database():
-    """Example: Extract JSON, transform, and load to database."""
+def json_to_database_config() -> MultiTargetETLConfig:
+    """users, telephone_numbers and jobs_history from one scan of test.json."""
     config_user = ETLConfig(
         source_type=DataSourceType.JSON,
         source_path="app/src/data/test.json",
@@ -19,11 +23,11 @@ def example_json_to_database():
         storage_config={
             "table_name": "users",
             "create_table": True,
-            "mode": "insert"
+            "mode": "upsert",
+            "key_columns": ["user_id"]
         },
         unnest_config = {
-            "column_to_extract":"user_details",
-            "operations":{"0":"unnest"}
+            "path": "user_details.*"
         },
         transformer_config={
             "columns_to_select": ["user_id","name","dob","address","username","password","national_id","created_at","updated_at","logged_at"],
@@ -46,12 +50,7 @@ def example_json_to_database():
             "mode": "insert"
         },
         unnest_config = {
-            "preop":{
-                "column_to_extract":"user_details",
-                "operations":{"0":"unnest"}
-            },
-            "column_to_extract": "telephone_numbers",
-            "operations":{"0":"explod"}
+            "path": "user_details.telephone_numbers[]"
         },
         transformer_config={
             "columns_to_select": ["user_id","telephone_numbers"],
@@ -70,11 +69,7 @@ def example_json_to_database():
             "mode": "insert"
         },
         unnest_config = {
-            "column_to_extract":"jobs_history",
-            "operations":{
-                            "0":"explode",
-                            "1":"unnest"
-                          }
+            "path": "jobs_history[].*"
         },
         transformer_config={
             "columns_to_select": ["user_id","occupation","is_fulltime","start","end"],
@@ -84,13 +79,18 @@ def example_json_to_database():
         }
     )
     configlist = [config_user,config_telephone,config_job_history]
-    for config in configlist:
-        run_etl_task(config)
+    # one scan of test.json feeds all three tables (loaded in this order)
+    return MultiTargetETLConfig(targets=configlist)
 
 
-def example_csv_to_database():
-    """Example: Extract CSV, transform, and load to database."""
-    config = ETLConfig(
+def example_json_to_database():
+    """Example: Extract JSON, transform, and load to database."""
+    run_etl_task(json_to_database_config())
+
+
+def csv_to_database_config() -> ETLConfig:
+    """tests table from test.csv."""
+    return ETLConfig(
         source_type=DataSourceType.CSV,
         source_path="app/src/data/test.csv",
         storage_type=StorageType.DATABASE,
@@ -107,8 +107,21 @@ def example_csv_to_database():
                                 "created_at":convert_to_timestamp},
         }
     )
-    
-    run_etl_task(config)
+
+
+def example_csv_to_database():
+    """Example: Extract CSV, transform, and load to database."""
+    run_etl_task(csv_to_database_config())
+
+
+def example_scheduled_jobs():
+    """Example: Run the JSON and CSV jobs concurrently as a DAG."""
+    jobs = [
+        ETLJob("users", json_to_database_config()),
+        ETLJob("tests", csv_to_database_config()),
+    ]
+    # at most two jobs writing the default database at once
+    ETLScheduler(max_workers=mp.cpu_count(), target_limits={("database", "default"): 2}).run(jobs)
 
 def run_etl_task(config: ETLConfig):
     """unction to execute ETL for a single configuration."""
@@ -116,18 +129,22 @@ def run_etl_task(config: ETLConfig):
         orchestrator = ETLOrchestrator()
         orchestrator.run(config)
     except Exception as e:
-        print(f"Error running ETL for {config.storage_config['table_name']}: {e}")
+        targets = config.targets if isinstance(config, MultiTargetETLConfig) else [config]
+        table_names = ", ".join(t.storage_config['table_name'] for t in targets)
+        print(f"Error running ETL for {table_names}: {e}")
         
     
 def run_example():
     StorageLoaderFactory.register(StorageType.DATABASE, DatabaseLoader)
+    StorageLoaderFactory.register(StorageType.FILE, FileLoader)
     SourceExtractorFactory.register(DataSourceType.CSV, CsvExtractor)
     SourceExtractorFactory.register(DataSourceType.JSON, JsonExtractor)
+    SourceExtractorFactory.register(DataSourceType.PARQUET, ParquetExtractor)
+    SourceExtractorFactory.register(DataSourceType.IPC, IpcExtractor)
     ETLLogger.configure(
         log_level="DEBUG"
     )
-    example_json_to_database()
-    example_csv_to_database()
+    example_scheduled_jobs()
     
 if __name__ == "__main__":
 
@@ -1,41 +1,56 @@
 """CSV file extractor adapter."""
 
-import csv
-import os
 import polars as pl
+from typing import Any, Dict, List, Optional, Union
 from ...ports.extractor import Extractor
+from .schema_registry import cached_schema, parse_overrides
+from .sources import resolve_sources, with_compression
+
+CSV_EXTENSIONS = with_compression([".csv"])
 
 
 class CsvExtractor(Extractor):
     """Extractor for CSV files."""
     
-    def extract(self, source_path: str) -> pl.LazyFrame:
+    def extract(
+        self,
+        source_path: Union[str, List[str]],
+        source_config: Optional[Dict[str, Any]] = None
+    ) -> pl.LazyFrame:
         """
-        Extract data from a CSV file.
+        Extract data from CSV files.
         
-        First row is treated as headers.
+        First row of every file is treated as headers. Accepts a file, glob,
+        directory or list of them; gzip/zstd files are decompressed
+        transparently and all files are scanned in parallel into one plan.
+
+        Config options:
+        - include_file_paths: Column to add holding each row's source file
+        - schema_overrides: Dict of column to dtype
+        - schema_registry and related options: see cached_schema
         """
-        if not self.validate_source(source_path):
+        files = resolve_sources(source_path, CSV_EXTENSIONS)
+        if not files:
             raise ValueError(f"Invalid CSV source: {source_path}")
         
-        lazy_df = pl.scan_csv(source_path)
+        source_config = source_config or {}
+        include_file_paths = source_config.get("include_file_paths")
+        schema = cached_schema(
+            source_path, files, source_config,
+            infer=lambda overrides: pl.scan_csv(files, schema_overrides=overrides or None).collect_schema(),
+            columns_of=lambda path: pl.scan_csv(path, infer_schema_length=0).collect_schema().names(),
+            strict_columns=True
+        )
+        if schema is not None:
+            return pl.scan_csv(files, schema=schema, include_file_paths=include_file_paths)
+        overrides = parse_overrides(source_config.get("schema_overrides"))
+        lazy_df = pl.scan_csv(files, schema_overrides=overrides or None, include_file_paths=include_file_paths)
         return lazy_df
     
-    def validate_source(self, source_path: str) -> bool:
-        """Validate CSV file exists and is readable."""
-        print(os.getcwd())
-        if not os.path.exists(source_path):
-            return False
-        
-        if not source_path.lower().endswith('.csv'):
-            return False
-        return True
-        # try:
-        #     with open(source_path, 'r', encoding='utf-8') as file:
-        #         # Try to read first line to validate CSV format
-        #         csv.Sniffer().sniff(file.read(1024))
-        #         file.seek(0)
-        #     return True
-        # except (csv.Error, IOError):
-        #     return False
+    def validate_source(self, source_path: Union[str, List[str]]) -> bool:
+        """Validate the source resolves to at least one CSV file."""
+        return bool(resolve_sources(source_path, CSV_EXTENSIONS))
 
+    def source_files(self, source_path: Union[str, List[str]]) -> List[str]:
+        """Files the source resolves to, in scan order."""
+        return resolve_sources(source_path, CSV_EXTENSIONS)
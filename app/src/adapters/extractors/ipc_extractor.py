@@ -0,0 +1,44 @@
+"""Arrow IPC file extractor adapter."""
+
+import os
+import polars as pl
+from typing import Any, Dict, List, Optional, Union
+from ...ports.extractor import Extractor
+from .sources import resolve_sources
+
+IPC_EXTENSIONS = ('.arrow', '.ipc', '.feather')
+
+
+class IpcExtractor(Extractor):
+    """Extractor for Arrow IPC (Feather v2) files and datasets."""
+
+    def extract(
+        self,
+        source_path: Union[str, List[str]],
+        source_config: Optional[Dict[str, Any]] = None
+    ) -> pl.LazyFrame:
+        """
+        Extract data from an Arrow IPC file, glob, dataset directory or list of them.
+
+        Uncompressed local files are memory-mapped, so only the columns and
+        record batches the plan needs are paged in. Directories are read
+        recursively with Hive partition columns restored.
+
+        Config options:
+        - include_file_paths: Column to add holding each row's source file
+        """
+        files = resolve_sources(source_path, IPC_EXTENSIONS)
+        if not files:
+            raise ValueError(f"Invalid IPC source: {source_path}")
+
+        hive = isinstance(source_path, str) and os.path.isdir(source_path)
+        return pl.scan_ipc(files, hive_partitioning=hive or None,
+                           include_file_paths=(source_config or {}).get("include_file_paths"))
+
+    def validate_source(self, source_path: Union[str, List[str]]) -> bool:
+        """Validate the source resolves to at least one IPC file."""
+        return bool(resolve_sources(source_path, IPC_EXTENSIONS))
+
+    def source_files(self, source_path: Union[str, List[str]]) -> List[str]:
+        """Files the source resolves to, in scan order."""
+        return resolve_sources(source_path, IPC_EXTENSIONS)
@@ -0,0 +1,202 @@
+"""Incremental reader for top-level JSON arrays and concatenated JSON objects."""
+
+import codecs
+import itertools
+import json
+import mmap
+import os
+import polars as pl
+from polars.io.plugins import register_io_source
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+DEFAULT_BATCH_ROWS = 50000
+CHUNK_BYTES = 8 * 1024 * 1024
+INFER_SCHEMA_LENGTH = 100
+WHITESPACE = " \t\n\r"
+
+
+def is_json_array(path: str) -> bool:
+    """True if the first non-whitespace character of the file is '['."""
+    with open(path, "rb") as handle:
+        head = handle.read(4096).lstrip(b" \t\n\r\xef\xbb\xbf")
+    return head[:1] == b"["
+
+
+def iter_json_objects(path: str, chunk_bytes: int = CHUNK_BYTES) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array, or each of several
+    concatenated (or newline-delimited) JSON values, one at a time.
+
+    The file is memory-mapped and decoded chunk_bytes at a time, so only the
+    current chunk and the element being parsed are held in memory.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = 0
+        buffer, pos = "", 0
+        array = None
+        expect_value = True
+        count = 0
+
+        def refill() -> bool:
+            nonlocal offset, buffer, pos
+            if offset >= size:
+                return False
+            chunk = data[offset:offset + chunk_bytes]
+            offset += len(chunk)
+            buffer = buffer[pos:] + utf8.decode(chunk, final=offset >= size)
+            pos = 0
+            return True
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                if refill():
+                    continue
+                if array:
+                    raise ValueError(f"Unterminated JSON array in {path}")
+                return
+
+            char = buffer[pos]
+            if array is None:
+                array = char == "["
+                if array:
+                    pos += 1
+                    continue
+            if array:
+                if char == "]":
+                    if expect_value and count:
+                        raise ValueError(f"Trailing ',' in the JSON array in {path}")
+                    rest = buffer[pos + 1:].strip(WHITESPACE)
+                    while not rest and refill():
+                        rest = buffer[pos + 1:].strip(WHITESPACE)
+                    if rest:
+                        raise ValueError(f"Unexpected data after the JSON array in {path}")
+                    return
+                if not expect_value:
+                    if char != ",":
+                        raise ValueError(f"Expected ',' between array elements in {path}")
+                    pos += 1
+                    expect_value = True
+                    continue
+
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                # only an element cut by the chunk end continues in the next
+                # chunk, any other error fails without reading further
+                if _cut_at_end(e, buffer) and refill():
+                    continue
+                raise ValueError(f"Invalid JSON in {path}: {e}") from e
+            if end == len(buffer) and offset < size:
+                # a number or literal may continue in the next chunk
+                refill()
+                continue
+            pos = end
+            expect_value = False
+            count += 1
+            yield value
+
+
+def _cut_at_end(error: json.JSONDecodeError, buffer: str) -> bool:
+    """True if error may only mean the buffer ends inside the value."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    if error.msg.startswith("Invalid \\"):
+        # an escape sequence cut short, at most \uXXXX long
+        return error.pos >= len(buffer) - 6
+    return not buffer[error.pos:].strip(WHITESPACE)
+
+
+def _objects(path: str, chunk_bytes: int) -> Iterator[Dict[str, Any]]:
+    for value in iter_json_objects(path, chunk_bytes):
+        if not isinstance(value, dict):
+            raise ValueError(f"Top-level JSON values must be objects in {path}, got {type(value).__name__}")
+        yield value
+
+
+def infer_schema(
+    paths: Sequence[str],
+    infer_schema_length: int = INFER_SCHEMA_LENGTH,
+    schema_overrides: Optional[Dict[str, pl.DataType]] = None,
+    chunk_bytes: int = CHUNK_BYTES
+) -> pl.Schema:
+    """Schema of the first infer_schema_length objects of the files."""
+    rows = list(itertools.islice(
+        itertools.chain.from_iterable(_objects(path, chunk_bytes) for path in paths), infer_schema_length
+    ))
+    schema = pl.from_dicts(rows, infer_schema_length=None).schema if rows else pl.Schema()
+    return pl.Schema({**schema, **(schema_overrides or {})})
+
+
+def iter_batches(
+    paths: Sequence[str],
+    schema: pl.Schema,
+    batch_size: int = DEFAULT_BATCH_ROWS,
+    include_file_paths: Optional[str] = None,
+    chunk_bytes: int = CHUNK_BYTES
+) -> Iterator[pl.DataFrame]:
+    """Yield DataFrames of at most batch_size rows with the given schema."""
+    for path in paths:
+        objects = _objects(path, chunk_bytes)
+        while True:
+            rows = list(itertools.islice(objects, batch_size))
+            if not rows:
+                break
+            batch = pl.from_dicts(rows, schema=schema, strict=False)
+            if include_file_paths:
+                batch = batch.with_columns(pl.lit(path, pl.String).alias(include_file_paths))
+            yield batch
+
+
+def iter_record_batches(paths: Sequence[str], schema: pl.Schema,
+                        batch_size: int = DEFAULT_BATCH_ROWS) -> Iterator["pa.RecordBatch"]:
+    """Arrow record batches of at most batch_size rows (needs pyarrow)."""
+    for batch in iter_batches(paths, schema, batch_size):
+        yield from batch.to_arrow().to_batches()
+
+
+def scan_json_array(
+    paths: Sequence[str],
+    schema: Optional[pl.Schema] = None,
+    schema_overrides: Optional[Dict[str, pl.DataType]] = None,
+    batch_size: int = DEFAULT_BATCH_ROWS,
+    include_file_paths: Optional[str] = None
+) -> pl.LazyFrame:
+    """
+    LazyFrame over JSON array files, read batch by batch when collected.
+
+    Projections, filters and row limits of the plan are applied to every
+    batch as it is produced, so collect_batches and the streaming engine
+    never hold more than a few batches.
+    """
+    paths: List[str] = list(paths)
+    if schema is None:
+        schema = infer_schema(paths, schema_overrides=schema_overrides)
+    full_schema = pl.Schema({**schema, **({include_file_paths: pl.String} if include_file_paths else {})})
+
+    def source(with_columns: Optional[List[str]], predicate: Optional[pl.Expr],
+               n_rows: Optional[int], _batch_size: Optional[int]) -> Iterator[pl.DataFrame]:
+        remaining = n_rows
+        for batch in iter_batches(paths, schema, batch_size, include_file_paths):
+            if predicate is not None:
+                batch = batch.filter(predicate)
+            if with_columns is not None:
+                batch = batch.select(with_columns)
+            if remaining is not None:
+                batch = batch.head(remaining)
+                remaining -= batch.height
+            yield batch
+            if remaining == 0:
+                return
+
+    return register_io_source(source, schema=full_schema, explain_name="JSON ARRAY",
+                              explain_detail=", ".join(paths))
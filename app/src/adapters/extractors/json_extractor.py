@@ -1,33 +1,97 @@
 """JSON file extractor adapter."""
 
-import json
-import os
 import polars as pl
+from typing import Any, Dict, List, Optional, Union
 from ...ports.extractor import Extractor
+from .json_array_reader import DEFAULT_BATCH_ROWS, infer_schema, is_json_array, scan_json_array
+from .schema_registry import cached_schema, parse_overrides
+from .sources import COMPRESSION_SUFFIXES, resolve_sources, with_compression
+
+JSON_EXTENSIONS = with_compression([".json", ".ndjson", ".jsonl"])
+JSON_FORMATS = ("auto", "ndjson", "array")
 
 
 class JsonExtractor(Extractor):
     """Extractor for JSON files."""
     
-    def extract(self, source_path: str) -> pl.LazyFrame:
+    def extract(
+        self,
+        source_path: Union[str, List[str]],
+        source_config: Optional[Dict[str, Any]] = None
+    ) -> pl.LazyFrame:
         """
-        Extract data from a JSON file.
+        Extract data from newline-delimited JSON files or arrays of JSON objects.
         
-        Supports both single JSON objects and arrays of JSON objects.
+        Accepts a file, glob, directory or list of them; gzip/zstd files are
+        decompressed transparently and all files are scanned in parallel
+        into one plan. Arrays (and concatenated objects) are parsed
+        incrementally by the JSON array reader, in batches of json_batch_size
+        rows, so a large array is never loaded as a whole.
+
+        Config options:
+        - json_format: 'auto' (default; arrays are detected by a leading '['),
+          'ndjson' or 'array' (also reads concatenated objects)
+        - json_batch_size: Rows per batch read from arrays (default 50000)
+        - include_file_paths: Column to add holding each row's source file
+        - schema_overrides: Dict of column to dtype
+        - schema_registry and related options: see cached_schema
         """
-        if not self.validate_source(source_path):
+        files = resolve_sources(source_path, JSON_EXTENSIONS)
+        if not files:
             raise ValueError(f"Invalid JSON source: {source_path}")
         
-        lazy_df = pl.scan_ndjson(source_path)
+        source_config = source_config or {}
+        include_file_paths = source_config.get("include_file_paths")
+        if self._is_array_source(files, source_config.get("json_format", "auto")):
+            return self._extract_arrays(source_path, files, source_config)
+        schema = cached_schema(
+            source_path, files, source_config,
+            infer=lambda overrides: pl.scan_ndjson(files, schema_overrides=overrides or None).collect_schema(),
+            columns_of=lambda path: pl.scan_ndjson(path, infer_schema_length=1).collect_schema().names(),
+            strict_columns=False
+        )
+        if schema is not None:
+            return pl.scan_ndjson(files, schema=schema, include_file_paths=include_file_paths)
+        overrides = parse_overrides(source_config.get("schema_overrides"))
+        lazy_df = pl.scan_ndjson(files, schema_overrides=overrides or None, include_file_paths=include_file_paths)
         return lazy_df
     
-    def validate_source(self, source_path: str) -> bool:
-        """Validate JSON file exists and is readable."""
-        if not os.path.exists(source_path):
+    def _is_array_source(self, files: List[str], json_format: str) -> bool:
+        if json_format not in JSON_FORMATS:
+            raise ValueError(f"Unsupported json_format: {json_format}")
+        compressed = [path for path in files if path.lower().endswith(COMPRESSION_SUFFIXES[1:])]
+        if json_format == "ndjson":
             return False
-        
-        if not source_path.lower().endswith('.json'):
+        if json_format == "auto" and not any(is_json_array(path) for path in files if path not in compressed):
             return False
-        
+        if compressed:
+            raise ValueError(f"JSON arrays must be uncompressed files: {compressed}")
         return True
 
+    def _extract_arrays(
+        self,
+        source_path: Union[str, List[str]],
+        files: List[str],
+        source_config: Dict[str, Any]
+    ) -> pl.LazyFrame:
+        schema = cached_schema(
+            source_path, files, source_config,
+            infer=lambda overrides: infer_schema(files, schema_overrides=overrides),
+            columns_of=lambda path: infer_schema([path], infer_schema_length=1).names(),
+            strict_columns=False
+        )
+        return scan_json_array(
+            files,
+            schema=schema,
+            schema_overrides=parse_overrides(source_config.get("schema_overrides")),
+            batch_size=source_config.get("json_batch_size", DEFAULT_BATCH_ROWS),
+            include_file_paths=source_config.get("include_file_paths")
+        )
+
+    def validate_source(self, source_path: Union[str, List[str]]) -> bool:
+        """Validate the source resolves to at least one JSON file."""
+        return bool(resolve_sources(source_path, JSON_EXTENSIONS))
+
+    def source_files(self, source_path: Union[str, List[str]]) -> List[str]:
+        """Files the source resolves to, in scan order."""
+        return resolve_sources(source_path, JSON_EXTENSIONS)
@@ -0,0 +1,47 @@
+"""Parquet file extractor adapter."""
+
+import os
+import polars as pl
+from typing import Any, Dict, List, Optional, Union
+from ...ports.extractor import Extractor
+from .sources import resolve_sources
+
+PARQUET_EXTENSIONS = (".parquet",)
+
+
+class ParquetExtractor(Extractor):
+    """Extractor for Parquet files and partitioned Parquet datasets."""
+
+    def extract(
+        self,
+        source_path: Union[str, List[str]],
+        source_config: Optional[Dict[str, Any]] = None
+    ) -> pl.LazyFrame:
+        """
+        Extract data from a Parquet file, glob, dataset directory or list of them.
+
+        Directories are read recursively with Hive partition columns
+        (key=value directories) restored. Column projections and row
+        filters added to the returned plan are pushed into the scan, and
+        row group statistics are used to skip row groups.
+
+        Config options:
+        - include_file_paths: Column to add holding each row's source file
+        """
+        files = resolve_sources(source_path, PARQUET_EXTENSIONS)
+        if not files:
+            raise ValueError(f"Invalid Parquet source: {source_path}")
+
+        include_file_paths = (source_config or {}).get("include_file_paths")
+        if isinstance(source_path, str) and os.path.isdir(source_path):
+            return pl.scan_parquet(os.path.join(source_path, "**", "*.parquet"), hive_partitioning=True,
+                                   include_file_paths=include_file_paths)
+        return pl.scan_parquet(files, include_file_paths=include_file_paths)
+
+    def validate_source(self, source_path: Union[str, List[str]]) -> bool:
+        """Validate the source resolves to at least one Parquet file."""
+        return bool(resolve_sources(source_path, PARQUET_EXTENSIONS))
+
+    def source_files(self, source_path: Union[str, List[str]]) -> List[str]:
+        """Files the source resolves to, in scan order."""
+        return resolve_sources(source_path, PARQUET_EXTENSIONS)
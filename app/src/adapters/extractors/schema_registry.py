@@ -0,0 +1,215 @@
+"""Cached source schemas so text scans skip type inference."""
+
+import json
+import os
+import threading
+import time
+import polars as pl
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from ...utils.logger import get_logger
+
+SchemaOverrides = Dict[str, Union[str, pl.DataType]]
+# column names of a file, valid while its size and mtime are unchanged
+FileHeader = Dict[str, Any]
+DRIFT_MODES = ("update", "warn", "error")
+
+
+def encode_dtype(dtype: pl.DataType) -> Any:
+    """JSON form of a Polars dtype, e.g. "Int64" or {"list": "String"}."""
+    if isinstance(dtype, pl.Struct):
+        return {"struct": {field.name: encode_dtype(field.dtype) for field in dtype.fields}}
+    if isinstance(dtype, pl.List):
+        return {"list": encode_dtype(dtype.inner)}
+    if isinstance(dtype, pl.Array):
+        return {"array": encode_dtype(dtype.inner), "size": dtype.size}
+    if isinstance(dtype, pl.Datetime):
+        return {"datetime": dtype.time_unit, "time_zone": dtype.time_zone}
+    if isinstance(dtype, pl.Duration):
+        return {"duration": dtype.time_unit}
+    if isinstance(dtype, pl.Decimal):
+        return {"decimal": [dtype.precision, dtype.scale]}
+    if isinstance(dtype, pl.Enum):
+        return {"enum": dtype.categories.to_list()}
+    return type(dtype).__name__ if isinstance(dtype, pl.DataType) else dtype.__name__
+
+
+def decode_dtype(value: Any) -> pl.DataType:
+    """Inverse of encode_dtype; also accepts dtype names from job configs."""
+    if isinstance(value, pl.DataType) or (isinstance(value, type) and issubclass(value, pl.DataType)):
+        return value
+    if isinstance(value, str):
+        dtype = getattr(pl, value, None)
+        if not (isinstance(dtype, type) and issubclass(dtype, pl.DataType)):
+            raise ValueError(f"Unknown dtype: {value}")
+        return dtype
+    if "struct" in value:
+        return pl.Struct({name: decode_dtype(inner) for name, inner in value["struct"].items()})
+    if "list" in value:
+        return pl.List(decode_dtype(value["list"]))
+    if "array" in value:
+        return pl.Array(decode_dtype(value["array"]), value["size"])
+    if "datetime" in value:
+        return pl.Datetime(value["datetime"], value.get("time_zone"))
+    if "duration" in value:
+        return pl.Duration(value["duration"])
+    if "decimal" in value:
+        return pl.Decimal(*value["decimal"])
+    if "enum" in value:
+        return pl.Enum(value["enum"])
+    raise ValueError(f"Unknown dtype: {value}")
+
+
+class SchemaRegistry:
+    """Schemas stored in one JSON file, keyed by source."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def get(self, key: str) -> Optional[pl.Schema]:
+        """Return the cached schema for key, or None."""
+        with self._lock:
+            entry = self._read().get(key)
+        if entry is None:
+            return None
+        return pl.Schema({name: decode_dtype(dtype) for name, dtype in entry["columns"].items()})
+
+    def headers(self, key: str) -> Dict[str, FileHeader]:
+        """Column names of the files of key read by earlier runs, by path."""
+        with self._lock:
+            entry = self._read().get(key) or {}
+        return entry.get("files", {})
+
+    def put(self, key: str, schema: pl.Schema, headers: Optional[Dict[str, FileHeader]] = None):
+        """Store the schema and file headers for key (the file is replaced atomically)."""
+        with self._lock:
+            entries = self._read()
+            entries[key] = {
+                "columns": {name: encode_dtype(dtype) for name, dtype in schema.items()},
+                "files": headers or {},
+                "updated_at": time.time(),
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(entries, handle, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def parse_overrides(overrides: Optional[SchemaOverrides]) -> Dict[str, pl.DataType]:
+    """Per-column dtype overrides from a job config."""
+    return {name: decode_dtype(dtype) for name, dtype in (overrides or {}).items()}
+
+
+def schema_key(source_path: Union[str, Sequence[str]]) -> str:
+    """Default registry key: the configured source, not the files it matches today."""
+    return source_path if isinstance(source_path, str) else json.dumps(list(source_path))
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _file_headers(
+    files: List[str],
+    known: Dict[str, FileHeader],
+    columns_of: Callable[[str], List[str]]
+) -> Dict[str, FileHeader]:
+    """Column names of every file, read only for files changed since they were cached."""
+    headers = {}
+    for path in files:
+        size, mtime_ns = _stat(path)
+        header = known.get(path)
+        if header is None or (header["size"], header["mtime_ns"]) != (size, mtime_ns):
+            header = {"size": size, "mtime_ns": mtime_ns, "columns": columns_of(path)}
+        headers[path] = header
+    return headers
+
+
+def cached_schema(
+    source_path: Union[str, Sequence[str]],
+    files: List[str],
+    source_config: Dict[str, Any],
+    infer: Callable[[Dict[str, pl.DataType]], pl.Schema],
+    columns_of: Callable[[str], List[str]],
+    strict_columns: bool
+) -> Optional[pl.Schema]:
+    """
+    Schema to pass to the scan, or None when no registry is configured.
+
+    The first run infers the schema (with the overrides applied) and caches
+    it. Later runs only check every file's column names, cached per file
+    and re-read only when its size or mtime changed: a file whose columns
+    no longer match the cache is reported as drift.
+
+    Config options:
+    - schema_registry: Path of the JSON registry file
+    - schema_key: Registry key (default: the source path)
+    - schema_overrides: Dict of column to dtype (or dtype name)
+    - schema_drift: 'update' (log, re-infer and cache, default), 'warn'
+      (log and re-infer for this run only, the cache keeps the old schema)
+      or 'error' (raise ValueError)
+    - verify_schema: If True, also re-infer and report changed dtypes
+
+    Args:
+        infer: Infers the schema of the files with the given overrides
+        columns_of: Reads the column names of one file
+        strict_columns: If True every file must have exactly the cached
+            columns (CSV), otherwise new columns are drift (NDJSON)
+    """
+    registry_path = source_config.get("schema_registry")
+    if not registry_path:
+        return None
+    drift_mode = source_config.get("schema_drift", "update")
+    if drift_mode not in DRIFT_MODES:
+        raise ValueError(f"Unsupported schema_drift mode: {drift_mode}")
+
+    logger = get_logger("Adapters.Extractor.SchemaRegistry")
+    registry = SchemaRegistry(registry_path)
+    key = source_config.get("schema_key") or schema_key(source_path)
+    overrides = parse_overrides(source_config.get("schema_overrides"))
+    cached = registry.get(key)
+    if cached is None:
+        schema = infer(overrides)
+        registry.put(key, schema)
+        logger.info(f"Cached schema of {len(schema)} columns for '{key}'")
+        return schema
+
+    known = registry.headers(key)
+    headers = _file_headers(files, known, columns_of)
+    drift = []
+    inferred = None
+    for path, header in headers.items():
+        names = header["columns"]
+        added = [name for name in names if name not in cached]
+        removed = [name for name in cached if name not in names] if strict_columns else []
+        if added or removed or (strict_columns and names != list(cached)):
+            drift.append(f"{path}: added {added}, removed {removed}")
+    if source_config.get("verify_schema", False):
+        inferred = infer(overrides)
+        drift.extend(
+            f"column '{name}' is {dtype}, cached {cached[name]}"
+            for name, dtype in inferred.items() if name in cached and dtype != cached[name]
+        )
+
+    if drift:
+        message = f"Schema drift for '{key}': " + "; ".join(drift)
+        if drift_mode == "error":
+            raise ValueError(message)
+        logger.warning(message)
+        # the cached schema no longer fits the files, never scan with it
+        schema = inferred if inferred is not None else infer(overrides)
+        registry.put(key, schema if drift_mode == "update" else cached, headers)
+        return schema
+
+    if headers != known:
+        registry.put(key, cached, headers)
+    return pl.Schema({name: overrides.get(name, dtype) for name, dtype in cached.items()})
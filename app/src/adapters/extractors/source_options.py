@@ -0,0 +1,73 @@
+"""Column projection and row filters applied to an extracted scan."""
+
+import operator
+import polars as pl
+from functools import reduce
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+FilterSpec = Union[pl.Expr, Sequence[Tuple[Any, ...]]]
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def filter_expr(filters: FilterSpec) -> pl.Expr:
+    """
+    Build a row filter expression.
+
+    filters is either a Polars expression or a list of
+    (column, op, value) tuples that must all hold. op is one of
+    ==, !=, <, <=, >, >=, in, not in, or (column, 'is_null') /
+    (column, 'is_not_null') without a value.
+    """
+    if isinstance(filters, pl.Expr):
+        return filters
+    if not filters:
+        raise ValueError("filters must not be empty")
+    exprs = []
+    for spec in filters:
+        column, op, *value = spec
+        col = pl.col(column)
+        if op == "is_null":
+            exprs.append(col.is_null())
+        elif op == "is_not_null":
+            exprs.append(col.is_not_null())
+        elif len(value) != 1:
+            raise ValueError(f"Filter {spec} needs exactly one value")
+        elif op in COMPARISONS:
+            exprs.append(COMPARISONS[op](col, value[0]))
+        elif op == "in":
+            exprs.append(col.is_in(value[0]))
+        elif op == "not in":
+            exprs.append(~col.is_in(value[0]))
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return reduce(operator.and_, exprs)
+
+
+def apply_source_options(records: pl.LazyFrame, source_config: Optional[Dict[str, Any]]) -> pl.LazyFrame:
+    """
+    Restrict a scan to the configured columns and rows.
+
+    Both are added to the lazy plan, so Polars pushes them into the scan:
+    unused columns are never read and Parquet row groups whose statistics
+    cannot match the filter are skipped.
+
+    Config options:
+    - columns: Columns to read (default: all)
+    - filters: Row filter, see filter_expr
+    """
+    source_config = source_config or {}
+    columns: Optional[List[str]] = source_config.get("columns")
+    filters = source_config.get("filters")
+    if filters is not None:
+        records = records.filter(filter_expr(filters))
+    if columns:
+        records = records.select(columns)
+    return records
@@ -0,0 +1,47 @@
+"""Resolve a source path, glob, directory or list of them into files."""
+
+import glob
+import os
+from typing import List, Sequence, Tuple, Union
+
+SourcePath = Union[str, Sequence[str]]
+
+# Polars detects and decompresses these transparently when scanning
+COMPRESSION_SUFFIXES = ("", ".gz", ".zst", ".zstd")
+
+
+def with_compression(extensions: Sequence[str]) -> Tuple[str, ...]:
+    """File extensions plus their compressed variants, e.g. .csv.gz."""
+    return tuple(ext + suffix for ext in extensions for suffix in COMPRESSION_SUFFIXES)
+
+
+def resolve_sources(source_path: SourcePath, extensions: Sequence[str]) -> List[str]:
+    """
+    Expand a source into the files to scan, in a stable order.
+
+    - a list is resolved entry by entry
+    - a directory yields every file below it with one of the extensions
+    - a glob yields the files it matches
+    - a plain path must exist and have one of the extensions
+
+    Returns:
+        The matching files, empty if there are none
+    """
+    if not isinstance(source_path, str):
+        files = []
+        for entry in source_path:
+            files.extend(f for f in resolve_sources(entry, extensions) if f not in files)
+        return files
+
+    extensions = tuple(ext.lower() for ext in extensions)
+    if os.path.isdir(source_path):
+        return sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(source_path)
+            for name in names if name.lower().endswith(extensions)
+        )
+    if glob.has_magic(source_path):
+        return sorted(path for path in glob.glob(source_path, recursive=True) if os.path.isfile(path))
+    if os.path.isfile(source_path) and source_path.lower().endswith(extensions):
+        return [source_path]
+    return []
@@ -1,23 +1,94 @@
-"""Database loader adapter using SQLite."""
+"""Database loader adapter writing to MySQL or any SQLAlchemy database URI."""
 
 import sqlite3
 import os
+import tempfile
+import threading
+import uuid
 import polars as pl
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine, make_url
 # from ...domain.entities import Record
 from ...ports.loader import Loader
 from ...utils.logger import get_logger
+from .mysql_load_data import write_load_data_file, load_data_statement, load_data_refused
+
+LOAD_METHODS = ("write_database", "load_data", "executemany")
+MODES = ("insert", "replace", "upsert")
+# connect argument enabling LOAD DATA LOCAL INFILE, per MySQL driver
+LOCAL_INFILE_ARGS = {
+    "pymysql": "local_infile",
+    "mysqlconnector": "allow_local_infile",
+    "mysqldb": "local_infile",
+}
 
 class DatabaseLoader(Loader):
-    """Loader for SQLite database storage."""
-    def __init__(self):
+    """Loader for MySQL (default) or any database reachable by a SQLAlchemy URI."""
+    def __init__(self, database_uri: Optional[str] = None):
         self.user = os.getenv("DB_USER", "your_username")
         self.password = os.getenv("DB_PASSWORD", "your_password")
         self.host = os.getenv("DB_HOST", "localhost")
         self.port = os.getenv("DB_PORT", "3306")
         self.database = os.getenv("DB_NAME", "your_database_name")
-        self.database_uri = f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+        self.database_uri = database_uri or f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+        self.pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+        self.pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
         self.logger = get_logger("Adapters.Loader.DatabaseLoader")
+        self._engine: Optional[Engine] = None
+        self._engine_pid: Optional[int] = None
+        self._engine_lock = threading.Lock()
+        self._load_data_available = True
+        # tables known to exist on the current engine
+        self._ensured_tables: Set[str] = set()
+
+    @property
+    def engine(self) -> Engine:
+        """
+        Pooled engine reused across batches and jobs.
+
+        Created on first use and again in a forked child, where the parent's
+        pooled connections must not be shared.
+        """
+        with self._engine_lock:
+            if self._engine is None or self._engine_pid != os.getpid():
+                if self._engine is not None:
+                    # forked: drop the inherited pool without closing the parent's sockets
+                    self._engine.dispose(close=False)
+                self._engine = create_engine(
+                    self.database_uri,
+                    pool_size=self.pool_size,
+                    max_overflow=self.max_overflow,
+                    pool_recycle=self.pool_recycle,
+                    pool_pre_ping=self.pool_pre_ping,
+                    connect_args=self._connect_args(),
+                )
+                self._engine_pid = os.getpid()
+                self._ensured_tables = set()
+            return self._engine
+
+    def _connect_args(self) -> Dict[str, Any]:
+        url = make_url(self.database_uri)
+        if url.get_backend_name() != "mysql":
+            return {}
+        infile_arg = LOCAL_INFILE_ARGS.get(url.get_driver_name())
+        return {infile_arg: True} if infile_arg else {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # engines and locks do not cross process boundaries
+        state = self.__dict__.copy()
+        state["_engine"] = None
+        state["_engine_pid"] = None
+        del state["_engine_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._engine_lock = threading.Lock()
+
     def load(self, records: pl.DataFrame, config: Dict[str, Any]) -> bool:
         """
         Load records into a mysql database.
@@ -25,7 +96,27 @@ class DatabaseLoader(Loader):
         Config options:
         - table_name: Name of the table to insert into
         - create_table: If True, create table if it doesn't exist (default: True)
-        - mode: 'insert' or 'replace' (default: 'insert')
+        - mode: 'insert' (append), 'replace' (REPLACE rows with the same key)
+          or 'upsert' (insert new rows, update existing ones) (default: 'insert').
+          replace and upsert bulk-load the batch into a temporary staging
+          table and merge it into the target with one set-based statement.
+        - key_columns: Key columns for upsert; required outside MySQL, where
+          they name the ON CONFLICT target
+        - update_columns: Columns updated on upsert (default: all non-key columns)
+        - load_method: 'write_database', 'load_data' (MySQL LOAD DATA LOCAL
+          INFILE, falls back to 'executemany' if the server refuses it) or
+          'executemany' (chunked multi-row INSERT) (default: 'write_database')
+        - chunk_size: Rows per executemany call (default: 10000)
+        - parallel_partitions: Split the batch into this many partitions
+          written concurrently over separate pooled connections, each
+          committing on its own; at most pool_size + max_overflow are
+          written at once (default: 1)
+        - partition_by: Column whose hash assigns rows to partitions, so the
+          same key always goes through the same connection (default: row ranges).
+          replace and upsert batches are only split when it is set (for
+          upsert, to one of key_columns), as partitions merging overlapping
+          keys can deadlock on InnoDB gap locks; otherwise they are written
+          serially
         """
         if records.is_empty():
             return True
@@ -33,24 +124,209 @@ class DatabaseLoader(Loader):
         table_name = config.get('table_name', 'etl_data')
         create_table = config.get('create_table', True)
         mode = config.get('mode', 'insert')
-        
+        load_method = config.get('load_method', 'write_database')
+        if load_method not in LOAD_METHODS:
+            raise ValueError(f"Unsupported load_method: {load_method}")
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}")
         
         try:
-            records.write_database(
-                table_name=table_name,
-                connection=self.database_uri,
-                if_table_exists='append',
-            )
+            if create_table:
+                self._ensure_table(records, table_name)
+            partitions = self._partition(records, config) if self._can_partition(mode, config) else [records]
+            if len(partitions) == 1:
+                self._load_partition(records, table_name, mode, load_method, config)
+            else:
+                # more writers than pooled connections would wait on checkout and time out
+                workers = min(len(partitions), self.pool_size + self.max_overflow)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(self._load_partition, part, table_name, mode, load_method, config)
+                        for part in partitions
+                    ]
+                failed = []
+                for i, future in enumerate(futures):
+                    if future.exception() is not None:
+                        failed.append(i)
+                        self.logger.error(f"Partition {i} of table '{table_name}' failed: {future.exception()}")
+                if failed:
+                    written = sum(partitions[i].height for i in range(len(partitions)) if i not in failed)
+                    self.logger.error(
+                        f"Loaded {written} of {records.height} rows to '{table_name}', "
+                        f"partitions {failed} of {len(partitions)} failed"
+                    )
+                    return False
             self.logger.info(f"Successfully wrote data to table '{table_name}'")
             return True
             
         except Exception as e:
             self.logger.exception(f"Error loading to database: {e}")
             return False
+
+    def _load_partition(self, records: pl.DataFrame, table_name: str, mode: str, load_method: str, config: Dict[str, Any]):
+        """Write one partition in its own transaction on its own pooled connection."""
+        with self.engine.begin() as connection:
+            if mode == 'insert':
+                self._write(records, table_name, load_method, config, connection)
+            else:
+                self._merge(records, table_name, mode, load_method, config, connection)
+
+    def _can_partition(self, mode: str, config: Dict[str, Any]) -> bool:
+        """True unless partitions of a merge could lock the same keys."""
+        if mode == 'insert' or config.get('parallel_partitions', 1) <= 1:
+            return True
+        partition_by = config.get('partition_by')
+        key_columns = config.get('key_columns') or []
+        if partition_by and (not key_columns or partition_by in key_columns):
+            return True
+        self.logger.warning(
+            f"mode '{mode}' writes serially: parallel_partitions needs partition_by "
+            f"set to a key column to avoid lock conflicts between partitions"
+        )
+        return False
+
+    @staticmethod
+    def _partition(records: pl.DataFrame, config: Dict[str, Any]) -> List[pl.DataFrame]:
+        """Split a batch by row ranges or by hash of partition_by."""
+        partitions = min(config.get('parallel_partitions', 1), records.height)
+        if partitions <= 1:
+            return [records]
+        partition_by = config.get('partition_by')
+        if partition_by:
+            return (
+                records
+                .with_columns((pl.col(partition_by).hash() % partitions).alias("__partition"))
+                .partition_by("__partition", include_key=False, maintain_order=True)
+            )
+        size = -(-records.height // partitions)
+        return [records.slice(offset, size) for offset in range(0, records.height, size)]
     
+    def _ensure_table(self, records: pl.DataFrame, table_name: str):
+        """
+        Create the target table from the batch schema if it does not exist.
+        Checked once per table and engine, not on every batch.
+        """
+        engine = self.engine
+        if table_name in self._ensured_tables:
+            return
+        with engine.begin() as connection:
+            if not inspect(connection).has_table(table_name):
+                records.head(0).write_database(
+                    table_name=table_name,
+                    connection=connection,
+                    if_table_exists='append',
+                )
+        self._ensured_tables.add(table_name)
+
+    def _write(self, records: pl.DataFrame, table_name: str, load_method: str, config: Dict[str, Any], connection: Connection):
+        """Append records to a table with the selected load method."""
+        if load_method == 'load_data' and self._can_load_data():
+            try:
+                self._load_data_infile(records, table_name, connection)
+                return
+            except Exception as e:
+                # a refused LOAD DATA loaded nothing; data and connection
+                # errors propagate, as a retry could load rows twice
+                if not load_data_refused(e):
+                    raise
+                self.logger.warning(f"LOAD DATA LOCAL INFILE unavailable, using executemany: {e}")
+                self._load_data_available = False
+        if load_method == 'write_database':
+            records.write_database(
+                table_name=table_name,
+                connection=connection,
+                if_table_exists='append',
+            )
+        else:
+            self._load_executemany(records, table_name, config.get('chunk_size', 10000), connection)
+
+    def _merge(self, records: pl.DataFrame, table_name: str, mode: str, load_method: str, config: Dict[str, Any], connection: Connection):
+        """Bulk-load records into a staging table and merge it into the target."""
+        quote = connection.dialect.identifier_preparer.quote
+        staging = f"{table_name}_staging_{uuid.uuid4().hex[:8]}"
+        columns = ", ".join(quote(name) for name in records.columns)
+        connection.execute(text(
+            f"CREATE TEMPORARY TABLE {quote(staging)} AS "
+            f"SELECT {columns} FROM {quote(table_name)} WHERE 1 = 0"
+        ))
+        try:
+            # temporary tables are only visible to this connection, so no write_database
+            staging_method = 'load_data' if load_method == 'load_data' else 'executemany'
+            self._write(records, staging, staging_method, config, connection)
+            connection.execute(text(self._merge_statement(records.columns, table_name, staging, mode, config, connection)))
+        finally:
+            drop = "DROP TEMPORARY TABLE" if connection.dialect.name == "mysql" else "DROP TABLE"
+            connection.execute(text(f"{drop} IF EXISTS {quote(staging)}"))
+
+    @staticmethod
+    def _merge_statement(column_names: List[str], table_name: str, staging: str, mode: str, config: Dict[str, Any], connection: Connection) -> str:
+        """Set-based REPLACE / upsert statement for the connection's dialect."""
+        dialect = connection.dialect.name
+        quote = connection.dialect.identifier_preparer.quote
+        columns = ", ".join(quote(name) for name in column_names)
+        source = ", ".join(f"s.{quote(name)}" for name in column_names)
+        select = f"SELECT {source} FROM {quote(staging)} AS s WHERE 1 = 1"
+
+        if mode == 'replace':
+            if dialect not in ("mysql", "sqlite"):
+                raise ValueError(f"mode 'replace' is not supported on {dialect}")
+            return f"REPLACE INTO {quote(table_name)} ({columns}) {select}"
+
+        key_columns = config.get('key_columns', [])
+        update_columns = config.get('update_columns') or [c for c in column_names if c not in key_columns]
+        if dialect == "mysql":
+            if not update_columns:
+                return f"INSERT IGNORE INTO {quote(table_name)} ({columns}) {select}"
+            assignments = ", ".join(f"{quote(c)} = s.{quote(c)}" for c in update_columns)
+            return f"INSERT INTO {quote(table_name)} ({columns}) {select} ON DUPLICATE KEY UPDATE {assignments}"
+
+        if not key_columns:
+            raise ValueError(f"mode 'upsert' needs key_columns on {dialect}")
+        conflict = ", ".join(quote(c) for c in key_columns)
+        if not update_columns:
+            action = "DO NOTHING"
+        else:
+            action = "DO UPDATE SET " + ", ".join(f"{quote(c)} = excluded.{quote(c)}" for c in update_columns)
+        return f"INSERT INTO {quote(table_name)} ({columns}) {select} ON CONFLICT ({conflict}) {action}"
+
+    def _can_load_data(self) -> bool:
+        return self._load_data_available and make_url(self.database_uri).get_backend_name() == "mysql"
+
+    def _load_data_infile(self, records: pl.DataFrame, table_name: str, connection: Connection):
+        """Write the batch to a temporary file and ingest it with LOAD DATA."""
+        with tempfile.TemporaryDirectory(prefix="etl_load_") as tmp_dir:
+            path = os.path.join(tmp_dir, f"{table_name}.tsv")
+            columns, assignments = write_load_data_file(records, path)
+            connection.exec_driver_sql(load_data_statement(table_name, path, columns, assignments))
+
+    def _load_executemany(self, records: pl.DataFrame, table_name: str, chunk_size: int, connection: Connection):
+        """Insert the batch with chunked multi-row executemany calls."""
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(name) for name in records.columns)
+        params = [f"p{i}" for i in range(records.width)]
+        statement = text(
+            f"INSERT INTO {preparer.quote(table_name)} ({columns}) "
+            f"VALUES ({', '.join(':' + p for p in params)})"
+        )
+        for offset in range(0, records.height, chunk_size):
+            chunk = records.slice(offset, chunk_size)
+            connection.execute(statement, [dict(zip(params, row)) for row in chunk.iter_rows()])
+
     def validate_connection(self, config: Dict[str, Any]) -> bool:
+        """Check out a pooled connection and run a trivial query on it."""
         try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
             return True
-        except Exception:
+        except Exception as e:
+            self.logger.error(f"Database connection check failed: {e}")
             return False
 
+    def dispose(self):
+        """Close all pooled connections."""
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+            self._engine = None
+            self._engine_pid = None
+            self._ensured_tables = set()
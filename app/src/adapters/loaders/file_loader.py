@@ -0,0 +1,172 @@
+"""Columnar file loader adapter writing Parquet, Arrow IPC or CSV datasets."""
+
+import fcntl
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from urllib.parse import quote
+import polars as pl
+from typing import Any, Dict, List, Union
+from ...ports.loader import Loader
+from ...utils.logger import get_logger
+
+FORMATS = {
+    "parquet": ("parquet", "zstd"),
+    "ipc": ("arrow", "zstd"),
+    "csv": ("csv", "uncompressed"),
+}
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_LOCK_SUFFIX = ".manifest.lock"
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+CSV_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class FileLoader(Loader):
+    """Loader appending batches to one file dataset per target path."""
+
+    def __init__(self):
+        self.logger = get_logger("Adapters.Loader.FileLoader")
+
+    def load(self, records: Union[pl.DataFrame, pl.LazyFrame], config: Dict[str, Any]) -> bool:
+        """
+        Append records to a file dataset.
+
+        Every batch becomes new part files inside the dataset directory and
+        is recorded in its _manifest.json, so all batches of a run form one
+        dataset readable with e.g. pl.scan_parquet(f"{path}/**/*.parquet",
+        hive_partitioning=True). LazyFrames are streamed to disk with the
+        sink_* methods and never fully materialized.
+
+        Config options:
+        - path: Dataset directory
+        - format: 'parquet', 'ipc' or 'csv' (default: 'parquet')
+        - compression: Codec for the format (default: zstd, csv uncompressed)
+        - row_group_size: Rows per Parquet row group (default: Polars default)
+        - partition_by: Columns for Hive-style key=value directories
+        """
+        if isinstance(records, pl.DataFrame) and records.is_empty():
+            return True
+
+        path = config.get('path')
+        file_format = config.get('format', 'parquet')
+        if not path:
+            raise ValueError("FileLoader needs a 'path' in storage_config")
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        try:
+            os.makedirs(path, exist_ok=True)
+            existing = read_manifest(path).get("format", file_format)
+            if existing != file_format:
+                raise ValueError(f"Dataset '{path}' is {existing}, not {file_format}")
+            written = self._sink(records.lazy(), path, file_format, config)
+            self._update_manifest(path, file_format, records.lazy().collect_schema(), written)
+            self.logger.info(f"Successfully wrote {len(written)} files to '{path}'")
+            return True
+
+        except Exception as e:
+            self.logger.exception(f"Error loading to file dataset: {e}")
+            return False
+
+    def _sink(self, records: pl.LazyFrame, path: str, file_format: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Stream records into new part files and return what was written."""
+        extension, default_compression = FORMATS[file_format]
+        compression = config.get('compression', default_compression)
+        if file_format == 'csv':
+            extension += CSV_SUFFIXES.get(compression, "")
+        prefix = f"part-{uuid.uuid4().hex[:12]}"
+        partition_by = config.get('partition_by') or []
+        if isinstance(partition_by, str):
+            partition_by = [partition_by]
+
+        if partition_by:
+            def part_path(args) -> str:
+                keys = args.partition_keys.row(0, named=True)
+                hive = "/".join(f"{quote(str(k), safe='')}={_hive_value(v)}" for k, v in keys.items())
+                return f"{hive}/{prefix}-{args.index_in_partition:05d}.{extension}"
+            target = pl.PartitionBy(path, key=partition_by, include_key=False, file_path_provider=part_path)
+        else:
+            target = os.path.join(path, f"{prefix}.{extension}")
+
+        rows = {}
+
+        def record_rows(args):
+            for sinked in args.paths:
+                rows[os.path.relpath(sinked.path, path)] = sinked.num_rows
+
+        if file_format == 'parquet':
+            records.sink_parquet(target, compression=compression, row_group_size=config.get('row_group_size'),
+                                 mkdir=True, sinked_paths_callback=record_rows)
+        elif file_format == 'ipc':
+            records.sink_ipc(target, compression=compression, mkdir=True, sinked_paths_callback=record_rows)
+        else:
+            # sink_csv has no written-paths callback, row counts stay unknown
+            records.sink_csv(target, compression=compression, check_extension=False, mkdir=True)
+
+        if not rows:
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name.startswith(prefix):
+                        rows[os.path.relpath(os.path.join(root, name), path)] = None
+        return [
+            {"path": relative, "rows": num_rows, "bytes": os.path.getsize(os.path.join(path, relative))}
+            for relative, num_rows in sorted(rows.items())
+        ]
+
+    def _update_manifest(self, path: str, file_format: str, schema: pl.Schema, written: List[Dict[str, Any]]):
+        """
+        Append the new part files to the dataset manifest (atomically replaced).
+
+        The read-modify-write holds an exclusive lock on a sidecar lock file
+        next to the dataset directory, so loaders in other threads, processes
+        or scheduled jobs writing the same dataset never drop each other's
+        entries. The lock uses fcntl.flock, which makes FileLoader POSIX-only.
+        """
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        with _manifest_lock(path):
+            manifest = read_manifest(path) or {"format": file_format, "files": []}
+            manifest["schema"] = {name: str(dtype) for name, dtype in schema.items()}
+            manifest["files"].extend(written)
+            tmp_path = f"{manifest_path}.{uuid.uuid4().hex[:12]}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(manifest, handle, indent=2)
+            os.replace(tmp_path, manifest_path)
+
+    def validate_connection(self, config: Dict[str, Any]) -> bool:
+        """Check the dataset directory exists (or can be created) and is writable."""
+        path = config.get('path') if isinstance(config, dict) else config.storage_config.get('path')
+        if not path:
+            return False
+        try:
+            os.makedirs(path, exist_ok=True)
+            return os.access(path, os.W_OK)
+        except OSError as e:
+            self.logger.error(f"File dataset check failed: {e}")
+            return False
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Return the manifest of a dataset directory, or an empty dict."""
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+@contextmanager
+def _manifest_lock(path: str):
+    """Hold an exclusive OS lock on the dataset's manifest lock file (POSIX only)."""
+    with open(os.path.normpath(path) + MANIFEST_LOCK_SUFFIX, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _hive_value(value: Any) -> str:
+    if value is None:
+        return HIVE_NULL
+    return quote(str(value), safe="")
@@ -0,0 +1,96 @@
+"""Helpers to bulk-load a DataFrame into MySQL with LOAD DATA LOCAL INFILE."""
+
+import polars as pl
+from typing import List, Tuple
+
+# Server (ER_NOT_ALLOWED_COMMAND, ER_CLIENT_LOCAL_FILES_DISABLED) and client
+# (CR_LOAD_DATA_LOCAL_INFILE_REJECTED) errors refusing LOAD DATA LOCAL INFILE
+LOAD_DATA_REFUSED = {1148, 3948, 2068}
+
+# MySQL's default LOAD DATA escaping: backslash escapes, \N is NULL
+NULL_MARKER = r"\N"
+ESCAPES = [
+    ("\\", "\\\\"),
+    ("\t", "\\t"),
+    ("\n", "\\n"),
+    ("\r", "\\r"),
+    ("\x00", "\\0"),
+]
+
+
+def _escape(expr: pl.Expr) -> pl.Expr:
+    for old, new in ESCAPES:
+        expr = expr.str.replace_all(old, new, literal=True)
+    return expr
+
+
+def _quote_identifier(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def to_load_data_columns(records: pl.DataFrame) -> Tuple[pl.DataFrame, List[str], List[str]]:
+    """
+    Render every column as MySQL LOAD DATA text.
+
+    Strings are escaped, NULLs become \\N, booleans 1/0, dates and
+    timestamps ISO text. Binary columns (e.g. from encrypt_value) are hex
+    encoded into a user variable and decoded with UNHEX on the server.
+
+    Returns:
+        The text DataFrame, the column list and the SET assignments
+    """
+    exprs, columns, assignments = [], [], []
+    for name, dtype in records.schema.items():
+        col = pl.col(name)
+        if dtype == pl.Binary:
+            rendered = col.bin.encode("hex")
+            variable = f"@v{len(assignments)}"
+            columns.append(variable)
+            assignments.append(f"{_quote_identifier(name)} = UNHEX({variable})")
+        else:
+            if dtype == pl.Boolean:
+                rendered = col.cast(pl.Int8).cast(pl.Utf8)
+            elif dtype == pl.Date:
+                rendered = col.dt.to_string("%Y-%m-%d")
+            elif isinstance(dtype, pl.Datetime):
+                rendered = col.dt.replace_time_zone(None).dt.to_string("%Y-%m-%d %H:%M:%S%.6f")
+            elif dtype == pl.Utf8 or dtype == pl.Categorical or isinstance(dtype, pl.Enum):
+                rendered = _escape(col.cast(pl.Utf8))
+            elif dtype.is_numeric():
+                rendered = col.cast(pl.Utf8)
+            else:
+                raise ValueError(f"Column '{name}' of type {dtype} cannot be bulk loaded")
+            columns.append(_quote_identifier(name))
+        exprs.append(rendered.fill_null(NULL_MARKER).alias(name))
+    return records.select(exprs), columns, assignments
+
+
+def write_load_data_file(records: pl.DataFrame, path: str) -> Tuple[List[str], List[str]]:
+    """Write records to a tab separated file LOAD DATA can read."""
+    text_df, columns, assignments = to_load_data_columns(records)
+    text_df.write_csv(path, separator="\t", include_header=False, quote_style="never", line_terminator="\n")
+    return columns, assignments
+
+
+def load_data_statement(table_name: str, path: str, columns: List[str], assignments: List[str]) -> str:
+    """LOAD DATA LOCAL INFILE statement matching write_load_data_file."""
+    escaped_path = path.replace("\\", "\\\\").replace("'", "\\'")
+    statement = (
+        f"LOAD DATA LOCAL INFILE '{escaped_path}' INTO TABLE {_quote_identifier(table_name)} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+        "LINES TERMINATED BY '\\n' "
+        f"({', '.join(columns)})"
+    )
+    if assignments:
+        statement += f" SET {', '.join(assignments)}"
+    return statement
+
+
+def load_data_refused(error: BaseException) -> bool:
+    """True if error is MySQL refusing LOAD DATA LOCAL INFILE itself, not the data."""
+    orig = getattr(error, "orig", None) or error
+    code = getattr(orig, "errno", None)
+    if code is None and orig.args and isinstance(orig.args[0], int):
+        code = orig.args[0]
+    return code in LOAD_DATA_REFUSED
@@ -1,19 +1,32 @@
 
-from typing import Dict, Type
+import os
+import threading
+from typing import Dict, Tuple, Type
 from ...domain.entities import StorageType
 from ...ports.loader import Loader
 class StorageLoaderFactory:
     """Factory to return loader instances based on StorageType."""
 
     _registry: Dict[StorageType, Type[Loader]] = {}
+    # one loader per storage type and process, so pooled connections are
+    # reused across batches and jobs but never shared with a forked child
+    _instances: Dict[Tuple[StorageType, int], Loader] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register(cls, storage_type: StorageType, loader_cls: Type[Loader]):
-        cls._registry[storage_type] = loader_cls
+        with cls._lock:
+            cls._registry[storage_type] = loader_cls
+            for key in [key for key in cls._instances if key[0] == storage_type]:
+                del cls._instances[key]
 
     @classmethod
     def get_loader(cls, storage_type: StorageType) -> Loader:
         loader_cls = cls._registry.get(storage_type)
         if not loader_cls:
             raise ValueError(f"Unsupported storage type: {storage_type}")
-        return loader_cls()
\ No newline at end of file
+        key = (storage_type, os.getpid())
+        with cls._lock:
+            if key not in cls._instances:
+                cls._instances[key] = loader_cls()
+            return cls._instances[key]
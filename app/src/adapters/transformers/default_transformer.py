@@ -1,23 +1,119 @@
 """Default transformer adapter with configurable transformation rules."""
 
+import threading
 import polars as pl
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Tuple, Union
 # from ...domain.entities import Record
 from ...ports.transformer import Transformer
+from ...utils.logger import get_logger
+from ...utils import transform_helpers as helpers
+from ...utils import transform_expressions as expressions
+from ...utils import crypto
+from ...utils.timestamp_formats import SAMPLE_SIZE, FormatCache, LearnedFormats, learn_formats
+
+VALUE_TRANSFORM_STRATEGIES = ("direct", "auto", "distinct")
+# 'auto' (opt-in) evaluates a Python transform once per distinct value when a batch
+# has at most this many distinct values per row.
+DISTINCT_RATIO = 0.5
+# Distinct results remembered per column across batches.
+MEMO_SIZE = 100000
+
+
+class LruMemo:
+    """Bounded map of transform inputs to results, least recently used evicted first."""
+
+    def __init__(self, max_size: int = MEMO_SIZE):
+        self.max_size = max_size
+        self._values: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def lookup(self, keys: List[Any]) -> Tuple[Dict[Any, Any], List[Any]]:
+        """Return the cached results for keys and the keys that are missing."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._values:
+                    self._values.move_to_end(key)
+                    found[key] = self._values[key]
+                else:
+                    missing.append(key)
+        return found, missing
+
+    def store(self, results: Dict[Any, Any]):
+        """Remember results, evicting the least recently used beyond max_size."""
+        with self._lock:
+            self._values.update(results)
+            for key in results:
+                self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def __getstate__(self):
+        # process workers start with an empty memo
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_size"])
 
 
 class DefaultTransformer(Transformer):
     """Default transformer with configurable rules."""
-    
-    def transform(self, records: pl.DataFrame, config: Dict[str, Any] = None) -> pl.DataFrame:
+
+    # Python callables that have an equivalent vectorized expression builder.
+    _expression_registry: Dict[Callable, Callable[[str], pl.Expr]] = {
+        helpers.safe_number: expressions.safe_number_expr,
+        helpers.truncate_amount: expressions.truncate_amount_expr,
+        helpers.handle_paid_amount: expressions.handle_paid_amount_expr,
+        helpers.str_to_bool: expressions.str_to_bool_expr,
+        helpers.convert_to_timestamp: expressions.convert_to_timestamp_expr,
+        helpers.convert_date: expressions.convert_date_expr,
+        crypto.encrypt_value: crypto.encrypt_expr,
+        crypto.decrypt_value: crypto.decrypt_expr,
+    }
+
+    def __init__(self):
+        self.logger = get_logger("Adapters.Transformer.DefaultTransformer")
+        self._reported_slow_paths = set()
+        self._memos: Dict[Tuple[str, Callable], LruMemo] = {}
+        self._timestamp_formats: Dict[str, LearnedFormats] = {}
+
+    @classmethod
+    def register_expression(cls, transform_func: Callable, expr_builder: Callable[[str], pl.Expr]):
+        """Register a vectorized expression builder to use instead of a Python callable."""
+        cls._expression_registry[transform_func] = expr_builder
+
+    def transform(
+        self,
+        records: Union[pl.DataFrame, pl.LazyFrame],
+        config: Dict[str, Any] = None
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
         """
         Transform records based on configuration.
+
+        A LazyFrame is only extended with the select/rename/with_columns
+        steps, so Polars can push columns_to_select down into the scan.
         
         Supported config options:
         - field_mappings: Dict mapping old field names to new field names
         - columns_to_select: List of fields to keep (if specified, only these fields are kept)
         - value_transforms: Dict of field names to transformation functions
         - exp_value_transforms: Dict of new fields to add with computed values
+        - value_transform_strategy: How Python transforms without an
+          expression run: 'direct' (default; every row), 'auto' (once per
+          distinct value when a batch repeats values, see DISTINCT_RATIO)
+          or 'distinct'. 'auto' and 'distinct' reuse results across
+          batches, so only use them for deterministic functions
+        - value_transform_cache_size: Distinct results remembered per
+          column across batches (default: MEMO_SIZE)
+        - learn_timestamp_formats: If True, convert_to_timestamp columns are
+          parsed with formats learned from a sample (see timestamp_formats)
+        - timestamp_format_cache: JSON file keeping learned formats across runs
+        - timestamp_format_key: Source the formats are learned for (set by
+          the orchestrator to the source path)
         """
         if config is None:
             config = {}
@@ -39,11 +135,136 @@ class DefaultTransformer(Transformer):
         if 'value_transforms' in config:
             exprs = []
 
+            strategy = config.get("value_transform_strategy", "direct")
+            if strategy not in VALUE_TRANSFORM_STRATEGIES:
+                raise ValueError(f"Unsupported value_transform_strategy: {strategy}")
             for field, transform_func in config["value_transforms"].items():
-                exprs.append(
-                    pl.col(field).map_elements(transform_func).alias(field) 
-                )
+                if transform_func is helpers.convert_to_timestamp and config.get("learn_timestamp_formats"):
+                    learned = self.timestamp_formats(records, field, config)
+                    expr = expressions.convert_to_timestamp_expr(field, formats=learned.formats)
+                else:
+                    expr = self.value_transform_expr(
+                        field, transform_func, strategy, config.get("value_transform_cache_size", MEMO_SIZE)
+                    )
+                exprs.append(expr.alias(field))
 
             records = records.with_columns(exprs)
         return records
 
+    def value_transform_expr(
+        self,
+        field: str,
+        transform_func: Callable,
+        strategy: str = "direct",
+        cache_size: int = MEMO_SIZE
+    ) -> pl.Expr:
+        """
+        Lower a Python callable to its registered expression, or evaluate it
+        over whole batches when no equivalent expression is known.
+        """
+        expr_builder = self._expression_registry.get(transform_func)
+        if expr_builder:
+            return expr_builder(field)
+
+        self._report_slow_path(field, transform_func)
+        if strategy == "direct":
+            apply = self._batched(transform_func)
+        else:
+            memo = self._memos.setdefault((field, transform_func), LruMemo(cache_size))
+            apply = self._distinct(transform_func, memo, always=strategy == "distinct")
+        return pl.col(field).map_batches(apply, is_elementwise=True)
+
+    def timestamp_formats(
+        self,
+        records: Union[pl.DataFrame, pl.LazyFrame],
+        field: str,
+        config: Dict[str, Any]
+    ) -> LearnedFormats:
+        """
+        Formats to parse a timestamp column with: learned once per source and
+        column, from the head of a lazy plan or a sample of a batch, then
+        reused by later batches and, with a format cache, later runs.
+        """
+        source = config.get("timestamp_format_key")
+        key = f"{source}:{field}" if source else field
+        if key in self._timestamp_formats:
+            return self._timestamp_formats[key]
+
+        cache = FormatCache(config["timestamp_format_cache"]) if config.get("timestamp_format_cache") else None
+        learned = cache.get(key) if cache else None
+        if learned is None:
+            if isinstance(records, pl.LazyFrame):
+                sample = records.select(field).head(SAMPLE_SIZE).collect().to_series()
+            else:
+                sample = records.get_column(field)
+                if sample.len() > SAMPLE_SIZE:
+                    sample = sample.sample(SAMPLE_SIZE, seed=0)
+            learned = learn_formats(sample)
+            self.logger.info(
+                f"Column '{field}' learned timestamp formats {learned.formats}, "
+                f"parsing {learned.coverage:.1%} of {learned.sampled} sampled rows natively"
+            )
+            if cache:
+                cache.put(key, learned)
+        self._timestamp_formats[key] = learned
+        return learned
+
+    def _report_slow_path(self, field: str, transform_func: Callable):
+        """Log once per column/function which transforms run in Python."""
+        key = (field, transform_func)
+        if key in self._reported_slow_paths:
+            return
+        self._reported_slow_paths.add(key)
+        func_name = getattr(transform_func, "__qualname__", repr(transform_func))
+        self.logger.info(
+            f"Column '{field}' uses Python transform '{func_name}' (no vectorized equivalent)"
+        )
+
+    @staticmethod
+    def _batched(transform_func: Callable) -> Callable[[pl.Series], pl.Series]:
+        """Apply a scalar function over a whole Series, keeping nulls as nulls."""
+        def apply(series: pl.Series) -> pl.Series:
+            values = [
+                None if value is None else transform_func(value)
+                for value in series.to_list()
+            ]
+            return pl.Series(series.name, values)
+        return apply
+
+    @classmethod
+    def _distinct(cls, transform_func: Callable, memo: LruMemo,
+                  always: bool = False) -> Callable[[pl.Series], pl.Series]:
+        """
+        Apply a scalar function once per distinct value of a Series and join
+        the results back, reusing results memoized by earlier batches.
+
+        Unless always is set, batches with more than DISTINCT_RATIO distinct
+        values per row, and nested columns, are evaluated row by row.
+        """
+        direct = cls._batched(transform_func)
+
+        def apply(series: pl.Series) -> pl.Series:
+            if series.dtype.is_nested() or series.dtype == pl.Object or series.is_empty():
+                return direct(series)
+            distinct = series.drop_nulls().unique()
+            if not always and distinct.len() > DISTINCT_RATIO * series.len():
+                return direct(series)
+
+            # 1, 1.0 and True are one dict key: memoize per dtype
+            dtype = str(series.dtype)
+            keys = [(dtype, key) for key in distinct.to_list()]
+            results, missing = memo.lookup(keys)
+            computed = {key: transform_func(key[1]) for key in missing}
+            memo.store(computed)
+            results.update(computed)
+            mapping = pl.DataFrame({
+                "key": distinct,
+                "value": pl.Series([results[key] for key in keys]),
+            })
+            return (
+                series.to_frame("key")
+                .join(mapping, on="key", how="left", maintain_order="left")
+                .get_column("value")
+                .alias(series.name)
+            )
+        return apply
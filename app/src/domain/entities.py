@@ -1,7 +1,7 @@
 """Domain entities for ETL operations."""
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
 from enum import Enum
 
 
@@ -9,6 +9,8 @@ class DataSourceType(Enum):
     """Enumeration of supported data source types."""
     JSON = "json"
     CSV = "csv"
+    PARQUET = "parquet"
+    IPC = "ipc"
 
 
 class StorageType(Enum):
@@ -21,13 +23,62 @@ class StorageType(Enum):
 class ETLConfig:
     """Configuration for ETL operations."""
     source_type: DataSourceType
-    source_path: str
+    source_path: Union[str, List[str]]
     storage_type: StorageType
     storage_config: Dict[str, Any]
     unnest_config: Optional[Dict[str, Any]] = None
     transformer_config: Optional[Dict[str, Any]] = None
+    execution_config: Optional[Dict[str, Any]] = None
+    source_config: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class MultiTargetETLConfig:
+    """Several ETL targets fed by a single scan of one source."""
+    targets: List[ETLConfig]
+    execution_config: Optional[Dict[str, Any]] = None
+    source_config: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        if not self.targets:
+            raise ValueError("MultiTargetETLConfig needs at least one target")
+        sources = {
+            (t.source_type, t.source_path if isinstance(t.source_path, str) else tuple(t.source_path))
+            for t in self.targets
+        }
+        if len(sources) > 1:
+            raise ValueError(f"All targets must share one source, got: {sources}")
+
+    @property
+    def source_type(self) -> DataSourceType:
+        return self.targets[0].source_type
 
+    @property
+    def source_path(self) -> Union[str, List[str]]:
+        return self.targets[0].source_path
 
 
+@dataclass
+class ETLJob:
+    """A named ETL configuration that runs after the jobs it depends on."""
+    name: str
+    config: Union[ETLConfig, MultiTargetETLConfig]
+    depends_on: List[str] = field(default_factory=list)
+
+    @property
+    def storage_targets(self) -> List[Tuple[str, ...]]:
+        """
+        Storage targets written by this job, used for concurrency limits:
+        (storage type, database or dataset, table), most general first.
+        The database is storage_config['database_uri'], or 'default' for
+        the loader's configured database.
+        """
+        configs = self.config.targets if isinstance(self.config, MultiTargetETLConfig) else [self.config]
+        targets = set()
+        for c in configs:
+            if c.storage_type == StorageType.FILE:
+                targets.add((c.storage_type.value, str(c.storage_config.get("path"))))
+            else:
+                targets.add((c.storage_type.value, str(c.storage_config.get("database_uri", "default")),
+                             str(c.storage_config.get("table_name"))))
+        return sorted(targets)
@@ -0,0 +1,151 @@
+"""Per-batch unnest, transform and load work of ETLOrchestrator."""
+import time
+import polars as pl
+from typing import Iterator, List, Optional, Tuple, Union
+from ..domain.entities import ETLConfig
+from ..ports.transformer import Transformer
+from ..ports.loader import Loader
+from ..adapters.extractors.schema_registry import schema_key
+from ..utils.logger import get_logger
+from ..utils.metrics import METRICS
+from ..utils.nested_paths import flatten
+from .profiling import RunProfiler
+
+
+class BatchWorker:
+    """
+    What the batch stages of a run need: the transformer, the metrics job
+    and the profiler. Pipeline stages on a process executor get a pickled
+    copy, without the profiler.
+    """
+
+    def __init__(self, transformer: Transformer, job_name: str = "etl", profiler: Optional[RunProfiler] = None):
+        self._transformer = transformer
+        self.job_name = job_name
+        self.profiler = profiler
+        self.logger = get_logger("ETL.Orchestrator")
+
+    def __getstate__(self):
+        # the profiler samples the parent process only
+        return {**self.__dict__, "profiler": None}
+
+    def transform_batch(self, targets: List[ETLConfig], batch_df: pl.DataFrame) -> Tuple[int, List[pl.DataFrame]]:
+        """
+        Prepare one batch for every target.
+
+        With several targets the plans are built lazily over the batch and
+        collected together, so shared subplans are computed once.
+        """
+        if len(targets) == 1:
+            return batch_df.height, [self.prepare_table(batch_df, targets[0])]
+        with METRICS.stage(self.job_name, "transform") as counts:
+            batch_lf = batch_df.lazy()
+            plans = [self.prepare_table(batch_lf, target) for target in targets]
+            if self.profiler:
+                for target, plan in zip(targets, plans):
+                    self.profiler.plan(f"transform {target.storage_config.get('table_name')}", plan)
+            tables = pl.collect_all(plans)
+            counts.update(rows_in=batch_df.height, rows_out=sum(table.height for table in tables))
+        return batch_df.height, tables
+
+    def timed_batches(self, batches: Iterator[pl.DataFrame], stage: str) -> Iterator[pl.DataFrame]:
+        """Record the time spent producing every batch of the source."""
+        batches = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch_df = next(batches)
+            except StopIteration:
+                return
+            METRICS.record_stage(self.job_name, stage, time.perf_counter() - start,
+                                 rows_out=batch_df.height, bytes_out=batch_df.estimated_size())
+            yield batch_df
+
+    def passthrough_batch(self, batch_df: pl.DataFrame) -> Tuple[int, List[pl.DataFrame]]:
+        """Wrap a batch that was transformed as part of the source plan."""
+        return batch_df.height, [batch_df]
+
+    def load_batch(self, loaders: List[Loader], targets: List[ETLConfig], prepared: Tuple[int, List[pl.DataFrame]]) -> Tuple[int, List[bool]]:
+        """Load the prepared tables of one batch, in target order."""
+        rows, tables = prepared
+        results = []
+        for target, loader, table in zip(targets, loaders, tables):
+            self.logger.info(f"Loading data to {target.storage_type.value}...")
+            with METRICS.stage(self.job_name, "load", table=target.storage_config.get("table_name")) as counts:
+                counts.update(rows_in=table.height, bytes_out=table.estimated_size())
+                results.append(loader.load(table, target.storage_config))
+        return rows, results
+
+    def prepare_table(self, batch_df: Union[pl.DataFrame, pl.LazyFrame], config: ETLConfig) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Unnest and transform a batch, or a whole lazy plan, for one target table."""
+        # a LazyFrame is only extended here, eager batches are timed
+        eager = isinstance(batch_df, pl.DataFrame)
+        table = config.storage_config.get("table_name")
+        start = time.perf_counter()
+        if config.unnest_config and "path" in config.unnest_config:
+            transformer_config = config.transformer_config or {}
+            table_data = flatten(
+                batch_df,
+                config.unnest_config["path"],
+                keep=config.unnest_config.get("keep"),
+                columns=transformer_config.get("columns_to_select")
+            )
+        elif config.unnest_config and "column_to_extract" in config.unnest_config:
+            table_data = self.handle_complex_data(batch_df, config.unnest_config)
+        else:
+            table_data=batch_df
+        if eager and table_data is not batch_df:
+            METRICS.record_stage(self.job_name, "unnest", time.perf_counter() - start, table=table,
+                                 rows_in=batch_df.height, rows_out=table_data.height)
+
+        transformer_config = config.transformer_config
+        if transformer_config and transformer_config.get("learn_timestamp_formats"):
+            transformer_config = {"timestamp_format_key": schema_key(config.source_path), **transformer_config}
+        start = time.perf_counter()
+        transformed = self._transformer.transform(
+            table_data,
+            transformer_config
+        )
+        if eager:
+            METRICS.record_stage(self.job_name, "transform", time.perf_counter() - start, table=table,
+                                 rows_in=table_data.height, rows_out=transformed.height,
+                                 bytes_out=transformed.estimated_size())
+        return transformed
+
+    def handle_complex_data(self,df,config):
+        """
+        Handle complex data extraction and transformation.
+
+        Legacy column_to_extract/operations configs; unnest_config["path"]
+        (see utils.nested_paths) covers any nesting depth in one plan.
+        """
+        pre_ops =  config.get('preop',None)
+        column_name = config.get('column_to_extract')
+        op_order = config.get('operations')
+        process_df = df
+        if pre_ops:
+            pre_column_name = pre_ops.get('column_to_extract')
+            pre_op_order = pre_ops.get('operations')
+            process_df = self.perform_op(process_df,pre_op_order,pre_column_name)
+        process_df = self.perform_op(process_df,op_order,column_name)
+        return process_df
+    
+    def perform_op(self,df,op_order,column_name):
+        """Perform operations like unnest and explode in order."""
+        process_df = df
+        for i in range(0,len(op_order.items())):
+            if op_order[str(i)] == "unnest":
+                process_df = self.unnest_table(process_df,column_name)
+            else:
+                process_df = self.explod_table(process_df,column_name)
+        return process_df
+
+    def unnest_table(self, batch_df: pl.DataFrame,column_name: str) -> pl.DataFrame:
+        """Unnest a nested column."""
+        df_unnested_details = batch_df.unnest(column_name)
+        return df_unnested_details
+
+    def explod_table(self, batch_df: pl.DataFrame, column_name: str) -> pl.DataFrame:
+        """Explode an array column."""
+        exploded_df = batch_df.explode(column_name)
+        return exploded_df
@@ -0,0 +1,304 @@
+"""Per-job watermarks for incremental and resumable extraction."""
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import polars as pl
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from ..utils.logger import get_logger
+
+ROW_INDEX = "__source_row"
+# column naming the source file of each row of a multi-file source
+FILE_COLUMN = "__source_file"
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+@dataclass
+class Checkpoint:
+    """Progress of one job over one version of its source."""
+    job: str
+    fingerprint: Optional[str]
+    source_size: Optional[int]
+    rows: int = 0
+    watermark: Any = None
+    run_watermark: Any = None
+    status: str = "running"
+
+
+@dataclass
+class FileCheckpoint:
+    """Progress of one job over one file of a glob, directory or file list."""
+    path: str
+    size: int
+    mtime_ns: int
+    rows: int = 0
+    done: bool = False
+
+
+def file_version(path: str) -> Tuple[int, int]:
+    """Size and mtime of a file: a file with both unchanged is the same file."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def fingerprint_source(source_path: Union[str, List[str]], length: Optional[int] = None) -> Optional[str]:
+    """
+    Hash of the first `length` bytes (at most 1 MB) of a local source file.
+
+    Hashing the prefix read by the previous run tells an appended file
+    (same prefix) from a rewritten one. Globs, directories and file lists
+    have no fingerprint, they are checkpointed per file (FileCheckpoint).
+    """
+    if not isinstance(source_path, str) or not os.path.isfile(source_path):
+        return None
+    length = FINGERPRINT_BYTES if length is None else min(length, FINGERPRINT_BYTES)
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as handle:
+        digest.update(handle.read(length))
+    return digest.hexdigest()
+
+
+def _encode(value: Any) -> str:
+    """JSON for a watermark, tagging dates and datetimes so they round-trip."""
+    if isinstance(value, datetime.datetime):
+        value = {"datetime": value.isoformat()}
+    elif isinstance(value, datetime.date):
+        value = {"date": value.isoformat()}
+    return json.dumps(value)
+
+
+def _decode(text: str) -> Any:
+    value = json.loads(text)
+    if isinstance(value, dict) and "datetime" in value:
+        return datetime.datetime.fromisoformat(value["datetime"])
+    if isinstance(value, dict) and "date" in value:
+        return datetime.date.fromisoformat(value["date"])
+    return value
+
+
+class CheckpointStore:
+    """Checkpoints kept in a local SQLite file, one row per job plus one per file of multi-file jobs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "job TEXT PRIMARY KEY, fingerprint TEXT, source_size INTEGER, rows INTEGER, "
+                "watermark TEXT, run_watermark TEXT, status TEXT, updated_at REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint_files ("
+                "job TEXT, path TEXT, size INTEGER, mtime_ns INTEGER, rows INTEGER, done INTEGER, "
+                "PRIMARY KEY (job, path))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, job: str) -> Optional[Checkpoint]:
+        """Return the checkpoint of a job, or None before its first batch."""
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                "SELECT job, fingerprint, source_size, rows, watermark, run_watermark, status "
+                "FROM checkpoints WHERE job = ?", (job,)
+            ).fetchone()
+        if row is None:
+            return None
+        job, fingerprint, source_size, rows, watermark, run_watermark, status = row
+        return Checkpoint(job, fingerprint, source_size, rows, _decode(watermark), _decode(run_watermark), status)
+
+    def get_files(self, job: str) -> Dict[str, FileCheckpoint]:
+        """Return the file checkpoints of a multi-file job, by path."""
+        with self._lock, self._connect() as connection:
+            rows = connection.execute(
+                "SELECT path, size, mtime_ns, rows, done FROM checkpoint_files WHERE job = ?", (job,)
+            ).fetchall()
+        return {path: FileCheckpoint(path, size, mtime_ns, count, bool(done)) for path, size, mtime_ns, count, done in rows}
+
+    def save(self, checkpoint: Checkpoint, files: Optional[List[FileCheckpoint]] = None):
+        """Insert or replace a checkpoint, and with files its file checkpoints, in one transaction."""
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (checkpoint.job, checkpoint.fingerprint, checkpoint.source_size, checkpoint.rows,
+                 _encode(checkpoint.watermark), _encode(checkpoint.run_watermark),
+                 checkpoint.status, time.time())
+            )
+            if files is not None:
+                connection.execute("DELETE FROM checkpoint_files WHERE job = ?", (checkpoint.job,))
+                connection.executemany(
+                    "INSERT INTO checkpoint_files VALUES (?, ?, ?, ?, ?, ?)",
+                    [(checkpoint.job, f.path, f.size, f.mtime_ns, f.rows, int(f.done)) for f in files]
+                )
+
+    def delete(self, job: str):
+        """Forget a job so its next run starts from scratch."""
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM checkpoints WHERE job = ?", (job,))
+            connection.execute("DELETE FROM checkpoint_files WHERE job = ?", (job,))
+
+
+class IncrementalRun:
+    """
+    Restricts one run of a job to the rows not loaded yet.
+
+    - an interrupted run resumes after the last committed batch
+    - rows appended to an unchanged file are read from the stored row count
+    - a rewritten source is filtered on watermark_column > stored maximum,
+      or fully reprocessed when no watermark column is configured
+
+    Sources of several files (globs, directories, file lists) are tracked
+    per file by size and mtime: rows of files loaded completely and
+    unchanged since are dropped, the file an interrupted run stopped in
+    resumes after its committed rows, and new or changed files are read in
+    full (watermark_column is still recorded but not used to filter them).
+    The scan then needs the source_config of the run, which names each
+    row's file.
+    """
+
+    def __init__(self, store: CheckpointStore, job: str, source_path: Union[str, List[str]],
+                 watermark_column: Optional[str] = None, files: Optional[List[str]] = None):
+        self.store = store
+        self.job = job
+        self.watermark_column = watermark_column
+        self.logger = get_logger("ETL.Checkpoints")
+        self._pending = deque()
+        local_file = isinstance(source_path, str) and os.path.isfile(source_path)
+        self.files: Optional[List[FileCheckpoint]] = None
+        self.file_column = FILE_COLUMN
+        if files is not None and not local_file:
+            self._start_files(store.get(job), store.get_files(job), files)
+            return
+        size = os.path.getsize(source_path) if local_file else None
+        previous = store.get(job)
+        same_source = (
+            previous is not None and previous.fingerprint is not None and size is not None
+            and size >= previous.source_size
+            and fingerprint_source(source_path, previous.source_size) == previous.fingerprint
+        )
+        fingerprint = fingerprint_source(source_path, size)
+        self.checkpoint = self._start(previous, same_source, fingerprint, size)
+
+    def _start(self, previous: Optional[Checkpoint], same_source: bool,
+               fingerprint: Optional[str], size: Optional[int]) -> Checkpoint:
+        if same_source and previous.status == "running":
+            self.logger.info(f"Resuming job '{self.job}' after {previous.rows} committed rows")
+            return Checkpoint(self.job, fingerprint, size, previous.rows, previous.watermark, previous.run_watermark)
+        if same_source:
+            self.logger.info(f"Job '{self.job}' reads rows appended after row {previous.rows}")
+            return Checkpoint(self.job, fingerprint, size, previous.rows, previous.watermark)
+        watermark = previous.watermark if previous else None
+        if watermark is not None and self.watermark_column:
+            self.logger.info(f"Job '{self.job}' reads rows with {self.watermark_column} > {watermark}")
+            return Checkpoint(self.job, fingerprint, size, 0, watermark, watermark)
+        return Checkpoint(self.job, fingerprint, size, 0, watermark)
+
+    def _start_files(self, previous: Optional[Checkpoint], known: Dict[str, FileCheckpoint], paths: List[str]):
+        """Plan a multi-file run: which files to scan and where to resume."""
+        watermark = previous.watermark if previous else None
+        self.files = []
+        changed = 0
+        for path in paths:
+            size, mtime_ns = file_version(path)
+            file = known.get(path)
+            if file is None or (file.size, file.mtime_ns) != (size, mtime_ns):
+                changed += file is not None
+                file = FileCheckpoint(path, size, mtime_ns)
+            self.files.append(file)
+        self._remaining = [file for file in self.files if not file.done]
+        # only the first scanned file can be resumed by slicing the scan
+        for file in self._remaining[1:]:
+            file.rows = 0
+        self._skip = self._remaining[0].rows if self._remaining else 0
+        self.checkpoint = Checkpoint(self.job, None, None, sum(f.rows for f in self.files), watermark)
+        self.logger.info(
+            f"Job '{self.job}' reads {len(self._remaining)} of {len(self.files)} files ({changed} changed)"
+            + (f", resuming after row {self._skip} of {self._remaining[0].path}" if self._skip else "")
+        )
+
+    def source_config(self, source_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Source options for the scan: multi-file runs need each row's file."""
+        source_config = dict(source_config or {})
+        if self.files is None:
+            return source_config
+        if source_config.get("include_file_paths"):
+            self.file_column = source_config["include_file_paths"]
+            return source_config
+        source_config["include_file_paths"] = FILE_COLUMN
+        if source_config.get("columns"):
+            source_config["columns"] = [*source_config["columns"], FILE_COLUMN]
+        return source_config
+
+    def plan(self, records: pl.LazyFrame) -> pl.LazyFrame:
+        """Skip committed rows and rows at or below the run's watermark."""
+        if self.files is not None:
+            return self._plan_files(records)
+        records = records.with_row_index(ROW_INDEX).slice(self.checkpoint.rows)
+        run_watermark = self.checkpoint.run_watermark
+        if run_watermark is not None and self.watermark_column:
+            records = records.filter(pl.col(self.watermark_column) > run_watermark)
+        self.store.save(self.checkpoint)
+        return records
+
+    def _plan_files(self, records: pl.LazyFrame) -> pl.LazyFrame:
+        # drop the files already loaded, then resume the first remaining one
+        if len(self._remaining) < len(self.files):
+            records = records.filter(pl.col(self.file_column).is_in([file.path for file in self._remaining]))
+        records = records.with_row_index(ROW_INDEX).slice(self._skip)
+        self.store.save(self.checkpoint, self.files)
+        return records
+
+    def track(self, batches: Iterator[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+        """Remember where every batch ends and yield it without the row index."""
+        drop = [ROW_INDEX]
+        if self.files is not None and self.file_column == FILE_COLUMN:
+            drop.append(FILE_COLUMN)
+        for batch in batches:
+            end = int(batch[ROW_INDEX].max()) + 1 if batch.height else None
+            watermark = batch[self.watermark_column].max() if self.watermark_column else None
+            files = None
+            if self.files is not None:
+                files = batch.group_by(self.file_column, maintain_order=True).len().rows()
+            self._pending.append((end, watermark, files))
+            yield batch.drop(drop)
+
+    def commit(self):
+        """Record that the oldest tracked batch has been loaded."""
+        end, watermark, files = self._pending.popleft()
+        if watermark is not None and (self.checkpoint.watermark is None or watermark > self.checkpoint.watermark):
+            self.checkpoint.watermark = watermark
+        if files is None:
+            if end is not None:
+                self.checkpoint.rows = end
+            self.store.save(self.checkpoint)
+            return
+        by_path = {file.path: file for file in self._remaining}
+        for path, rows in files:
+            by_path[path].rows += rows
+        if files:
+            # files are scanned in order, the ones before the last file seen are complete
+            last = [file.path for file in self._remaining].index(files[-1][0])
+            for file in self._remaining[:last]:
+                file.done = True
+        self.checkpoint.rows = sum(file.rows for file in self.files)
+        self.store.save(self.checkpoint, self.files)
+
+    def complete(self):
+        """Mark the run finished, later runs only read new rows."""
+        self.checkpoint.status = "completed"
+        if self.files is not None:
+            for file in self.files:
+                file.done = True
+        self.store.save(self.checkpoint, self.files)
+        self.logger.info(
+            f"Job '{self.job}' committed through row {self.checkpoint.rows}, watermark {self.checkpoint.watermark}"
+        )
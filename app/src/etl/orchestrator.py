@@ -1,17 +1,26 @@
 """ETL orchestrator coordinating extract, transform, and load operations."""
+import functools
 import traceback
+import uuid
 import polars as pl
-from typing import Optional
-from ..domain.entities import ETLConfig, DataSourceType, StorageType
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from ..domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
 from ..ports.extractor import Extractor
 from ..ports.transformer import Transformer
 from ..ports.loader import Loader
 from ..adapters.transformers.default_transformer import DefaultTransformer
 from ..adapters.loaders.storage_loader_factory import StorageLoaderFactory
 from ..adapters.extractors.source_extractor_factory import SourceExtractorFactory
-from ..utils.logger import get_logger
+from ..adapters.extractors.source_options import apply_source_options
+from ..utils.logger import get_logger, log_context
 from ..utils.decorators import time_execution
+from ..utils.metrics import METRICS
+from .batch_worker import BatchWorker
+from .checkpoints import CheckpointStore, IncrementalRun
+from .pipeline import Pipeline, Stage
+from .profiling import RunProfiler, report_dir_for
 
+DEFAULT_BATCH_SIZE = 1000000
 
 
 class ETLOrchestrator:
@@ -35,6 +44,8 @@ class ETLOrchestrator:
         self._transformer = transformer or DefaultTransformer()
         self._loader = loader
         self.logger = get_logger("ETL.Orchestrator")
+        self.job_name = "etl"
+        self.profiler: Optional[RunProfiler] = None
     
     def _get_extractor(self, source_type: DataSourceType) -> Extractor:
         """Get appropriate extractor based on source type."""
@@ -51,17 +62,42 @@ class ETLOrchestrator:
         
         return StorageLoaderFactory.get_loader(storage_type)
     
-    @time_execution(func_path="ETL.Orchestrator.run",logger_name="ETL.Orchestrator")
-    def run(self, config: ETLConfig) -> bool:
+    def run(self, config: Union[ETLConfig, MultiTargetETLConfig], profile: Union[bool, str] = False) -> bool:
         """
         Execute the ETL process.
+
+        Metrics of the run are exported afterwards when configured, see
+        export_metrics.
         
         Args:
-            config: ETL configuration
+            config: ETL configuration, or a multi-target configuration whose
+                targets share one scan of the source
+            profile: If True, profile the run into profiles/<job>-<time>, or
+                into the given directory: the optimized plans, per-batch
+                stage timings and sampled Python stacks, with a summary.txt
+                of the top costs (see etl.profiling)
             
         Returns:
             True if ETL completed successfully, False otherwise
         """
+        targets = config.targets if isinstance(config, MultiTargetETLConfig) else [config]
+        job = self.metrics_job(targets, config.execution_config)
+        if profile:
+            self.profiler = RunProfiler(report_dir_for(profile, job), job).start()
+        try:
+            # records of the run carry its job and run id (see ETLLogger)
+            with log_context(job=job, run=uuid.uuid4().hex[:12]):
+                return self._timed_run(config)
+        finally:
+            if self.profiler:
+                self.profiler.stop()
+                self.profiler = None
+            self.export_metrics(config.execution_config)
+
+    @time_execution(func_path="ETL.Orchestrator.run",logger_name="ETL.Orchestrator")
+    def _timed_run(self, config: Union[ETLConfig, MultiTargetETLConfig]) -> bool:
+        if isinstance(config, MultiTargetETLConfig):
+            return self.run_multi_target(config)
         try:
             # Extract
             extractor = self._get_extractor(config.source_type)
@@ -69,22 +105,48 @@ class ETLOrchestrator:
                 raise ValueError(f"Invalid source: {config.source_path}")
             
             self.logger.info(f"Extracting data from {config.source_path}...")
-            records = extractor.extract(config.source_path)
-            self.logger.info(f"Extracted {records.count()} records")
+            job = self.metrics_job([config], config.execution_config)
+            incremental = self.incremental_run(config.source_path, [config], config.execution_config, extractor)
+            source_config = incremental.source_config(config.source_config) if incremental else config.source_config
+            records = apply_source_options(extractor.extract(config.source_path, source_config), source_config)
             
             # Transform
             self.logger.info("Transforming data in bathces...")
-            # unique_districts = records.select(pl.col("is_claimed").unique()).collect()
-            # print(unique_districts)
             loader = self._get_loader(config.storage_type)
             if not loader.validate_connection(config):
                 raise ValueError(f"Invalid storage connection: {config.storage_config}")
-            for i, batch_df in enumerate(records.collect_batches(chunk_size=1000000)):
-                success=self.handle_table(batch_df,config,loader)
-                if success:
+            total_rows = 0
+            if incremental or (config.execution_config or {}).get("pipelined", False):
+                # checkpoints count source rows, and pipelined runs transform
+                # in their own stage, so batches are taken from the source
+                # and transformed one by one
+                if incremental:
+                    records = incremental.plan(records)
+                if self.profiler:
+                    self.profiler.plan("extract", records)
+                batches = self.collect_batches(records, config.execution_config)
+                if incremental:
+                    batches = incremental.track(batches)
+                processed = self.process_batches(batches, [config], [loader], config.execution_config, job=job)
+            else:
+                # extract -> unnest/explode -> transform as one plan, so unused
+                # source columns are pruned in the scan itself
+                plan = self.prepare_table(records, config)
+                if self.profiler:
+                    self.profiler.plan("plan", plan)
+                batches = self.collect_batches(plan, config.execution_config)
+                processed = self.process_batches(batches, [config], [loader], config.execution_config,
+                                                 transform=False, job=job)
+            for i, (rows, results) in enumerate(processed):
+                total_rows += rows
+                if all(results):
                     self.logger.info("ETL process completed successfully!")
                 else:
                     self.logger.info("ETL process failed during loading")
+                self._commit_batch(incremental, i, results)
+            if incremental:
+                incremental.complete()
+            self.logger.info(f"Loaded {total_rows} records")
             return True
             
         except Exception as e:
@@ -92,56 +154,231 @@ class ETLOrchestrator:
             traceback.print_exc()
             return False
 
+    def run_multi_target(self, config: MultiTargetETLConfig) -> bool:
+        """
+        Execute several ETL targets over a single scan of their shared source.
+
+        Each batch is parsed once. The per-target unnest/transform plans are
+        built lazily over that batch and collected together with
+        pl.collect_all, so subplans shared by targets (e.g. the same unnest)
+        are computed once. Targets are loaded in the order they are declared.
+        The source_config of the multi-target configuration applies to the
+        shared scan.
+
+        Args:
+            config: Multi-target ETL configuration
+
+        Returns:
+            True if ETL completed successfully, False otherwise
+        """
+        try:
+            extractor = self._get_extractor(config.source_type)
+            if not extractor.validate_source(config.source_path):
+                raise ValueError(f"Invalid source: {config.source_path}")
+
+            self.logger.info(f"Extracting data from {config.source_path} for {len(config.targets)} targets...")
+            job = self.metrics_job(config.targets, config.execution_config)
+            incremental = self.incremental_run(config.source_path, config.targets, config.execution_config, extractor)
+            source_config = incremental.source_config(config.source_config) if incremental else config.source_config
+            records = apply_source_options(extractor.extract(config.source_path, source_config), source_config)
+
+            loaders = [self._get_loader(target.storage_type) for target in config.targets]
+            for target, loader in zip(config.targets, loaders):
+                if not loader.validate_connection(target):
+                    raise ValueError(f"Invalid storage connection: {target.storage_config}")
+
+            total_rows = 0
+            if incremental:
+                records = incremental.plan(records)
+            if self.profiler:
+                self.profiler.plan("extract", records)
+            batches = self.collect_batches(records, config.execution_config)
+            if incremental:
+                batches = incremental.track(batches)
+            processed = self.process_batches(batches, config.targets, loaders, config.execution_config, job=job)
+            for i, (rows, results) in enumerate(processed):
+                total_rows += rows
+                for target, success in zip(config.targets, results):
+                    if success:
+                        self.logger.info(f"ETL process completed successfully for batch {i} of {target.storage_config.get('table_name')}")
+                    else:
+                        self.logger.info(f"ETL process failed during loading batch {i} of {target.storage_config.get('table_name')}")
+                self._commit_batch(incremental, i, results)
+            if incremental:
+                incremental.complete()
+            self.logger.info(f"Extracted {total_rows} records")
+            return True
+
+        except Exception as e:
+            self.logger.exception(f"ETL process failed: {e}")
+            traceback.print_exc()
+            return False
+
+    @staticmethod
+    def metrics_job(targets: List[ETLConfig], execution_config: Optional[Dict[str, Any]] = None) -> str:
+        """Job label of a run: execution_config['job_name'] or its tables."""
+        execution_config = execution_config or {}
+        return execution_config.get("job_name") or ",".join(
+            str(t.storage_config.get("table_name", t.storage_type.value)) for t in targets
+        )
+
+    def export_metrics(self, execution_config: Optional[Dict[str, Any]] = None):
+        """
+        Export the process metrics after a run.
+
+        Supported execution_config options:
+        - metrics_prometheus: Prometheus textfile to (re)write
+        - metrics_jsonl: JSON lines file to append batch events and series to
+        """
+        execution_config = execution_config or {}
+        try:
+            if execution_config.get("metrics_prometheus"):
+                METRICS.write_prometheus(execution_config["metrics_prometheus"])
+            if execution_config.get("metrics_jsonl"):
+                METRICS.write_json_lines(execution_config["metrics_jsonl"])
+        except OSError as e:
+            self.logger.warning(f"Could not export metrics: {e}")
+
+    def incremental_run(
+        self,
+        source_path: str,
+        targets: List[ETLConfig],
+        execution_config: Optional[Dict[str, Any]] = None,
+        extractor: Optional[Extractor] = None
+    ) -> Optional[IncrementalRun]:
+        """
+        Start an incremental run when a checkpoint store is configured.
+
+        Supported execution_config options:
+        - checkpoint_store: Path of the SQLite checkpoint file (default: none,
+          every run reads the whole source)
+        - checkpoint_key: Job name in the store (default: source path and
+          target tables)
+        - watermark_column: Source column whose maximum is recorded, later
+          runs over a rewritten source only read rows above it
+
+        A batch is committed once every target loaded it. Delivery is at
+        least once: pipelined loads running ahead of a failed batch are
+        repeated on resume, use mode 'upsert' to make that harmless. Sources
+        the extractor resolves to several files are checkpointed per file.
+        """
+        execution_config = execution_config or {}
+        store_path = execution_config.get("checkpoint_store")
+        if not store_path:
+            return None
+        if execution_config.get("pipelined", False) and not execution_config.get("ordered", True):
+            raise ValueError("Checkpointed runs need ordered batches")
+        job = execution_config.get("checkpoint_key") or "{}:{}".format(
+            source_path, ",".join(str(t.storage_config.get("table_name", t.storage_type.value)) for t in targets)
+        )
+        files = extractor.source_files(source_path) if extractor else None
+        return IncrementalRun(CheckpointStore(store_path), job, source_path,
+                              execution_config.get("watermark_column"), files)
+
+    def _commit_batch(self, incremental: Optional[IncrementalRun], batch: int, results: List[bool]):
+        """Checkpoint a loaded batch, or stop the run at the first failed one."""
+        if incremental is None:
+            return
+        if not all(results):
+            raise RuntimeError(
+                f"Batch {batch} failed to load, job '{incremental.job}' stays at row {incremental.checkpoint.rows}"
+            )
+        incremental.commit()
+
+    def collect_batches(self, records: pl.LazyFrame, execution_config: Optional[Dict[str, Any]] = None) -> Iterator[pl.DataFrame]:
+        """
+        Materialize the extracted plan in batches.
+
+        Supported execution_config options:
+        - batch_size: Rows per batch (default: 1000000)
+        - streaming: If True, run the plan on Polars' streaming engine. Peak
+          memory is then bounded by a few batches of batch_size rows and does
+          not grow with the size of the source (default: False)
+        """
+        execution_config = execution_config or {}
+        batch_size = execution_config.get("batch_size", DEFAULT_BATCH_SIZE)
+        engine = "streaming" if execution_config.get("streaming", False) else "auto"
+        return iter(records.collect_batches(chunk_size=batch_size, engine=engine))
+
+    def process_batches(
+        self,
+        batches: Iterator[pl.DataFrame],
+        targets: List[ETLConfig],
+        loaders: List[Loader],
+        execution_config: Optional[Dict[str, Any]] = None,
+        transform: bool = True,
+        job: Optional[str] = None
+    ) -> Iterator[Tuple[int, List[bool]]]:
+        """
+        Unnest, transform and load every batch for each target.
+
+        With transform=False the batches are already prepared for the single
+        target (see run) and are only loaded. run only fuses the transform
+        into the source plan when not pipelined, so transform_workers and
+        transform_executor always take effect.
+
+        Every batch is recorded in the metrics registry under job: the
+        extract stage (named 'plan' when the batches come out of a fused
+        extract/unnest/transform plan), unnest and transform (one
+        'transform' stage when several targets are collected together) and
+        the load of each table. Stages running on a process executor record
+        into the worker processes and are not exported.
+
+        Supported execution_config options:
+        - pipelined: If True, extraction, transformation and loading run as
+          separate stages connected by bounded queues, so they overlap
+          across batches (default: False)
+        - queue_size: Batches allowed to wait between two stages (default: 2)
+        - ordered: Keep batches in source order through every stage (default: True)
+        - transform_workers / load_workers: Workers per stage (default: 1)
+        - transform_executor / load_executor: 'thread' or 'process' (default: 'thread')
+
+        Yields:
+            Extracted row count and per-target load results of each batch
+        """
+        execution_config = execution_config or {}
+        worker = BatchWorker(self._transformer, job or self.metrics_job(targets, execution_config), self.profiler)
+        batches = worker.timed_batches(batches, "extract" if transform else "plan")
+        if transform:
+            prepare = functools.partial(worker.transform_batch, targets)
+        else:
+            prepare = worker.passthrough_batch
+        load = functools.partial(worker.load_batch, loaders, targets)
+
+        if not execution_config.get("pipelined", False):
+            for i, batch_df in enumerate(batches):
+                with log_context(batch=i):
+                    loaded = load(prepare(batch_df))
+                yield loaded
+            return
+
+        stages = [
+            Stage("load", load,
+                  workers=execution_config.get("load_workers", 1),
+                  executor=execution_config.get("load_executor", "thread")),
+        ]
+        if transform:
+            stages.insert(0, Stage("transform", prepare,
+                                   workers=execution_config.get("transform_workers", 1),
+                                   executor=execution_config.get("transform_executor", "thread")))
+        else:
+            batches = map(prepare, batches)
+        pipeline = Pipeline(
+            stages,
+            queue_size=execution_config.get("queue_size", 2),
+            ordered=execution_config.get("ordered", True)
+        )
+        yield from pipeline.run(batches)
+
+    def prepare_table(self, batch_df: Union[pl.DataFrame, pl.LazyFrame], config: ETLConfig) -> Union[pl.DataFrame, pl.LazyFrame]:
+        """Unnest and transform a batch, or a whole lazy plan, for one target table."""
+        return BatchWorker(self._transformer, self.job_name, self.profiler).prepare_table(batch_df, config)
+
     def handle_table(self,batch_df: pl.DataFrame,config: ETLConfig,loader: Loader)-> bool:
         """Handle ETL depending on table complexity."""
         success =True
-        if "column_to_extract" in config.unnest_config:
-            table_data = self.handle_complex_data(batch_df, config.unnest_config)
-        else:
-            table_data=batch_df
-        
-        transformed_records = self._transformer.transform(
-            table_data,
-            config.transformer_config
-        )
+        transformed_records = self.prepare_table(batch_df, config)
 
         self.logger.info(f"Loading data to {config.storage_type.value}...")
         success = loader.load(transformed_records, config.storage_config)
         return success
-
-
-    def handle_complex_data(self,df,config):
-        """Handle complex data extraction and transformation."""
-        pre_ops =  config.get('preop',None)
-        column_name = config.get('column_to_extract')
-        op_order = config.get('operations')
-        process_df = df
-        if pre_ops:
-            pre_column_name = pre_ops.get('column_to_extract')
-            pre_op_order = pre_ops.get('operations')
-            process_df = self.perform_op(process_df,pre_op_order,pre_column_name)
-        process_df = self.perform_op(process_df,op_order,column_name)
-        return process_df
-    
-    def perform_op(self,df,op_order,column_name):
-        """Perform operations like unnest and explode in order."""
-        process_df = df
-        for i in range(0,len(op_order.items())):
-            print(i)
-            if op_order[str(i)] == "unnest":
-                process_df = self.unnest_table(process_df,column_name)
-            else:
-                process_df = self.explod_table(process_df,column_name)
-        return process_df
-
-    def unnest_table(self, batch_df: pl.DataFrame,column_name: str) -> pl.DataFrame:
-        """Unnest a nested column."""
-        df_unnested_details = batch_df.unnest(column_name)
-        return df_unnested_details
-
-    def explod_table(self, batch_df: pl.DataFrame, column_name: str) -> pl.DataFrame:
-        """Explode an array column."""
-        exploded_df = batch_df.explode(column_name)
-        return exploded_df
-    
-
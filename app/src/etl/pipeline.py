@@ -0,0 +1,198 @@
+"""Pipelined execution of ETL stages connected by bounded queues."""
+import contextvars
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from ..utils.logger import ETLLogger, current_log_context, log_context, run_with_log_context
+
+_END = object()
+
+
+class _Aborted(Exception):
+    """Raised inside pipeline threads once another thread has failed."""
+
+
+@dataclass
+class Stage:
+    """A pipeline stage applying func to every item with `workers` workers."""
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    executor: str = "thread"
+
+
+class _StageState:
+    """Bookkeeping shared by the workers of one stage."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.turn = threading.Condition(self.lock)
+        self.next_seq = 0
+        self.finished = 0
+
+
+class Pipeline:
+    """
+    Runs items from a source through stages connected by bounded queues.
+
+    The source is iterated on its own thread, and every stage has its own
+    thread or process workers, so extraction, transformation and loading of
+    different batches overlap. Bounded queues give back-pressure: a slow
+    stage stops the ones before it from running more than queue_size items
+    ahead. The first error in any stage stops the pipeline and is re-raised
+    from run().
+
+    Workers log under the log context of run() plus the sequence number of
+    the item as batch, process workers included. Process workers are
+    spawned, so the func of a process stage must be picklable (a module
+    level function or an instance of a module level class).
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 2,
+        ordered: bool = True,
+        poll_interval: float = 0.1
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages applied in order to every item
+            queue_size: Maximum items waiting between two stages
+            ordered: If True every stage emits items in source order,
+                otherwise in completion order
+            poll_interval: Seconds between checks for a failed stage
+        """
+        for stage in stages:
+            if stage.executor not in ("thread", "process"):
+                raise ValueError(f"Unsupported executor for stage {stage.name}: {stage.executor}")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.ordered = ordered
+        self.poll_interval = poll_interval
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yield the output of the last stage for every item of source.
+
+        Raises:
+            The first exception raised by the source or by any stage
+        """
+        self._abort = threading.Event()
+        self._errors: List[BaseException] = []
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        pools = []
+        # threads start with an empty context, so each gets a copy of ours
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(self._feed, source, queues[0]),
+                                    name="pipeline-source", daemon=True)]
+        for stage, q_in, q_out in zip(self.stages, queues, queues[1:]):
+            pool = None
+            if stage.executor == "process":
+                initializer, initargs = ETLLogger.process_logging()
+                # spawned, forking a process running Polars threads can deadlock the children
+                pool = ProcessPoolExecutor(max_workers=stage.workers, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=initializer, initargs=initargs)
+                pools.append(pool)
+            state = _StageState()
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=contextvars.copy_context().run, args=(self._work, stage, state, pool, q_in, q_out),
+                    name=f"pipeline-{stage.name}-{n}", daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _END:
+                    break
+                yield item[1]
+        except _Aborted:
+            pass
+        finally:
+            self._abort.set()
+            for thread in threads:
+                thread.join()
+            for pool in pools:
+                pool.shutdown(cancel_futures=True)
+        if self._errors:
+            raise self._errors[0]
+
+    def _feed(self, source: Iterable[Any], q_out: queue.Queue):
+        try:
+            for seq, item in enumerate(source):
+                self._put(q_out, (seq, item))
+            self._put(q_out, _END)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _work(self, stage: Stage, state: _StageState, pool: Optional[ProcessPoolExecutor],
+              q_in: queue.Queue, q_out: queue.Queue):
+        try:
+            while True:
+                item = self._get(q_in)
+                if item is _END:
+                    # leave the marker for the other workers of this stage
+                    self._put(q_in, _END)
+                    break
+                seq, value = item
+                with log_context(batch=seq):
+                    if pool:
+                        result = pool.submit(run_with_log_context, current_log_context(), stage.func, value).result()
+                    else:
+                        result = stage.func(value)
+                self._emit(state, q_out, seq, result)
+
+            with state.lock:
+                state.finished += 1
+                last = state.finished == stage.workers
+            if last:
+                self._put(q_out, _END)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            self._fail(e)
+
+    def _emit(self, state: _StageState, q_out: queue.Queue, seq: int, result: Any):
+        if not self.ordered:
+            self._put(q_out, (seq, result))
+            return
+        with state.turn:
+            while state.next_seq != seq:
+                if self._abort.is_set():
+                    raise _Aborted()
+                state.turn.wait(self.poll_interval)
+            self._put(q_out, (seq, result))
+            state.next_seq += 1
+            state.turn.notify_all()
+
+    def _fail(self, error: BaseException):
+        self._errors.append(error)
+        self._abort.set()
+
+    def _put(self, q: queue.Queue, item: Any):
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                q.put(item, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            if self._abort.is_set():
+                raise _Aborted()
+            try:
+                return q.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
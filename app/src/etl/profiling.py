@@ -0,0 +1,198 @@
+"""
+Profiling mode of ETLOrchestrator.run.
+
+A RunProfiler samples the Python stacks of every thread while a run
+executes, keeps the optimized plans the run collects and the per-batch
+stage timings of the metrics registry, and writes them to a report
+directory with a summary of the top costs.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+import polars as pl
+from ..utils.logger import get_logger
+from ..utils.metrics import METRICS
+
+SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 64
+TOP_FUNCTIONS = 20
+
+CATEGORIES = {
+    "polars": "polars (native engine)",
+    "udf": "python UDFs",
+    "loader": "loader (python)",
+    "sqlalchemy": "sqlalchemy",
+    "python": "other python",
+}
+
+Frame = Tuple[str, str, int]
+
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", os.path.join("concurrent", "futures", "thread.py"))
+_UDF_FILES = ("transform_helpers.py", "crypto.py")
+
+
+def _categorize(stack: List[Frame], python_thread: bool) -> str:
+    """Cost category of one sampled stack, leaf frame first."""
+    leaf_file = stack[0][0]
+    if leaf_file.endswith(_IDLE_FILES):
+        return "idle"
+    files = [filename for filename, _, _ in stack]
+    if any(f"{os.sep}sqlalchemy{os.sep}" in filename for filename in files):
+        return "sqlalchemy"
+    if any(f"{os.sep}loaders{os.sep}" in filename or (name == "load_batch" and filename.endswith("batch_worker.py"))
+           for filename, name, _ in stack):
+        return "loader"
+    # threads Polars starts only run Python to call UDFs
+    if not python_thread or any(filename.endswith(_UDF_FILES) for filename in files) or any(
+            name == "apply" and filename.endswith("default_transformer.py") for filename, name, _ in stack):
+        return "udf"
+    if f"{os.sep}polars{os.sep}" in leaf_file:
+        return "polars"
+    return "python"
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of all other threads every interval seconds."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="etl-profiler", daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.idle = 0
+        self.categories: Counter = Counter()
+        self.self_counts: Counter = Counter()
+        self.inclusive_counts: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            python_threads = {thread.ident for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                    frame = frame.f_back
+                category = _categorize(stack, ident in python_threads)
+                if category == "idle":
+                    self.idle += 1
+                    continue
+                self.samples += 1
+                self.categories[category] += 1
+                self.self_counts[stack[0]] += 1
+                self.inclusive_counts.update(set(stack))
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """Collects the profile of one orchestrator run into report_dir."""
+
+    def __init__(self, report_dir: str, job: str, interval: float = SAMPLE_INTERVAL):
+        self.report_dir = report_dir
+        self.job = job
+        self.sampler = StackSampler(interval)
+        self.plans: Dict[str, List[str]] = {}
+        self._plan_lock = threading.Lock()
+        self.logger = get_logger("ETL.Profiler")
+        self.started_at = 0.0
+        self.seconds = 0.0
+
+    def start(self) -> "RunProfiler":
+        self.started_at = time.time()
+        self.sampler.start()
+        return self
+
+    def plan(self, label: str, records: pl.LazyFrame):
+        """Keep the optimized plan of records; identical plans are stored once."""
+        text = records.explain(optimized=True)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+        with self._plan_lock:
+            uses = self.plans.setdefault(digest, [])
+            uses.append(label)
+            if len(uses) == 1:
+                os.makedirs(os.path.join(self.report_dir, "plans"), exist_ok=True)
+                with open(os.path.join(self.report_dir, "plans", f"{digest}.txt"), "w", encoding="utf-8") as handle:
+                    handle.write(f"# {label}\n{text}\n")
+
+    def stop(self) -> str:
+        """Stop sampling and write the report, returning its directory."""
+        self.sampler.stop()
+        self.seconds = time.time() - self.started_at
+        os.makedirs(self.report_dir, exist_ok=True)
+        stages = [e for e in METRICS.events() if e["job"] == self.job and e["time"] >= self.started_at]
+        self._write_json("stages.json", stages)
+        self._write_json("samples.json", {
+            "interval": self.sampler.interval,
+            "samples": self.sampler.samples,
+            "idle": self.sampler.idle,
+            "categories": dict(self.sampler.categories),
+            "functions": [
+                {"file": f, "function": name, "line": line, "self": count,
+                 "inclusive": self.sampler.inclusive_counts[(f, name, line)]}
+                for (f, name, line), count in self.sampler.self_counts.most_common()
+            ],
+        })
+        self._write_json("plans.json", self.plans)
+        with open(os.path.join(self.report_dir, "summary.txt"), "w", encoding="utf-8") as handle:
+            handle.write(self.summary(stages))
+        self.logger.info(f"Profile of '{self.job}' written to {self.report_dir}")
+        return self.report_dir
+
+    def _write_json(self, name: str, value: Any):
+        with open(os.path.join(self.report_dir, name), "w", encoding="utf-8") as handle:
+            json.dump(value, handle, indent=2, default=str)
+
+    def summary(self, stages: List[Dict[str, Any]]) -> str:
+        """Top costs of the run as text."""
+        sampler = self.sampler
+        busy = max(sampler.samples, 1)
+        lines = [
+            f"Profile of job '{self.job}': {self.seconds:.2f}s, {sampler.samples} busy samples "
+            f"every {sampler.interval * 1000:.0f} ms (threads sampled together can overlap)",
+            "",
+            "Time by category",
+        ]
+        for category, count in sampler.categories.most_common():
+            lines.append(f"  {CATEGORIES[category]:<26}{count / busy:>7.1%}")
+
+        lines += ["", "Stages (from the metrics registry)",
+                  f"  {'stage':<12}{'table':<24}{'batches':>8}{'seconds':>10}{'rows/s':>14}"]
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for event in stages:
+            total = totals.setdefault((event["stage"], event["table"] or "-"), [0, 0.0, 0])
+            total[0] += 1
+            total[1] += event["seconds"]
+            total[2] += event["rows_out"] if event["rows_out"] is not None else (event["rows_in"] or 0)
+        for (stage, table), (batches, seconds, rows) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            rate = f"{rows / seconds:,.0f}" if seconds > 0 else "-"
+            lines.append(f"  {stage:<12}{table:<24}{batches:>8}{seconds:>10.3f}{rate:>14}")
+
+        lines += ["", "Top functions (self samples)"]
+        for (filename, name, line), count in sampler.self_counts.most_common(TOP_FUNCTIONS):
+            inclusive = sampler.inclusive_counts[(filename, name, line)]
+            lines.append(f"  {count / busy:>7.1%} self {inclusive / busy:>7.1%} total  "
+                         f"{name} ({os.path.basename(filename)}:{line})")
+
+        lines += ["", "Plans"]
+        for digest, uses in self.plans.items():
+            lines.append(f"  plans/{digest}.txt  {', '.join(sorted(set(uses)))} (used {len(uses)}x)")
+        return "\n".join(lines) + "\n"
+
+
+def report_dir_for(profile: Any, job: str) -> str:
+    """profile=True writes to profiles/<job>-<time>, a string is the directory itself."""
+    if isinstance(profile, str):
+        return profile
+    safe_job = "".join(c if c.isalnum() or c in "-_" else "_" for c in job)
+    return os.path.join("profiles", f"{safe_job}-{time.strftime('%Y%m%d-%H%M%S')}")
@@ -0,0 +1,243 @@
+"""Dependency-aware scheduler running several ETL jobs concurrently."""
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from ..domain.entities import ETLConfig, ETLJob, MultiTargetETLConfig
+from ..adapters.extractors.source_extractor_factory import SourceExtractorFactory
+from ..adapters.loaders.storage_loader_factory import StorageLoaderFactory
+from ..utils import crypto
+from ..utils.logger import ETLLogger, get_logger
+
+Target = Tuple[str, ...]
+
+
+def run_etl_job(config: Union[ETLConfig, MultiTargetETLConfig]) -> bool:
+    """Run one job with a fresh orchestrator (executed inside a pool worker)."""
+    from .orchestrator import ETLOrchestrator
+    return ETLOrchestrator().run(config)
+
+
+def _init_worker(extractors: Dict, loaders: Dict, encryption_workers: int, log_initializer: Callable, log_args: Tuple):
+    """
+    Process pool initializer: register the parent's adapters, which spawned
+    workers would not have, size the worker's encryption pool to its share
+    of the CPUs and log through the parent.
+    """
+    for source_type, extractor_cls in extractors.items():
+        SourceExtractorFactory.register(source_type, extractor_cls)
+    for storage_type, loader_cls in loaders.items():
+        StorageLoaderFactory.register(storage_type, loader_cls)
+    crypto.ENCRYPTION_WORKERS = encryption_workers
+    log_initializer(*log_args)
+
+
+@dataclass
+class JobResult:
+    """Outcome and timing of one scheduled job."""
+    name: str
+    status: str = "pending"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def wall_time(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+@dataclass
+class ScheduleReport:
+    """Per-job results plus total and critical-path wall time."""
+    jobs: Dict[str, JobResult]
+    wall_time: float
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_time: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return all(job.status == "succeeded" for job in self.jobs.values())
+
+
+class ETLScheduler:
+    """
+    Runs ETL jobs as a DAG of declared dependencies.
+
+    A job starts once every job it depends on has succeeded. Jobs whose
+    dependencies failed are skipped. Independent jobs run concurrently on a
+    process pool, limited by max_workers overall and by target_limits per
+    storage target. Job workers are spawned, and each gets an encryption
+    pool of ENCRYPTION_WORKERS // max_workers processes (at least one), so
+    concurrent jobs share the CPUs instead of each taking all of them.
+
+    A target is (storage type, database or dataset, table), see
+    ETLJob.storage_targets. A limit applies to every target starting with
+    its key, so {"database": 4, ("database", "default"): 2,
+    ("database", "default", "users"): 1} allows four database jobs, two on
+    the default database and one writing users at a time.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        target_limits: Optional[Dict[Union[str, Target], int]] = None,
+        executor: str = "process",
+        runner: Callable[[Union[ETLConfig, MultiTargetETLConfig]], bool] = run_etl_job
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum jobs running at once
+            target_limits: Maximum concurrent jobs per storage type (str key)
+                or storage target prefix (tuple key)
+            executor: 'process' (default) or 'thread'
+            runner: Function running one job's config, must be picklable
+                for the process executor
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"Unsupported executor: {executor}")
+        if any(limit < 1 for limit in (target_limits or {}).values()):
+            raise ValueError(f"Target limits must be at least 1: {target_limits}")
+        self.max_workers = max_workers
+        self.target_limits: Dict[Target, int] = {
+            (key,) if isinstance(key, str) else tuple(key): limit for key, limit in (target_limits or {}).items()
+        }
+        self.executor = executor
+        self.runner = runner
+        self.logger = get_logger("ETL.Scheduler")
+
+    def run(self, jobs: List[ETLJob]) -> ScheduleReport:
+        """
+        Run all jobs, respecting dependencies and concurrency limits.
+
+        Returns:
+            ScheduleReport with per-job status and wall time
+        """
+        self._validate(jobs)
+        results = {job.name: JobResult(job.name) for job in jobs}
+        running: Dict[Future, ETLJob] = {}
+        target_usage: Dict[Target, int] = {}
+        pending = list(jobs)
+
+        if self.executor == "process":
+            # workers log through this process's listener
+            log_initializer, log_args = ETLLogger.process_logging()
+            # spawned, forking a process running Polars threads can deadlock the children
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(dict(SourceExtractorFactory._registry), dict(StorageLoaderFactory._registry),
+                          max(1, crypto.ENCRYPTION_WORKERS // self.max_workers), log_initializer, log_args)
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        start = time.time()
+        with pool:
+            while pending or running:
+                for job in list(pending):
+                    statuses = [results[dep].status for dep in job.depends_on]
+                    if any(s in ("failed", "skipped") for s in statuses):
+                        pending.remove(job)
+                        results[job.name].status = "skipped"
+                        self.logger.info(f"Skipping job '{job.name}': a dependency did not succeed")
+                    elif all(s == "succeeded" for s in statuses) and self._has_capacity(job, running, target_usage):
+                        pending.remove(job)
+                        self._acquire(job, target_usage, 1)
+                        results[job.name].status = "running"
+                        results[job.name].started_at = time.time()
+                        self.logger.info(f"Starting job '{job.name}'")
+                        running[pool.submit(self.runner, job.config)] = job
+
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self._acquire(job, target_usage, -1)
+                    result = results[job.name]
+                    result.finished_at = time.time()
+                    try:
+                        result.status = "succeeded" if future.result() else "failed"
+                    except Exception as e:
+                        self.logger.exception(f"Job '{job.name}' raised: {e}")
+                        result.status = "failed"
+                    self.logger.info(f"Job '{job.name}' {result.status} in {result.wall_time:.2f} seconds")
+
+        critical_path, critical_time = self._critical_path(jobs, results)
+        report = ScheduleReport(results, time.time() - start, critical_path, critical_time)
+        self.logger.info(
+            f"Scheduled {len(jobs)} jobs in {report.wall_time:.2f} seconds, "
+            f"critical path {' -> '.join(critical_path)} took {critical_time:.2f} seconds"
+        )
+        return report
+
+    def _limits_of(self, job: ETLJob) -> List[Target]:
+        """Limit keys covering the job's targets; a job counts once per key."""
+        return sorted({
+            target[:n] for target in job.storage_targets for n in range(1, len(target) + 1)
+            if target[:n] in self.target_limits
+        })
+
+    def _has_capacity(self, job: ETLJob, running: Dict[Future, ETLJob], target_usage: Dict[Target, int]) -> bool:
+        if len(running) >= self.max_workers:
+            return False
+        return all(target_usage.get(key, 0) < self.target_limits[key] for key in self._limits_of(job))
+
+    def _acquire(self, job: ETLJob, target_usage: Dict[Target, int], delta: int):
+        for key in self._limits_of(job):
+            target_usage[key] = target_usage.get(key, 0) + delta
+
+    @staticmethod
+    def _validate(jobs: List[ETLJob]) -> Dict[str, ETLJob]:
+        """Check names are unique, dependencies exist and there is no cycle."""
+        by_name = {}
+        for job in jobs:
+            if job.name in by_name:
+                raise ValueError(f"Duplicate job name: {job.name}")
+            by_name[job.name] = job
+        for job in jobs:
+            for dep in job.depends_on:
+                if dep not in by_name:
+                    raise ValueError(f"Job '{job.name}' depends on unknown job '{dep}'")
+
+        visiting, done = set(), set()
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+            visiting.add(name)
+            for dep in by_name[name].depends_on:
+                visit(dep, path + (name,))
+            visiting.discard(name)
+            done.add(name)
+
+        for job in jobs:
+            visit(job.name, ())
+        return by_name
+
+    @staticmethod
+    def _critical_path(jobs: List[ETLJob], results: Dict[str, JobResult]) -> Tuple[List[str], float]:
+        """Longest chain of dependent jobs by measured wall time."""
+        by_name = {job.name: job for job in jobs}
+        longest: Dict[str, Tuple[float, List[str]]] = {}
+
+        def chain(name: str) -> Tuple[float, List[str]]:
+            if name not in longest:
+                best_time, best_path = 0.0, []
+                for dep in by_name[name].depends_on:
+                    dep_time, dep_path = chain(dep)
+                    if dep_time > best_time:
+                        best_time, best_path = dep_time, dep_path
+                longest[name] = (best_time + results[name].wall_time, best_path + [name])
+            return longest[name]
+
+        if not jobs:
+            return [], 0.0
+        critical_time, critical_path = max(chain(job.name) for job in jobs)
+        return critical_path, critical_time
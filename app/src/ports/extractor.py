@@ -2,7 +2,7 @@
 
 import polars as pl
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 
 
@@ -10,12 +10,17 @@ class Extractor(ABC):
     """Abstract interface for data extractors."""
     
     @abstractmethod
-    def extract(self, source_path: str) -> pl.LazyFrame:
+    def extract(
+        self,
+        source_path: Union[str, List[str]],
+        source_config: Optional[Dict[str, Any]] = None
+    ) -> pl.LazyFrame:
         """
         Extract data from a source.
         
         Args:
-            source_path: Path to the data source
+            source_path: Path, glob, directory or list of paths of the data source
+            source_config: Optional source options, e.g. include_file_paths
             
         Returns:
             List of Record objects containing extracted data
@@ -23,15 +28,26 @@ class Extractor(ABC):
         pass
     
     @abstractmethod
-    def validate_source(self, source_path: str) -> bool:
+    def validate_source(self, source_path: Union[str, List[str]]) -> bool:
         """
         Validate if the source is accessible and valid.
         
         Args:
-            source_path: Path to the data source
+            source_path: Path, glob, directory or list of paths of the data source
             
         Returns:
             True if source is valid, False otherwise
         """
         pass
 
+    def source_files(self, source_path: Union[str, List[str]]) -> Optional[List[str]]:
+        """
+        Files a source resolves to, in scan order.
+
+        Args:
+            source_path: Path, glob, directory or list of paths of the data source
+
+        Returns:
+            The files, or None if the extractor does not read local files
+        """
+        return None
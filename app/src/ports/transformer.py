@@ -2,7 +2,7 @@
 
 import polars as pl
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 # from ..domain.entities import Record
 
 
@@ -10,16 +10,20 @@ class Transformer(ABC):
     """Abstract interface for data transformers."""
     
     @abstractmethod
-    def transform(self, records: pl.DataFrame, config: Dict[str, Any] = None) -> pl.DataFrame :
+    def transform(
+        self,
+        records: Union[pl.DataFrame, pl.LazyFrame],
+        config: Dict[str, Any] = None
+    ) -> Union[pl.DataFrame, pl.LazyFrame]:
         """
-        Transform a dataframe of records.
+        Transform a dataframe or lazy plan of records.
         
         Args:
-            records: dataframe
+            records: dataframe, or lazy plan to extend without collecting it
             config: Optional configuration for transformation rules
             
         Returns:
-            transformed dataframe
+            transformed records, of the same kind as the input
         """
         pass
 
@@ -1,12 +1,28 @@
 import polars as pl
 from cryptography.fernet import Fernet
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+import atexit
+import math
+import multiprocessing
 import os
 import codecs
+import threading
+from .logger import ETLLogger
 
 key_str=os.environ.get("ENCRYPTION_KEY","5349613930632d36354d78492d5154516b75494e516b6b577847357556564a6f47677662714f5233646b413d")
 ENCRYPTION_KEY = codecs.decode(key_str.encode('utf-8'), 'hex')
 cipher_suite = Fernet(ENCRYPTION_KEY)
 
+# Worker processes used by encrypt_series / decrypt_series.
+ENCRYPTION_WORKERS = int(os.environ.get("ENCRYPTION_WORKERS", os.cpu_count() or 1))
+# Below this many rows per worker a pool costs more than it saves.
+MIN_ROWS_PER_WORKER = 20000
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Condition()
+_active_runs = 0
+
 def encrypt_value(value: str) -> bytes:
     """Encrypts a single string value using Fernet (AES-128 in CBC mode)."""
     # Fernet works with bytes, so we encode the input string
@@ -19,3 +35,115 @@ def decrypt_value(value: bytes) -> str:
     return cipher_suite.decrypt(value).decode('utf-8')
 
 
+def encrypt_series(values: Any, workers: Optional[int] = None) -> pl.Series:
+    """
+    Encrypts a whole column (polars Series or Arrow array) into Fernet tokens.
+
+    Rows are split into contiguous chunks encrypted on a process pool, so
+    every token can still be read back with decrypt_value. Nulls stay null.
+
+    Args:
+        values: Series or Arrow array of strings
+        workers: Maximum chunks encrypted in parallel (default and upper
+            bound: ENCRYPTION_WORKERS, the size of the pool)
+
+    Returns:
+        Binary Series of Fernet tokens
+    """
+    series = _to_series(values)
+    tokens = _run_chunked(_encrypt_chunk, series.cast(pl.Utf8).to_list(), workers)
+    return pl.Series(series.name, tokens, dtype=pl.Binary)
+
+
+def decrypt_series(values: Any, workers: Optional[int] = None) -> pl.Series:
+    """
+    Decrypts a whole column of Fernet tokens back to strings.
+
+    Args:
+        values: Series or Arrow array of tokens
+        workers: Maximum chunks decrypted in parallel (default and upper
+            bound: ENCRYPTION_WORKERS, the size of the pool)
+
+    Returns:
+        String Series
+    """
+    series = _to_series(values)
+    plain = _run_chunked(_decrypt_chunk, series.to_list(), workers)
+    return pl.Series(series.name, plain, dtype=pl.Utf8)
+
+
+def encrypt_expr(column: str) -> pl.Expr:
+    """Expression encrypting a column with encrypt_series."""
+    return pl.col(column).map_batches(encrypt_series, return_dtype=pl.Binary, is_elementwise=True)
+
+
+def decrypt_expr(column: str) -> pl.Expr:
+    """Expression decrypting a column with decrypt_series."""
+    return pl.col(column).map_batches(decrypt_series, return_dtype=pl.Utf8, is_elementwise=True)
+
+
+def _to_series(values: Any) -> pl.Series:
+    if isinstance(values, pl.Series):
+        return values
+    return pl.Series(values)
+
+
+def _encrypt_chunk(values: List[Optional[str]]) -> List[Optional[bytes]]:
+    return [None if value is None else encrypt_value(value) for value in values]
+
+
+def _decrypt_chunk(values: List[Optional[bytes]]) -> List[Optional[str]]:
+    return [None if value is None else decrypt_value(value) for value in values]
+
+
+def _run_chunked(func: Callable[[list], list], values: list, workers: Optional[int]) -> list:
+    """Run func over contiguous chunks of values, in parallel when it pays off."""
+    if workers is None:
+        workers = ENCRYPTION_WORKERS
+    # the pool keeps its size, only the number of chunks follows the batch
+    chunk_count = max(1, min(workers, ENCRYPTION_WORKERS, len(values) // MIN_ROWS_PER_WORKER))
+    if chunk_count == 1:
+        return func(values)
+
+    chunk_size = math.ceil(len(values) / chunk_count)
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    global _active_runs
+    with _executor_lock:
+        executor = _get_executor()
+        _active_runs += 1
+    try:
+        results = list(executor.map(func, chunks))
+    finally:
+        with _executor_lock:
+            _active_runs -= 1
+            _executor_lock.notify_all()
+    return [value for chunk in results for value in chunk]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Process pool of ENCRYPTION_WORKERS reused across batches; the caller
+    holds _executor_lock. Workers are spawned rather than forked, as this
+    runs on Polars' threads.
+    """
+    global _executor
+    if _executor is None:
+        initializer, initargs = ETLLogger.process_logging()
+        _executor = ProcessPoolExecutor(
+            max_workers=ENCRYPTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs
+        )
+    return _executor
+
+
+@atexit.register
+def shutdown_executor():
+    """Shut down the encryption process pool, once no column is using it."""
+    global _executor
+    with _executor_lock:
+        _executor_lock.wait_for(lambda: _active_runs == 0)
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = None
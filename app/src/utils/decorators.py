@@ -2,13 +2,18 @@ import time
 import functools
 from typing import Callable, Any
 from .logger import get_logger
+from .metrics import FUNCTION_SECONDS, METRICS
 
 
 def time_execution(func_path: str, logger_name: str = "ETL.Timing"):
     """
     Decorator to measure and log execution time of a function or method.
+
+    Every call is also observed in the etl_function_seconds histogram of
+    the metrics registry, labelled with func_path and its outcome.
     
     Args:
+        func_path: Name of the function in logs and metrics
         logger_name: Name of the logger to use for timing logs
         
     Returns:
@@ -32,6 +37,7 @@ def time_execution(func_path: str, logger_name: str = "ETL.Timing"):
                 
                 # Calculate elapsed time
                 elapsed_time = time.perf_counter() - start_time
+                METRICS.observe(FUNCTION_SECONDS, elapsed_time, function=func_path, outcome="ok")
                 
                 # Format time for display
                 if elapsed_time < 1:
@@ -50,6 +56,7 @@ def time_execution(func_path: str, logger_name: str = "ETL.Timing"):
             except Exception as e:
                 # Calculate elapsed time even on error
                 elapsed_time = time.perf_counter() - start_time
+                METRICS.observe(FUNCTION_SECONDS, elapsed_time, function=func_path, outcome="error")
                 time_str = f"{elapsed_time:.2f} seconds"
                 logger.error(f"{display_name} failed after {time_str}: {e}")
                 raise
@@ -1,73 +1,259 @@
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import re
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Default rate limit: records with the same logger, level and message
+# (ignoring numbers) allowed per interval, below WARNING.
+RATE_LIMIT = 20
+RATE_INTERVAL = 10.0
+
+_CONTEXT_FIELDS = ("job", "run", "batch")
+_log_context: contextvars.ContextVar = contextvars.ContextVar("etl_log_context", default={})
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Add fields (job, run, batch) to the records logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def current_log_context() -> Dict[str, Any]:
+    return _log_context.get()
+
+
+def run_with_log_context(context: Dict[str, Any], func: Callable, *args: Any) -> Any:
+    """Call func under context, e.g. in a process pool worker."""
+    with log_context(**context):
+        return func(*args)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the log context onto every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in _CONTEXT_FIELDS:
+            setattr(record, field, context.get(field))
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `limit` similar records per `interval` seconds.
+
+    Records are similar when logger, level and message match once digits
+    are ignored, so per-batch messages count as one. The first record let
+    through after a quiet period reports how many were dropped. WARNING
+    and above are never dropped.
+    """
+
+    _digits = re.compile(r"\d+")
+
+    def __init__(self, limit: int = RATE_LIMIT, interval: float = RATE_INTERVAL):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self._lock = threading.Lock()
+        # key -> [window start, records in window, dropped]
+        self._windows: Dict[Tuple[str, int, str], List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.levelno, self._digits.sub("#", str(record.msg)))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                dropped = int(window[2]) if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.limit:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        if dropped:
+            record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the log context fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a queue read in this process: records are queued as
+    they are and formatted by the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _queue_handler(log_queue: Any, log_level: int, rate_limit: int, rate_interval: float,
+                   local: bool = False) -> logging.Handler:
+    handler = (_LocalQueueHandler if local else logging.handlers.QueueHandler)(log_queue)
+    handler.setLevel(log_level)
+    _add_filters(handler, rate_limit, rate_interval)
+    return handler
+
+
+def _add_filters(handler: logging.Handler, rate_limit: int, rate_interval: float):
+    handler.addFilter(ContextFilter())
+    if rate_limit:
+        handler.addFilter(RateLimitFilter(rate_limit, rate_interval))
+
+
+def _configure_worker(log_queue: Any, log_level: int, rate_limit: int, rate_interval: float):
+    """Process pool initializer sending the worker's records to the parent."""
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    root_logger.handlers.clear()
+    root_logger.addHandler(_queue_handler(log_queue, log_level, rate_limit, rate_interval))
+    # the listeners belong to the parent process
+    ETLLogger._listener = ETLLogger._process_listener = None
+    ETLLogger._configured = True
 
 
 class ETLLogger:
+    """
+    Logging of the ETL system.
+
+    Loggers only put records on a queue; a listener thread formats and
+    writes them to stdout, so slow consoles or Docker log drivers never
+    stall the threads moving data. Process pool workers send their records
+    to the listener of the parent process (see process_logging); other
+    forked children write to the console handlers directly.
+    """
 
-    
     _configured: bool = False
-    
+    _settings: Tuple[int, int, float] = (logging.INFO, RATE_LIMIT, RATE_INTERVAL)
+    _handlers: List[logging.Handler] = []
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _process_queue: Any = None
+    _process_listener: Optional[logging.handlers.QueueListener] = None
+    _lock = threading.Lock()
+
     @classmethod
     def get_logger(cls, name: str = "ETL") -> logging.Logger:
         """
         Get or create a logger instance.
-        
+
         Args:
             name: Logger name (default: "ETL")
-            
+
         Returns:
             Configured logger instance
         """
         if not cls._configured:
             cls._configure()
-        
+
         return logging.getLogger(name)
-    
+
     @classmethod
     def _configure(
         cls,
-        log_level: int = logging.INFO
+        log_level: int = logging.INFO,
+        json_format: bool = False,
+        rate_limit: int = RATE_LIMIT,
+        rate_interval: float = RATE_INTERVAL,
+        force: bool = False
     ):
         """
         Configure logging for the ETL system (console only).
-        
+
         Args:
             log_level: Logging level (default: INFO)
+            json_format: If True, write one JSON object per record
+            rate_limit: Similar records let through per rate_interval, 0
+                disables rate limiting
+            rate_interval: Seconds of a rate limit window
+            force: Replace an earlier configuration
         """
-        if cls._configured:
-            return
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        # Get root logger
-        root_logger = logging.getLogger()
-        root_logger.setLevel(log_level)
-        
-        # Remove existing handlers to avoid duplicates
-        root_logger.handlers.clear()
-        
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(log_level)
-        console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
-        
-        cls._configured = True
-    
+        with cls._lock:
+            if cls._configured and not force:
+                return
+            cls.shutdown()
+
+            if json_format:
+                formatter = JsonFormatter()
+            else:
+                formatter = logging.Formatter(
+                    '%(asctime)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S'
+                )
+
+            # Console handler, only used by the listener thread
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setLevel(log_level)
+            console_handler.setFormatter(formatter)
+            cls._handlers = [console_handler]
+
+            log_queue = queue.SimpleQueue()
+            cls._listener = logging.handlers.QueueListener(log_queue, *cls._handlers, respect_handler_level=True)
+            cls._listener.start()
+
+            # Get root logger
+            root_logger = logging.getLogger()
+            root_logger.setLevel(log_level)
+
+            # Remove existing handlers to avoid duplicates
+            root_logger.handlers.clear()
+            root_logger.addHandler(_queue_handler(log_queue, log_level, rate_limit, rate_interval, local=True))
+
+            cls._settings = (log_level, rate_limit, rate_interval)
+            cls._configured = True
+
     @classmethod
     def configure(
         cls,
-        log_level: str = "INFO"
+        log_level: str = "INFO",
+        json_format: bool = False,
+        rate_limit: int = RATE_LIMIT,
+        rate_interval: float = RATE_INTERVAL
     ):
         """
         Public method to configure logging with string log level (console only).
-        
+
         Args:
             log_level: Logging level as string ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+            json_format: If True, write one JSON object per record including
+                the job, run and batch of the log context
+            rate_limit: Similar INFO/DEBUG records let through per
+                rate_interval seconds, 0 disables rate limiting
+            rate_interval: Seconds of a rate limit window
         """
         level_map = {
             "DEBUG": logging.DEBUG,
@@ -76,11 +262,63 @@ class ETLLogger:
             "ERROR": logging.ERROR,
             "CRITICAL": logging.CRITICAL
         }
-        
+
         numeric_level = level_map.get(log_level.upper(), logging.INFO)
-        cls._configure(log_level=numeric_level)
+        cls._configure(log_level=numeric_level, json_format=json_format,
+                       rate_limit=rate_limit, rate_interval=rate_interval, force=True)
+
+    @classmethod
+    def process_logging(cls) -> Tuple[Callable, Tuple]:
+        """
+        Initializer and initargs for process pools, so the records of their
+        workers reach this process's listener through a multiprocessing queue.
+        """
+        if not cls._configured:
+            cls._configure()
+        with cls._lock:
+            if cls._process_listener is None:
+                # a spawn queue can be shared with forked and spawned workers alike
+                cls._process_queue = multiprocessing.get_context("spawn").Queue()
+                cls._process_listener = logging.handlers.QueueListener(
+                    cls._process_queue, *cls._handlers, respect_handler_level=True
+                )
+                cls._process_listener.start()
+            return _configure_worker, (cls._process_queue, *cls._settings)
+
+    @classmethod
+    def _after_fork_in_child(cls):
+        """
+        The listener threads are not forked: move the child's root logger
+        from the queue onto the console handlers, unless a pool initializer
+        (see process_logging) moves it onto the parent's queue afterwards.
+        """
+        cls._lock = threading.Lock()
+        if cls._listener is None:
+            return
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, _LocalQueueHandler):
+                root_logger.removeHandler(handler)
+        log_level, rate_limit, rate_interval = cls._settings
+        for handler in cls._handlers:
+            handler.filters.clear()
+            _add_filters(handler, rate_limit, rate_interval)
+            root_logger.addHandler(handler)
+        cls._listener = cls._process_listener = None
+
+    @classmethod
+    def shutdown(cls):
+        """Write the queued records and stop the listener threads."""
+        for listener in (cls._process_listener, cls._listener):
+            if listener is not None:
+                listener.stop()
+        cls._process_listener = cls._listener = cls._process_queue = None
+        cls._configured = False
+
+
+atexit.register(ETLLogger.shutdown)
+os.register_at_fork(after_in_child=ETLLogger._after_fork_in_child)
 
 
 def get_logger(name: str = "ETL") -> logging.Logger:
     return ETLLogger.get_logger(name)
-
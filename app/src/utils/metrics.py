@@ -0,0 +1,235 @@
+"""
+In-process metrics for ETL runs.
+
+Durations go into fixed-bucket histograms and row/byte counts into
+counters, both keyed by name and labels. Recording is a dict lookup and a
+bisect under a lock, cheap enough to leave on for every batch. Metrics are
+exported as a Prometheus textfile (for the node_exporter textfile
+collector) and as JSON lines.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds in seconds, from a millisecond to ten minutes.
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+# Per-batch events kept for the JSON lines export.
+MAX_EVENTS = 10000
+
+STAGE_SECONDS = "etl_stage_seconds"
+STAGE_ROWS_IN = "etl_stage_rows_in_total"
+STAGE_ROWS_OUT = "etl_stage_rows_out_total"
+STAGE_BYTES = "etl_stage_bytes_total"
+FUNCTION_SECONDS = "etl_function_seconds"
+
+HELP = {
+    STAGE_SECONDS: "Duration of an ETL stage per batch",
+    STAGE_ROWS_IN: "Rows entering an ETL stage",
+    STAGE_ROWS_OUT: "Rows leaving an ETL stage",
+    STAGE_BYTES: "Estimated bytes leaving an ETL stage",
+    FUNCTION_SECONDS: "Duration of functions decorated with time_execution",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a sum and a count."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs ending with +Inf, as Prometheus expects."""
+        total, pairs = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = labels + ((extra,) if extra else ())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    """Histograms, counters and recent per-batch events of one process."""
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._batches: Dict[Labels, int] = {}
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items() if value is not None))
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """Add a duration to the histogram name{labels}."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        """Add value to the counter name{labels}."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def record_stage(
+        self,
+        job: str,
+        stage: str,
+        seconds: float,
+        rows_in: Optional[int] = None,
+        rows_out: Optional[int] = None,
+        bytes_out: Optional[int] = None,
+        table: Optional[str] = None
+    ):
+        """
+        Record one batch passing through a stage.
+
+        The batch number in the event is the sequence number of the batch
+        for this job, stage and table.
+        """
+        key = self._labels({"job": job, "stage": stage, "table": table})
+        rows = rows_out if rows_out is not None else rows_in
+        with self._lock:
+            series = self._histograms.setdefault(STAGE_SECONDS, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+            for name, value in ((STAGE_ROWS_IN, rows_in), (STAGE_ROWS_OUT, rows_out), (STAGE_BYTES, bytes_out)):
+                if value is not None:
+                    counters = self._counters.setdefault(name, {})
+                    counters[key] = counters.get(key, 0) + value
+            batch = self._batches.get(key, 0)
+            self._batches[key] = batch + 1
+            self._events.append({
+                "time": time.time(), "job": job, "stage": stage, "table": table, "batch": batch,
+                "seconds": seconds, "rows_in": rows_in, "rows_out": rows_out, "bytes": bytes_out,
+                "rows_per_s": rows / seconds if rows is not None and seconds > 0 else None,
+            })
+
+    @contextmanager
+    def stage(self, job: str, stage: str, table: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Time a block as one batch of a stage. Set rows_in, rows_out and
+        bytes_out on the yielded dict to record them too.
+        """
+        counts: Dict[str, Any] = {}
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.record_stage(job, stage, time.perf_counter() - start, table=table, **counts)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """The recent per-batch events, oldest first."""
+        with self._lock:
+            return list(self._events)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Current value of every series."""
+        with self._lock:
+            histograms = [
+                {"name": name, "labels": dict(labels), "count": h.count, "sum": h.sum,
+                 "buckets": dict(h.cumulative())}
+                for name, series in self._histograms.items() for labels, h in series.items()
+            ]
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for name, series in self._counters.items() for labels, value in series.items()
+            ]
+        return {"histograms": histograms, "counters": counters}
+
+    def to_prometheus(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                for labels, histogram in sorted(series.items()):
+                    for le, count in histogram.cumulative():
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+            for name, series in sorted(self._counters.items()):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write the textfile atomically, so the collector never reads half of it."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def write_json_lines(self, path: str, clear_events: bool = True):
+        """
+        Append the per-batch events, then one line per series, as JSON.
+        Written events are dropped unless clear_events is False.
+        """
+        with self._lock:
+            events = list(self._events)
+            if clear_events:
+                self._events.clear()
+        snapshot = self.snapshot()
+        exported_at = time.time()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as handle:
+            for event in events:
+                handle.write(json.dumps({"type": "batch", **event}) + "\n")
+            for kind in ("histograms", "counters"):
+                for series in snapshot[kind]:
+                    handle.write(json.dumps({"type": kind[:-1], "time": exported_at, **series}) + "\n")
+
+    def reset(self):
+        """Drop every series and event."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._events.clear()
+            self._batches.clear()
+
+
+# Registry of this process, used by time_execution and the orchestrator.
+METRICS = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return METRICS
@@ -0,0 +1,138 @@
+"""Declarative paths for flattening nested columns into a lazy plan."""
+
+import re
+import polars as pl
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, TypeVar, Union
+
+Frame = TypeVar("Frame", pl.DataFrame, pl.LazyFrame)
+
+SEGMENT_PATTERN = re.compile(r"^([^.\[\]*]+)(\[\])?$")
+
+
+@dataclass(frozen=True)
+class Segment:
+    """One field of a path; explode is set for `field[]`."""
+    name: str
+    explode: bool = False
+
+
+class NestedPath:
+    """
+    A parsed path such as `user_details.telephone_numbers[]` or `jobs_history[].*`.
+
+    - `a.b` reads struct field b of column a
+    - `a[]` explodes list a into one row per element
+    - a trailing `.*` unnests the struct into its fields
+
+    apply() turns the path into select/explode steps. Struct fields are read
+    (inside the list, where needed) before each explode, so an explode only
+    carries the parent key columns and the fields that are actually used.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        parts = path.split(".")
+        self.unnest = parts[-1] == "*"
+        if self.unnest:
+            parts = parts[:-1]
+        if not parts:
+            raise ValueError(f"Invalid nested path: {path!r}")
+        self.segments: Tuple[Segment, ...] = tuple(self._parse_segment(part, path) for part in parts)
+
+    @staticmethod
+    def _parse_segment(part: str, path: str) -> Segment:
+        match = SEGMENT_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid segment {part!r} in nested path {path!r}")
+        return Segment(match.group(1), bool(match.group(2)))
+
+    @property
+    def root(self) -> str:
+        return self.segments[0].name
+
+    def apply(self, records: Frame, keep: Optional[Sequence[str]] = None,
+              columns: Optional[Sequence[str]] = None) -> Frame:
+        """
+        Flatten records along the path.
+
+        Args:
+            records: DataFrame or LazyFrame holding the root column
+            keep: Top-level columns carried to every output row (default:
+                the top-level names in columns, or all other columns)
+            columns: Output columns that are used later, limits the fields
+                taken from a `.*` struct (default: all fields)
+
+        Returns:
+            keep columns followed by the flattened column(s)
+        """
+        schema = records.collect_schema()
+        if self.root not in schema:
+            raise ValueError(f"Column '{self.root}' of nested path {self.path!r} not found")
+        if keep is None:
+            candidates = columns if columns is not None else schema.names()
+            keep = [name for name in candidates if name in schema and name != self.root]
+        keep_exprs = [pl.col(name) for name in keep]
+
+        expr, dtype, in_list = pl.col(self.root), schema[self.root], False
+        for position, segment in enumerate(self.segments):
+            if position > 0:
+                if not isinstance(dtype, pl.Struct):
+                    raise ValueError(f"Cannot read field '{segment.name}' of {dtype} in nested path {self.path!r}")
+                fields = {field.name: field.dtype for field in dtype.fields}
+                if segment.name not in fields:
+                    raise ValueError(f"Field '{segment.name}' of nested path {self.path!r} not found")
+                expr, dtype = _field(expr, segment.name, in_list), fields[segment.name]
+            if segment.explode:
+                if not isinstance(dtype, pl.List):
+                    raise ValueError(f"Cannot explode {dtype} in nested path {self.path!r}")
+                if in_list:
+                    records = _explode(records, keep_exprs, expr, segment.name)
+                    expr = pl.col(segment.name)
+                dtype, in_list = dtype.inner, True
+
+        output = self.segments[-1].name
+        if self.unnest:
+            if not isinstance(dtype, pl.Struct):
+                raise ValueError(f"Cannot unnest {dtype} in nested path {self.path!r}")
+            outputs = [field.name for field in dtype.fields if columns is None or field.name in columns]
+            if not outputs:
+                raise ValueError(f"No used fields to unnest in nested path {self.path!r}")
+        else:
+            outputs = [output]
+        clashes = set(keep) & set(outputs)
+        if clashes:
+            raise ValueError(f"Nested path {self.path!r} output clashes with kept columns: {sorted(clashes)}")
+
+        if not self.unnest:
+            if in_list:
+                return _explode(records, keep_exprs, expr, output)
+            return records.select(keep_exprs + [expr.alias(output)])
+        if in_list:
+            narrowed = expr.list.eval(pl.struct(pl.element().struct.field(name) for name in outputs))
+            return _explode(records, keep_exprs, narrowed, output).unnest(output)
+        return records.select(keep_exprs + [expr.struct.field(name).alias(name) for name in outputs])
+
+
+def _field(expr: pl.Expr, name: str, in_list: bool) -> pl.Expr:
+    if in_list:
+        return expr.list.eval(pl.element().struct.field(name))
+    return expr.struct.field(name)
+
+
+def _explode(records: Frame, keep_exprs: List[pl.Expr], expr: pl.Expr, name: str) -> Frame:
+    return records.select(keep_exprs + [expr.alias(name)]).explode(name)
+
+
+@lru_cache(maxsize=256)
+def compile_path(path: str) -> NestedPath:
+    """Parse a nested path once and reuse it for every batch."""
+    return NestedPath(path)
+
+
+def flatten(records: Frame, path: Union[str, NestedPath], keep: Optional[Sequence[str]] = None,
+            columns: Optional[Sequence[str]] = None) -> Frame:
+    """Flatten records along a nested path, see NestedPath.apply."""
+    nested_path = compile_path(path) if isinstance(path, str) else path
+    return nested_path.apply(records, keep, columns)
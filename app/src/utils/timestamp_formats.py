@@ -0,0 +1,139 @@
+"""
+Learn which strptime formats parse a timestamp column.
+
+convert_to_timestamp_expr tries a list of formats natively and hands the
+rest to dateutil. learn_formats picks that list per column from a sample,
+keeping only formats that give the same value as dateutil on it.
+"""
+import json
+import os
+import threading
+import time
+import polars as pl
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from .transform_expressions import EPOCH, ORDINAL_SUFFIX_PATTERN, TIMESTAMP_FORMATS
+from .transform_helpers import convert_to_timestamp
+
+# Tried when learning, in order of preference for ties.
+CANDIDATE_FORMATS = TIMESTAMP_FORMATS + [
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%d %B %Y %H:%M:%S",
+    "%d %B %Y",
+    "%B %d %Y",
+    "%B %d, %Y",
+    "%d-%b-%Y",
+    "%Y%m%d%H%M%S",
+    "%Y%m%d",
+]
+
+SAMPLE_SIZE = 1000
+# A format is only kept if it adds at least this share of the sample.
+MIN_SHARE = 0.01
+MAX_FORMATS = 6
+
+
+@dataclass
+class LearnedFormats:
+    """Formats learned for one column and the share of the sample they parse."""
+    formats: List[str] = field(default_factory=list)
+    coverage: float = 0.0
+    sampled: int = 0
+
+
+def _cleaned(values: pl.Series) -> pl.Series:
+    """The string convert_to_timestamp_expr hands to strptime."""
+    return (
+        pl.when(values == "20001-01-01").then(pl.lit("2001-01-01")).otherwise(values)
+        .str.replace_all(ORDINAL_SUFFIX_PATTERN, "${1}")
+    )
+
+
+def learn_formats(
+    values: pl.Series,
+    candidates: Optional[List[str]] = None,
+    min_share: float = MIN_SHARE,
+    max_formats: int = MAX_FORMATS
+) -> LearnedFormats:
+    """
+    Greedily pick the formats that parse most rows of the sample the way
+    the scalar convert_to_timestamp does. Each distinct value is parsed
+    once, by every candidate and by dateutil.
+
+    A format that parses any not yet covered value to a different result is
+    skipped, so the formats can be tried in order with coalesce. Epoch
+    counts as agreeing, both sides replace it with now().
+    """
+    counts = values.cast(pl.String).drop_nulls().value_counts(sort=True, name="rows")
+    if counts.is_empty():
+        return LearnedFormats()
+
+    sample = counts.get_column(values.name)
+    rows = counts.get_column("rows")
+    expected = pl.Series([convert_to_timestamp(value) for value in sample.to_list()], dtype=pl.Datetime("us"))
+    cleaned = pl.select(_cleaned(sample)).to_series()
+    outcomes = {}
+    for fmt in candidates or CANDIDATE_FORMATS:
+        parsed = cleaned.str.strptime(pl.Datetime("us"), fmt, strict=False).dt.truncate("1s")
+        agrees = (parsed == expected) | (parsed == EPOCH)
+        outcomes[fmt] = (parsed.is_not_null(), agrees.fill_null(False))
+
+    formats = []
+    remaining = pl.Series([True] * sample.len())
+    while len(formats) < max_formats:
+        best, best_rows = None, 0
+        for fmt, (matched, agrees) in outcomes.items():
+            if fmt in formats or (matched & ~agrees & remaining).any():
+                continue
+            covered = rows.filter(agrees & remaining).sum()
+            if covered > best_rows:
+                best, best_rows = fmt, covered
+        if best is None or best_rows < min_share * rows.sum():
+            break
+        formats.append(best)
+        remaining = remaining & ~outcomes[best][1]
+
+    return LearnedFormats(formats, 1 - rows.filter(remaining).sum() / rows.sum(), int(rows.sum()))
+
+
+class FormatCache:
+    """Learned formats stored in one JSON file, keyed by source and column."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def get(self, key: str) -> Optional[LearnedFormats]:
+        """Return the learned formats for key, or None."""
+        with self._lock:
+            entry = self._read().get(key)
+        if entry is None:
+            return None
+        return LearnedFormats(entry["formats"], entry["coverage"], entry["sampled"])
+
+    def put(self, key: str, learned: LearnedFormats):
+        """Store the learned formats for key (the file is replaced atomically)."""
+        with self._lock:
+            entries = self._read()
+            entries[key] = {
+                "formats": learned.formats,
+                "coverage": learned.coverage,
+                "sampled": learned.sampled,
+                "updated_at": time.time(),
+            }
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(entries, handle, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,136 @@
+"""
+Vectorized Polars expression versions of the helpers in transform_helpers.
+
+Every builder returns a pl.Expr with the same semantics as its scalar
+counterpart applied with map_elements, so it can be used in with_columns
+instead. Like map_elements, the timestamp and date builders keep nulls as
+null. Known differences from the scalar helpers: non-ASCII digits (e.g.
+"١٢") are not numbers or dates here.
+"""
+import polars as pl
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Union
+from .transform_helpers import convert_to_timestamp
+
+IntoExpr = Union[str, pl.Expr]
+
+ORDINAL_SUFFIX_PATTERN = r"(\d+)(st|nd|rd|th|TEST)"
+
+# Formats dateutil parses to the same value, tried in order before falling
+# back to the scalar helper for the remaining rows.
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%d %H:%M:%S%.f",
+    "%Y-%m-%dT%H:%M:%S%.f",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d",
+]
+
+EPOCH = datetime(1970, 1, 1)
+
+# What datetime.strptime(value, "%Y-%m-%d") accepts: a 4 digit year, no
+# surrounding whitespace or sign.
+DATE_PATTERN = r"^\d{4}-\d{1,2}-\d{1,2}$"
+
+
+def _to_expr(column: IntoExpr) -> pl.Expr:
+    """Accept a column name or an expression."""
+    if isinstance(column, str):
+        return pl.col(column)
+    return column
+
+
+def _now_lit(now: Optional[datetime] = None) -> pl.Expr:
+    """
+    Literal used where the scalar helpers return datetime.now().
+    Evaluated when the expression is built, not per row.
+    """
+    return pl.lit(now or datetime.now(), dtype=pl.Datetime("us"))
+
+
+def safe_number_expr(column: IntoExpr) -> pl.Expr:
+    """
+    Cast to Float64, 0.0 for anything that is not a number (including null).
+    Single underscores between digits are dropped, as float() allows them.
+    """
+    expr = _to_expr(column).cast(pl.Utf8).str.strip_chars()
+    # two passes, as the matches of the first one cannot overlap ("1_0_0")
+    for _ in range(2):
+        expr = expr.str.replace_all(r"(\d)_(\d)", "${1}${2}")
+    return expr.cast(pl.Float64, strict=False).fill_null(0.0)
+
+
+def truncate_amount_expr(column: IntoExpr) -> pl.Expr:
+    """
+    Truncate float number to .2f (floor, like math.floor).
+    Division by a literal is done as a multiplication by its reciprocal,
+    which can be 1 ulp off math.floor(value * 100) / 100, so the scaling
+    goes through an exact Decimal. NaN/inf/out of range use plain floats.
+    """
+    floored = (_to_expr(column).cast(pl.Float64) * 100).floor()
+    exact = (
+        floored.cast(pl.Decimal(38, 0), strict=False) * pl.lit(Decimal("0.01"))
+    ).cast(pl.Float64)
+    return pl.coalesce([exact, floored / 100])
+
+
+def handle_paid_amount_expr(column: IntoExpr) -> pl.Expr:
+    return truncate_amount_expr(safe_number_expr(column))
+
+
+def str_to_bool_expr(column: IntoExpr) -> pl.Expr:
+    """
+    Strip everything but letters and spaces, True if "true" remains.
+    """
+    return (
+        _to_expr(column)
+        .str.replace_all(r"[^A-Za-z ]", "")
+        .str.to_lowercase()
+        .str.contains("true", literal=True)
+    )
+
+
+def convert_to_timestamp_expr(
+    column: IntoExpr,
+    now: Optional[datetime] = None,
+    formats: Optional[list] = None
+) -> pl.Expr:
+    """
+    Convert value to timestamp.
+    Known formats are parsed natively, only rows none of them match are
+    handed to the scalar convert_to_timestamp. Nulls stay null, any other
+    value that does not parse becomes now().
+    """
+    expr = _to_expr(column)
+    now_value = _now_lit(now)
+    fixed = (
+        pl.when(expr == "20001-01-01")
+        .then(pl.lit("2001-01-01"))
+        .otherwise(expr)
+    )
+    cleaned = fixed.str.replace_all(ORDINAL_SUFFIX_PATTERN, "${1}")
+    parsed = pl.coalesce([
+        cleaned.str.strptime(pl.Datetime("us"), fmt, strict=False)
+        for fmt in (formats or TIMESTAMP_FORMATS)
+    ]).dt.truncate("1s")
+    fast = pl.when(parsed == EPOCH).then(now_value).otherwise(parsed)
+    residue = (
+        pl.when(parsed.is_null())
+        .then(expr)
+        .map_elements(convert_to_timestamp, return_dtype=pl.Datetime("us"))
+    )
+    return pl.when(expr.is_not_null()).then(pl.coalesce([fast, residue, now_value]))
+
+
+def convert_date_expr(column: IntoExpr, now: Optional[datetime] = None) -> pl.Expr:
+    """
+    Convert value to Date (as a midnight datetime), now() if it does not
+    parse. Nulls stay null.
+    """
+    expr = _to_expr(column)
+    parsed = (
+        pl.when(expr.str.contains(DATE_PATTERN))
+        .then(expr.str.strptime(pl.Datetime("us"), "%Y-%m-%d", strict=False))
+    )
+    return pl.when(expr.is_not_null()).then(pl.coalesce([parsed, _now_lit(now)]))
@@ -0,0 +1,221 @@
+"""Unit tests for etl/checkpoints.py and incremental orchestrator runs."""
+
+import datetime
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.domain.entities import ETLConfig, DataSourceType, StorageType
+from src.etl.checkpoints import Checkpoint, CheckpointStore, IncrementalRun
+from src.etl.orchestrator import ETLOrchestrator
+from tests.test_orchestrator import MemoryLoader
+
+
+class FailingLoader(MemoryLoader):
+    """MemoryLoader failing on one load call."""
+
+    def __init__(self, fail_on):
+        super().__init__()
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def load(self, records, config):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            return False
+        return super().load(records, config)
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Test cases for the SQLite checkpoint store."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = CheckpointStore(os.path.join(self.tmp_dir.name, "state", "checkpoints.db"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test watermarks keep their type through the store."""
+        for watermark in (datetime.datetime(2026, 1, 2, 3, 4, 5, 6), datetime.date(2026, 1, 2), 17, "2026-01-02", None):
+            with self.subTest(watermark=watermark):
+                self.store.save(Checkpoint("job", "abc", 10, 5, watermark, watermark, "completed"))
+                self.assertEqual(self.store.get("job"), Checkpoint("job", "abc", 10, 5, watermark, watermark, "completed"))
+
+    def test_missing_and_deleted(self):
+        """Test unknown and deleted jobs have no checkpoint."""
+        self.assertIsNone(self.store.get("job"))
+        self.store.save(Checkpoint("job", None, None))
+        self.store.delete("job")
+        self.assertIsNone(self.store.get("job"))
+
+
+class TestIncrementalRuns(unittest.TestCase):
+    """Test cases for resuming and incremental orchestrator runs."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.tmp_dir.name, "events.csv")
+        self.store_path = os.path.join(self.tmp_dir.name, "checkpoints.db")
+        self.write_rows(range(6))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_rows(self, ids, mode="w", header=True):
+        with open(self.source_path, mode) as handle:
+            if header:
+                handle.write("id,updated_at\n")
+            for i in ids:
+                handle.write(f"{i},2026-01-{i + 1:02d}\n")
+
+    def config(self, **execution_config):
+        return ETLConfig(
+            source_type=DataSourceType.CSV,
+            source_path=self.source_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": "events"},
+            transformer_config={"columns_to_select": ["id"]},
+            execution_config={"checkpoint_store": self.store_path, "batch_size": 2, **execution_config},
+        )
+
+    def run_job(self, loader, **execution_config):
+        success = ETLOrchestrator(extractor=CsvExtractor(), loader=loader).run(self.config(**execution_config))
+        ids = pl.concat(loader.tables["events"])["id"].to_list() if loader.tables else []
+        return success, ids
+
+    def test_unchanged_and_appended_source(self):
+        """Test a rerun reads nothing new and appended rows are read alone."""
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [0, 1, 2, 3, 4, 5]))
+        self.assertEqual(self.run_job(MemoryLoader()), (True, []))
+
+        self.write_rows([6, 7, 8], mode="a", header=False)
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [6, 7, 8]))
+        self.assertEqual(CheckpointStore(self.store_path).get(f"{self.source_path}:events").rows, 9)
+
+    def test_resume_after_failed_batch(self):
+        """Test an interrupted run resumes after its last committed batch."""
+        success, ids = self.run_job(FailingLoader(fail_on=2))
+        self.assertFalse(success)
+        self.assertEqual(ids, [0, 1])
+        checkpoint = CheckpointStore(self.store_path).get(f"{self.source_path}:events")
+        self.assertEqual((checkpoint.rows, checkpoint.status), (2, "running"))
+
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [2, 3, 4, 5]))
+
+    def test_pipelined_resume_is_at_least_once(self):
+        """Test the pipelined checkpoint never passes a failed batch."""
+        success, ids = self.run_job(FailingLoader(fail_on=2), pipelined=True)
+        self.assertFalse(success)
+        self.assertEqual(ids[:2], [0, 1])
+        self.assertEqual(CheckpointStore(self.store_path).get(f"{self.source_path}:events").rows, 2)
+
+        self.assertEqual(self.run_job(MemoryLoader(), pipelined=True), (True, [2, 3, 4, 5]))
+
+    def test_rewritten_source_uses_watermark(self):
+        """Test a rewritten file only yields rows above the stored watermark."""
+        self.assertTrue(self.run_job(MemoryLoader(), watermark_column="updated_at")[0])
+        self.write_rows([9, 3, 7, 4])
+        self.assertEqual(self.run_job(MemoryLoader(), watermark_column="updated_at"), (True, [9, 7]))
+
+        checkpoint = CheckpointStore(self.store_path).get(f"{self.source_path}:events")
+        self.assertEqual(checkpoint.watermark, "2026-01-10")
+
+    def test_rewritten_source_without_watermark_is_reprocessed(self):
+        """Test a rewritten file without watermark column is read from the start."""
+        self.run_job(MemoryLoader())
+        self.write_rows([10, 11])
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [10, 11]))
+
+    def test_unordered_pipeline_rejected(self):
+        """Test checkpoints refuse batches loaded out of order."""
+        run = ETLOrchestrator(extractor=CsvExtractor(), loader=MemoryLoader())
+        with self.assertRaises(ValueError):
+            run.incremental_run(self.source_path, [self.config()], {"checkpoint_store": self.store_path,
+                                                                    "pipelined": True, "ordered": False})
+
+    def test_plan_skips_committed_rows(self):
+        """Test the plan slices committed rows off the scan."""
+        store = CheckpointStore(self.store_path)
+        run = IncrementalRun(store, "job", self.source_path)
+        run.checkpoint.rows = 4
+        result = run.plan(pl.scan_csv(self.source_path)).collect()
+        self.assertEqual(result["id"].to_list(), [4, 5])
+
+
+class TestMultiFileIncrementalRuns(unittest.TestCase):
+    """Test cases for incremental runs over a directory of files."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.tmp_dir.name, "events")
+        self.store_path = os.path.join(self.tmp_dir.name, "checkpoints.db")
+        os.makedirs(self.source_dir)
+        self.write_file("a.csv", [0, 1, 2])
+        self.write_file("b.csv", [3, 4, 5])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_file(self, name, ids, mode="w", header=True):
+        with open(os.path.join(self.source_dir, name), mode) as handle:
+            if header:
+                handle.write("id,updated_at\n")
+            for i in ids:
+                handle.write(f"{i},2026-01-{i + 1:02d}\n")
+
+    def run_job(self, loader, **execution_config):
+        config = ETLConfig(
+            source_type=DataSourceType.CSV,
+            source_path=self.source_dir,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": "events"},
+            transformer_config={"columns_to_select": ["id"]},
+            execution_config={"checkpoint_store": self.store_path, "batch_size": 2, **execution_config},
+        )
+        success = ETLOrchestrator(extractor=CsvExtractor(), loader=loader).run(config)
+        ids = pl.concat(loader.tables["events"])["id"].to_list() if loader.tables else []
+        return success, ids
+
+    def files(self):
+        return CheckpointStore(self.store_path).get_files(f"{self.source_dir}:events")
+
+    def test_unchanged_new_and_changed_files(self):
+        """Test a rerun reads nothing, new and changed files are read alone."""
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [0, 1, 2, 3, 4, 5]))
+        self.assertEqual(self.run_job(MemoryLoader()), (True, []))
+
+        self.write_file("c.csv", [6, 7])
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [6, 7]))
+
+        self.write_file("a.csv", [8], mode="a", header=False)
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [0, 1, 2, 8]))
+        self.assertEqual({os.path.basename(path): file.rows for path, file in self.files().items()},
+                         {"a.csv": 4, "b.csv": 3, "c.csv": 2})
+
+    def test_resume_inside_a_file(self):
+        """Test an interrupted run resumes in the file it stopped in."""
+        success, ids = self.run_job(FailingLoader(fail_on=3))
+        self.assertFalse(success)
+        self.assertEqual(ids, [0, 1, 2, 3])
+        files = {os.path.basename(path): (file.rows, file.done) for path, file in self.files().items()}
+        self.assertEqual(files, {"a.csv": (3, True), "b.csv": (1, False)})
+
+        self.assertEqual(self.run_job(MemoryLoader()), (True, [4, 5]))
+        self.assertEqual(self.run_job(MemoryLoader()), (True, []))
+
+    def test_user_file_path_column_is_kept(self):
+        """Test a configured include_file_paths column is used and not dropped."""
+        run = IncrementalRun(CheckpointStore(self.store_path), "job", self.source_dir,
+                             files=CsvExtractor().source_files(self.source_dir))
+        source_config = run.source_config({"include_file_paths": "source_file"})
+        self.assertEqual(source_config, {"include_file_paths": "source_file"})
+        records = run.plan(CsvExtractor().extract(self.source_dir, source_config))
+        batch = next(run.track(iter([records.collect()])))
+        self.assertIn("source_file", batch.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
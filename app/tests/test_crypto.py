@@ -0,0 +1,69 @@
+"""Unit tests for utils/crypto.py bulk column encryption."""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import polars as pl
+import pyarrow as pa
+from src.utils import crypto
+from src.utils.crypto import (
+    encrypt_value,
+    decrypt_value,
+    encrypt_series,
+    decrypt_series
+)
+
+
+class TestEncryptSeries(unittest.TestCase):
+    """Test cases for encrypt_series / decrypt_series."""
+
+    def test_tokens_compatible_with_decrypt_value(self):
+        """Test bulk tokens decrypt with the scalar decrypt_value."""
+        tokens = encrypt_series(pl.Series("password", ["secret", "hunter2"]))
+        self.assertEqual(tokens.dtype, pl.Binary)
+        self.assertEqual(tokens.name, "password")
+        self.assertEqual([decrypt_value(t) for t in tokens], ["secret", "hunter2"])
+
+    def test_decrypt_scalar_tokens(self):
+        """Test decrypt_series reads tokens from encrypt_value."""
+        tokens = pl.Series("n", [encrypt_value("123V"), None], dtype=pl.Binary)
+        self.assertEqual(decrypt_series(tokens).to_list(), ["123V", None])
+
+    def test_nulls_and_arrow_input(self):
+        """Test Arrow arrays are accepted and nulls are kept."""
+        tokens = encrypt_series(pa.array(["a", None, "c"]))
+        self.assertIsNone(tokens[1])
+        self.assertEqual(decrypt_series(tokens).to_list(), ["a", None, "c"])
+
+    def test_process_pool_keeps_order(self):
+        """Test chunks encrypted on the pool come back in row order."""
+        values = [f"value-{i}" for i in range(200)]
+        with mock.patch.multiple(crypto, MIN_ROWS_PER_WORKER=10, ENCRYPTION_WORKERS=2):
+            tokens = encrypt_series(pl.Series("v", values), workers=2)
+            executor = crypto._executor
+            self.assertEqual(decrypt_series(tokens[:50], workers=2).to_list(), values[:50])
+            self.assertEqual(decrypt_series(tokens, workers=2).to_list(), values)
+            # batch size changes only the number of chunks, the pool is kept
+            self.assertIs(crypto._executor, executor)
+        crypto.shutdown_executor()
+
+    def test_concurrent_columns_share_the_pool(self):
+        """Test columns encrypted from several threads at once all complete."""
+        values = [f"value-{i}" for i in range(100)]
+        with mock.patch.multiple(crypto, MIN_ROWS_PER_WORKER=10, ENCRYPTION_WORKERS=2):
+            with ThreadPoolExecutor(max_workers=4) as threads:
+                results = list(threads.map(lambda _: encrypt_series(pl.Series("v", values)), range(4)))
+        crypto.shutdown_executor()
+        self.assertIsNone(crypto._executor)
+        for tokens in results:
+            self.assertEqual([decrypt_value(t) for t in tokens], values)
+
+    def test_encrypt_expr(self):
+        """Test the expression form used by DefaultTransformer."""
+        df = pl.DataFrame({"password": ["x", "y"]})
+        result = df.select(crypto.encrypt_expr("password"))
+        self.assertEqual(decrypt_series(result["password"]).to_list(), ["x", "y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+"""Unit tests for adapters/loaders/database_loader.py and the loader factory."""
+
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import polars as pl
+from sqlalchemy import text
+from src.adapters.loaders import database_loader
+from src.adapters.loaders.database_loader import DatabaseLoader
+from src.adapters.loaders.storage_loader_factory import StorageLoaderFactory
+from src.domain.entities import StorageType
+
+
+class SQLiteTestCase(unittest.TestCase):
+    """Base class providing a DatabaseLoader on a temporary SQLite file."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.database_uri = f"sqlite:///{os.path.join(self.tmp_dir.name, 'etl.db')}"
+        self.loader = DatabaseLoader(database_uri=self.database_uri)
+
+    def tearDown(self):
+        self.loader.dispose()
+        self.tmp_dir.cleanup()
+
+    def fetch(self, query):
+        with self.loader.engine.connect() as connection:
+            return connection.execute(text(query)).fetchall()
+
+
+class TestPooledEngine(SQLiteTestCase):
+    """Test cases for the loader-owned pooled engine."""
+
+    def test_engine_reused_across_batches(self):
+        """Test every batch goes through the same engine."""
+        engine = self.loader.engine
+        for i in range(3):
+            batch = pl.DataFrame({"id": [i], "name": [f"n{i}"]})
+            self.assertTrue(self.loader.load(batch, {"table_name": "tests"}))
+        self.assertIs(self.loader.engine, engine)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM tests"), [(3,)])
+
+    def test_table_checked_once_per_engine(self):
+        """Test the table metadata lookup runs on the first batch only."""
+        with mock.patch.object(database_loader, "inspect", wraps=database_loader.inspect) as inspect:
+            for i in range(3):
+                self.assertTrue(self.loader.load(pl.DataFrame({"id": [i]}), {"table_name": "tests"}))
+            self.assertEqual(inspect.call_count, 1)
+            self.loader.dispose()
+            self.assertTrue(self.loader.load(pl.DataFrame({"id": [3]}), {"table_name": "tests"}))
+            self.assertEqual(inspect.call_count, 2)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM tests"), [(4,)])
+
+    def test_engine_recreated_after_fork(self):
+        """Test a child process does not reuse the parent's pool."""
+        engine = self.loader.engine
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(self.loader.engine, engine)
+
+    def test_pickle_drops_engine(self):
+        """Test loaders sent to worker processes rebuild their engine."""
+        self.loader.engine
+        clone = pickle.loads(pickle.dumps(self.loader))
+        self.assertIsNone(clone._engine)
+        self.assertTrue(clone.validate_connection({}))
+        clone.dispose()
+
+    def test_validate_connection(self):
+        """Test the check really opens a connection."""
+        self.assertTrue(self.loader.validate_connection({}))
+        broken = DatabaseLoader(database_uri="sqlite:////nonexistent-dir/etl.db")
+        self.assertFalse(broken.validate_connection({}))
+
+
+class TestStorageLoaderFactory(unittest.TestCase):
+    """Test cases for cached loader instances."""
+
+    def setUp(self):
+        StorageLoaderFactory.register(StorageType.DATABASE, DatabaseLoader)
+
+    def test_same_instance_per_process(self):
+        """Test repeated calls hand out one loader per process."""
+        loader = StorageLoaderFactory.get_loader(StorageType.DATABASE)
+        self.assertIs(StorageLoaderFactory.get_loader(StorageType.DATABASE), loader)
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(StorageLoaderFactory.get_loader(StorageType.DATABASE), loader)
+
+    def test_register_drops_cached_instances(self):
+        """Test re-registering a storage type replaces its loader."""
+        loader = StorageLoaderFactory.get_loader(StorageType.DATABASE)
+        StorageLoaderFactory.register(StorageType.DATABASE, DatabaseLoader)
+        self.assertIsNot(StorageLoaderFactory.get_loader(StorageType.DATABASE), loader)
+
+
+class TestLoadModes(SQLiteTestCase):
+    """Test cases for insert / replace / upsert modes."""
+
+    def setUp(self):
+        super().setUp()
+        with self.loader.engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE users (user_id TEXT PRIMARY KEY, name TEXT, address TEXT)"
+            ))
+        self.first = pl.DataFrame({"user_id": ["u1", "u2"], "name": ["Ann", "Bob"], "address": ["a1", "a2"]})
+        self.second = pl.DataFrame({"user_id": ["u2", "u3"], "name": ["Bobby", "Cid"], "address": ["b2", "b3"]})
+
+    def users(self):
+        return self.fetch("SELECT user_id, name, address FROM users ORDER BY user_id")
+
+    def test_insert_rejects_duplicates(self):
+        """Test plain insert still fails on an existing key."""
+        config = {"table_name": "users", "mode": "insert"}
+        self.assertTrue(self.loader.load(self.first, config))
+        self.assertFalse(self.loader.load(self.second, config))
+        self.assertEqual(len(self.users()), 2)
+
+    def test_upsert(self):
+        """Test rerunning with changed rows updates them and adds new ones."""
+        config = {"table_name": "users", "mode": "upsert", "key_columns": ["user_id"]}
+        self.assertTrue(self.loader.load(self.first, config))
+        self.assertTrue(self.loader.load(self.second, config))
+        self.assertTrue(self.loader.load(self.second, config))
+        self.assertEqual(self.users(), [("u1", "Ann", "a1"), ("u2", "Bobby", "b2"), ("u3", "Cid", "b3")])
+
+    def test_upsert_update_columns(self):
+        """Test only the configured columns are updated."""
+        config = {"table_name": "users", "mode": "upsert", "key_columns": ["user_id"],
+                  "update_columns": ["name"]}
+        self.loader.load(self.first, config)
+        self.loader.load(self.second, config)
+        self.assertEqual(self.users()[1], ("u2", "Bobby", "a2"))
+
+    def test_upsert_needs_keys_outside_mysql(self):
+        """Test upsert without key_columns fails on non-MySQL databases."""
+        self.assertFalse(self.loader.load(self.first, {"table_name": "users", "mode": "upsert"}))
+
+    def test_replace(self):
+        """Test replace swaps whole rows with the same key."""
+        config = {"table_name": "users", "mode": "replace"}
+        self.loader.load(self.first, config)
+        self.loader.load(self.second.drop("address"), config)
+        self.assertEqual(self.users(), [("u1", "Ann", "a1"), ("u2", "Bobby", None), ("u3", "Cid", None)])
+
+    def test_staging_table_dropped(self):
+        """Test no staging table is left behind."""
+        self.loader.load(self.first, {"table_name": "users", "mode": "upsert", "key_columns": ["user_id"]})
+        tables = self.fetch("SELECT name FROM sqlite_temp_master UNION SELECT name FROM sqlite_master")
+        self.assertEqual([t for (t,) in tables if "staging" in t], [])
+
+    def test_create_table(self):
+        """Test create_table creates a missing table before merging."""
+        config = {"table_name": "new_users", "mode": "insert", "load_method": "executemany"}
+        self.assertTrue(self.loader.load(self.first, config))
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM new_users"), [(2,)])
+
+    def test_unknown_mode(self):
+        """Test unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            self.loader.load(self.first, {"table_name": "users", "mode": "merge"})
+
+
+class TestParallelPartitions(SQLiteTestCase):
+    """Test cases for partitioned writes over several connections."""
+
+    def setUp(self):
+        super().setUp()
+        with self.loader.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE tests (id INTEGER PRIMARY KEY, name TEXT)"))
+        self.records = pl.DataFrame({"id": list(range(100)), "name": [f"n{i}" for i in range(100)]})
+
+    def test_row_range_partitions(self):
+        """Test every row is written once when split by row ranges."""
+        config = {"table_name": "tests", "load_method": "executemany", "parallel_partitions": 4}
+        self.assertTrue(self.loader.load(self.records, config))
+        self.assertEqual(self.fetch("SELECT COUNT(DISTINCT id) FROM tests"), [(100,)])
+
+    def test_hash_partitions(self):
+        """Test hash partitioning keeps all rows of a key together."""
+        parts = DatabaseLoader._partition(
+            pl.concat([self.records, self.records]),
+            {"parallel_partitions": 3, "partition_by": "id"}
+        )
+        self.assertEqual(len(parts), 3)
+        self.assertEqual(sum(part.height for part in parts), 200)
+        for part in parts:
+            self.assertNotIn("__partition", part.columns)
+            self.assertEqual(part.height, 2 * part["id"].n_unique())
+
+    def test_partitions_commit_independently(self):
+        """Test a failing partition does not roll back the others."""
+        with self.loader.engine.begin() as connection:
+            connection.execute(text("INSERT INTO tests VALUES (99, 'existing')"))
+        config = {"table_name": "tests", "load_method": "executemany", "parallel_partitions": 4}
+        with self.assertLogs("Adapters.Loader.DatabaseLoader", level="ERROR") as logs:
+            self.assertFalse(self.loader.load(self.records, config))
+        self.assertIn("Loaded 75 of 100 rows", logs.output[-1])
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM tests"), [(76,)])
+
+    def test_writers_bounded_by_pool_capacity(self):
+        """Test more partitions than pooled connections still load, without checkout timeouts."""
+        self.loader.dispose()
+        self.loader.pool_size, self.loader.max_overflow = 1, 1
+        threads = set()
+        original = self.loader._load_partition
+
+        def record_thread(*args):
+            threads.add(threading.get_ident())
+            time.sleep(0.05)
+            return original(*args)
+
+        config = {"table_name": "tests", "load_method": "executemany", "parallel_partitions": 6}
+        with mock.patch.object(self.loader, "_load_partition", record_thread):
+            self.assertTrue(self.loader.load(self.records, config))
+        self.assertLessEqual(len(threads), 2)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM tests"), [(100,)])
+
+    def test_uses_separate_threads(self):
+        """Test partitions are written from concurrent workers."""
+        threads = set()
+        original = self.loader._load_partition
+
+        def record_thread(*args):
+            threads.add(threading.get_ident())
+            time.sleep(0.05)
+            return original(*args)
+
+        with mock.patch.object(self.loader, "_load_partition", side_effect=record_thread):
+            self.loader.load(self.records, {"table_name": "tests", "load_method": "executemany",
+                                            "parallel_partitions": 2})
+        self.assertEqual(len(threads), 2)
+
+
+    def test_merges_split_only_by_key(self):
+        """Test upserts without partition_by on a key column are written serially."""
+        calls = []
+        original = self.loader._load_partition
+
+        def record_partition(records, *args):
+            calls.append(records.height)
+            return original(records, *args)
+
+        config = {"table_name": "tests", "mode": "upsert", "key_columns": ["id"], "parallel_partitions": 4}
+        with mock.patch.object(self.loader, "_load_partition", side_effect=record_partition):
+            with self.assertLogs("Adapters.Loader.DatabaseLoader", level="WARNING"):
+                self.assertTrue(self.loader.load(self.records, config))
+            self.assertEqual(calls, [100])
+            calls.clear()
+            self.assertTrue(self.loader.load(self.records, {**config, "partition_by": "id"}))
+            self.assertEqual(len(calls), 4)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM tests"), [(100,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
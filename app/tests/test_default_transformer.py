@@ -0,0 +1,134 @@
+"""Unit tests for adapters/transformers/default_transformer.py."""
+
+import unittest
+import polars as pl
+from src.adapters.transformers.default_transformer import DefaultTransformer, LruMemo
+from src.utils.transform_helpers import handle_paid_amount, str_to_bool
+
+
+def shout(value):
+    return value.upper() + "!"
+
+
+class TestValueTransformLowering(unittest.TestCase):
+    """Test cases for substituting value_transforms with expressions."""
+
+    def setUp(self):
+        self.transformer = DefaultTransformer()
+        self.df = pl.DataFrame({
+            "paid_amount": ["12.345", "abc", None],
+            "is_claimed": ["true!", "f@lse", "TRUE"],
+            "color": ["red", None, "blue"],
+        })
+
+    def test_known_callables_are_lowered(self):
+        """Test registered helpers run as expressions with the same results."""
+        config = {"value_transforms": {"paid_amount": handle_paid_amount,
+                                       "is_claimed": str_to_bool}}
+        with self.assertNoLogs("Adapters.Transformer.DefaultTransformer", level="INFO"):
+            result = self.transformer.transform(self.df, config)
+        self.assertEqual(result["paid_amount"].to_list(), [12.34, 0.0, 0.0])
+        self.assertEqual(result["is_claimed"].to_list(), [True, False, True])
+
+    def test_unknown_callable_uses_batches(self):
+        """Test unknown callables still apply per value and keep nulls."""
+        config = {"value_transforms": {"color": shout}}
+        with self.assertLogs("Adapters.Transformer.DefaultTransformer", level="INFO") as logs:
+            result = self.transformer.transform(self.df, config)
+        self.assertEqual(result["color"].to_list(), ["RED!", None, "BLUE!"])
+        self.assertIn("'color'", logs.output[0])
+
+    def test_slow_path_reported_once(self):
+        """Test the slow path is logged once per column, not per batch."""
+        config = {"value_transforms": {"color": shout}}
+        with self.assertLogs("Adapters.Transformer.DefaultTransformer", level="INFO") as logs:
+            self.transformer.transform(self.df, config)
+            self.transformer.transform(self.df, config)
+        self.assertEqual(len(logs.output), 1)
+
+    def test_register_expression(self):
+        """Test custom callables can be registered with an expression."""
+        DefaultTransformer.register_expression(shout, lambda field: pl.col(field).str.to_uppercase() + "!")
+        try:
+            result = self.transformer.transform(self.df, {"value_transforms": {"color": shout}})
+        finally:
+            DefaultTransformer._expression_registry.pop(shout)
+        self.assertEqual(result["color"].to_list(), ["RED!", None, "BLUE!"])
+
+
+class CountingShout:
+    """shout() recording the values it is called with."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, value):
+        self.calls.append(value)
+        return shout(value)
+
+
+class TestDistinctValueTransforms(unittest.TestCase):
+    """Test cases for evaluating Python transforms once per distinct value."""
+
+    def setUp(self):
+        self.transformer = DefaultTransformer()
+        self.colors = pl.DataFrame({"color": ["red", "blue", None, "red", "blue", "red"]})
+
+    def run_transform(self, func, df, **config):
+        return self.transformer.transform(df, {"value_transforms": {"color": func}, **config})["color"].to_list()
+
+    def test_low_cardinality_is_memoized_across_batches(self):
+        """Test repeated values are computed once and reused by later batches."""
+        func = CountingShout()
+        self.assertEqual(self.run_transform(func, self.colors, value_transform_strategy="auto"),
+                         ["RED!", "BLUE!", None, "RED!", "BLUE!", "RED!"])
+        self.assertEqual(self.run_transform(func, self.colors.reverse(), value_transform_strategy="auto"),
+                         ["RED!", "BLUE!", "RED!", None, "BLUE!", "RED!"])
+        self.assertEqual(sorted(value for value in func.calls if value), ["blue", "red"])
+
+    def test_high_cardinality_runs_directly(self):
+        """Test mostly unique batches skip the memo unless distinct is forced."""
+        unique = pl.DataFrame({"color": ["red", "blue", "green", "pink"]})
+        func = CountingShout()
+        self.run_transform(func, unique, value_transform_strategy="auto")
+        colors = [("String", color) for color in unique["color"].to_list()]
+        self.assertEqual(self.transformer._memos[("color", func)].lookup(colors)[1], colors)
+
+        func = CountingShout()
+        self.assertEqual(self.run_transform(func, unique, value_transform_strategy="distinct"),
+                         ["RED!", "BLUE!", "GREEN!", "PINK!"])
+        self.assertEqual(self.transformer._memos[("color", func)].lookup(colors)[1], [])
+
+    def test_memo_tells_dtypes_apart(self):
+        """Test equal Python keys of different dtypes (1, 1.0, True) get their own results."""
+        def mark(value):
+            return f"{value}!"
+
+        for values in ([1, 1, 0, 0], [True, True, False, False], [1.0, 1.0, 0.0, 0.0]):
+            df = pl.DataFrame({"x": values})
+            config = {"value_transforms": {"x": mark}, "value_transform_strategy": "distinct"}
+            result = self.transformer.transform(df, config)["x"].to_list()
+            self.assertEqual(result, [f"{value}!" for value in values])
+
+    def test_direct_strategy(self):
+        """Test direct evaluation, the default, calls the function for every row."""
+        func = CountingShout()
+        self.run_transform(func, self.colors, value_transform_strategy="direct")
+        self.assertEqual(len([value for value in func.calls if value]), 5)
+        self.run_transform(func, self.colors)
+        self.assertEqual(len([value for value in func.calls if value]), 10)
+        self.assertNotIn(("color", func), self.transformer._memos)
+        with self.assertRaises(ValueError):
+            self.run_transform(func, self.colors, value_transform_strategy="sometimes")
+
+    def test_memo_is_bounded(self):
+        """Test the least recently used results are evicted."""
+        memo = LruMemo(max_size=2)
+        memo.store({"a": 1, "b": 2})
+        memo.lookup(["a"])
+        memo.store({"c": 3})
+        self.assertEqual(memo.lookup(["a", "b", "c"]), ({"a": 1, "c": 3}, ["b"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
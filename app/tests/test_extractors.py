@@ -0,0 +1,216 @@
+"""Unit tests for the Parquet/IPC extractors and source options."""
+
+import gzip
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.ipc_extractor import IpcExtractor
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.adapters.extractors.parquet_extractor import ParquetExtractor
+from src.adapters.extractors.source_options import apply_source_options, filter_expr
+from src.adapters.extractors.sources import resolve_sources, with_compression
+from src.adapters.loaders.file_loader import FileLoader
+from src.domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from tests.test_orchestrator import MemoryLoader
+
+USERS = pl.DataFrame({
+    "user_id": ["u1", "u2", "u3", "u4"],
+    "country": ["LK", "LK", "NZ", None],
+    "age": [31, 17, 45, 22],
+    "notes": ["a", "b", "c", "d"],
+})
+
+
+class TestSourceOptions(unittest.TestCase):
+    """Test cases for column projection and row filters."""
+
+    def test_filter_tuples(self):
+        """Test every supported filter operator."""
+        cases = [
+            ([("age", ">=", 22)], ["u1", "u3", "u4"]),
+            ([("age", "<", 22)], ["u2"]),
+            ([("country", "==", "LK"), ("age", ">", 20)], ["u1"]),
+            ([("country", "!=", "LK")], ["u3"]),
+            ([("country", "in", ["NZ", "AU"])], ["u3"]),
+            ([("country", "not in", ["LK"])], ["u3"]),
+            ([("country", "is_null")], ["u4"]),
+            ([("country", "is_not_null"), ("age", "<=", 17)], ["u2"]),
+        ]
+        for filters, expected in cases:
+            with self.subTest(filters=filters):
+                result = USERS.filter(filter_expr(filters))
+                self.assertEqual(result["user_id"].to_list(), expected)
+
+    def test_filter_expression_passthrough(self):
+        """Test a Polars expression is used as is."""
+        expr = pl.col("age") > 40
+        self.assertIs(filter_expr(expr), expr)
+
+    def test_invalid_filters(self):
+        """Test unknown operators and missing values are rejected."""
+        for filters in ([], [("age", "~", 1)], [("age", ">")]):
+            with self.subTest(filters=filters):
+                with self.assertRaises(ValueError):
+                    filter_expr(filters)
+
+    def test_apply_source_options(self):
+        """Test columns and filters are applied, filters before projection."""
+        result = apply_source_options(
+            USERS.lazy(), {"columns": ["user_id"], "filters": [("age", ">", 30)]}
+        ).collect()
+        self.assertEqual(result.columns, ["user_id"])
+        self.assertEqual(result["user_id"].to_list(), ["u1", "u3"])
+        self.assertTrue(apply_source_options(USERS.lazy(), None).collect().equals(USERS))
+
+
+class TestColumnarExtractors(unittest.TestCase):
+    """Test cases for ParquetExtractor and IpcExtractor."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.parquet_path = os.path.join(self.tmp_dir.name, "users.parquet")
+        self.ipc_path = os.path.join(self.tmp_dir.name, "users.arrow")
+        USERS.write_parquet(self.parquet_path, row_group_size=2)
+        USERS.write_ipc(self.ipc_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_extract_files(self):
+        """Test single Parquet and IPC files are scanned lazily."""
+        for extractor, path in ((ParquetExtractor(), self.parquet_path), (IpcExtractor(), self.ipc_path)):
+            with self.subTest(extractor=type(extractor).__name__):
+                records = extractor.extract(path)
+                self.assertIsInstance(records, pl.LazyFrame)
+                self.assertTrue(records.collect().equals(USERS))
+
+    def test_options_pushed_into_scan(self):
+        """Test projection and filter end up in the scan node of the plan."""
+        options = {"columns": ["user_id"], "filters": [("age", ">", 30)]}
+        for extractor, path in ((ParquetExtractor(), self.parquet_path), (IpcExtractor(), self.ipc_path)):
+            with self.subTest(extractor=type(extractor).__name__):
+                plan = apply_source_options(extractor.extract(path), options).explain()
+                scan = plan[plan.index("SCAN"):]
+                self.assertIn("PROJECT 2/4 COLUMNS", scan)
+                self.assertIn('SELECTION: col("age") > 30', scan)
+
+    def test_extract_partitioned_dataset(self):
+        """Test a FileLoader dataset directory is read back with its partition column."""
+        for file_format, extractor in (("parquet", ParquetExtractor()), ("ipc", IpcExtractor())):
+            with self.subTest(file_format=file_format):
+                path = os.path.join(self.tmp_dir.name, f"dataset_{file_format}")
+                config = {"path": path, "format": file_format, "partition_by": ["country"]}
+                FileLoader().load(USERS.lazy(), config)
+                FileLoader().load(USERS.lazy(), config)
+
+                self.assertTrue(extractor.validate_source(path))
+                result = extractor.extract(path).filter(pl.col("country") == "LK").collect()
+                self.assertEqual(sorted(result["user_id"].to_list()), ["u1", "u1", "u2", "u2"])
+
+    def test_validate_source(self):
+        """Test missing files, wrong extensions and empty globs are rejected."""
+        self.assertTrue(ParquetExtractor().validate_source(self.parquet_path))
+        self.assertTrue(ParquetExtractor().validate_source(os.path.join(self.tmp_dir.name, "*.parquet")))
+        self.assertFalse(ParquetExtractor().validate_source(self.ipc_path))
+        self.assertFalse(ParquetExtractor().validate_source(os.path.join(self.tmp_dir.name, "missing.parquet")))
+        self.assertFalse(IpcExtractor().validate_source(os.path.join(self.tmp_dir.name, "*.feather")))
+        with self.assertRaises(ValueError):
+            IpcExtractor().extract(self.parquet_path)
+
+    def test_orchestrator_uses_source_config(self):
+        """Test the job's source_config restricts what the orchestrator loads."""
+        loader = MemoryLoader()
+        config = ETLConfig(
+            source_type=DataSourceType.PARQUET,
+            source_path=self.parquet_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": "adults"},
+            transformer_config={"columns_to_select": ["user_id", "age"]},
+            source_config={"columns": ["user_id", "age"], "filters": [("age", ">=", 18)]},
+        )
+        self.assertTrue(ETLOrchestrator(extractor=ParquetExtractor(), loader=loader).run(config))
+        result = pl.concat(loader.tables["adults"])
+        self.assertEqual(result.columns, ["user_id", "age"])
+        self.assertEqual(result["user_id"].to_list(), ["u1", "u3", "u4"])
+
+
+class TestMultiFileSources(unittest.TestCase):
+    """Test cases for globs, directories, file lists and compressed files."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.hourly = os.path.join(self.tmp_dir.name, "hourly")
+        os.makedirs(os.path.join(self.hourly, "2026-10-18"))
+        USERS.slice(0, 2).write_csv(os.path.join(self.hourly, "00.csv"))
+        with gzip.open(os.path.join(self.hourly, "01.csv.gz"), "wt") as handle:
+            handle.write(USERS.slice(2, 1).write_csv())
+        USERS.slice(3, 1).lazy().sink_csv(os.path.join(self.hourly, "2026-10-18", "02.csv.zst"),
+                                          compression="zstd", check_extension=False)
+        with open(os.path.join(self.hourly, "README.txt"), "w") as handle:
+            handle.write("not data")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, *parts):
+        return os.path.join(self.hourly, *parts)
+
+    def test_resolve_sources(self):
+        """Test directories, globs, lists and missing paths."""
+        extensions = with_compression([".csv"])
+        everything = [self.path("00.csv"), self.path("01.csv.gz"), self.path("2026-10-18", "02.csv.zst")]
+        self.assertEqual(resolve_sources(self.hourly, extensions), everything)
+        self.assertEqual(resolve_sources(self.path("*.csv*"), extensions), everything[:2])
+        self.assertEqual(resolve_sources(self.path("**", "*.zst"), extensions), everything[2:])
+        self.assertEqual(resolve_sources([self.path("01.csv.gz"), self.hourly], extensions),
+                         [everything[1], everything[0], everything[2]])
+        self.assertEqual(resolve_sources(self.path("README.txt"), extensions), [])
+        self.assertEqual(resolve_sources(self.path("missing.csv"), extensions), [])
+
+    def test_csv_directory_with_file_metadata(self):
+        """Test compressed and plain CSV files are scanned into one plan."""
+        records = CsvExtractor().extract(self.hourly, {"include_file_paths": "source_file"}).collect()
+        self.assertEqual(records["user_id"].to_list(), ["u1", "u2", "u3", "u4"])
+        self.assertEqual(
+            [os.path.basename(p) for p in records["source_file"].to_list()],
+            ["00.csv", "00.csv", "01.csv.gz", "02.csv.zst"]
+        )
+
+    def test_json_file_list(self):
+        """Test NDJSON files, one gzip compressed, given as a list."""
+        plain = os.path.join(self.tmp_dir.name, "a.ndjson")
+        compressed = os.path.join(self.tmp_dir.name, "b.json.gz")
+        USERS.slice(0, 3).write_ndjson(plain)
+        with gzip.open(compressed, "wt") as handle:
+            handle.write(USERS.slice(3, 1).write_ndjson())
+
+        extractor = JsonExtractor()
+        self.assertTrue(extractor.validate_source([plain, compressed]))
+        self.assertFalse(extractor.validate_source([self.path("00.csv")]))
+        self.assertTrue(extractor.extract([plain, compressed]).collect().equals(USERS))
+
+    def test_orchestrator_reads_many_files_once(self):
+        """Test one run loads every file of a glob, for single and multi-target configs."""
+        def target(table_name):
+            return ETLConfig(
+                source_type=DataSourceType.CSV,
+                source_path=[self.path("*.csv*"), self.path("2026-10-18")],
+                storage_type=StorageType.DATABASE,
+                storage_config={"table_name": table_name},
+                transformer_config={"columns_to_select": ["user_id", "source_file"]},
+                source_config={"include_file_paths": "source_file"},
+            )
+        loader = MemoryLoader()
+        self.assertTrue(ETLOrchestrator(extractor=CsvExtractor(), loader=loader).run(target("single")))
+        multi = MultiTargetETLConfig(targets=[target("first"), target("second")],
+                                     source_config={"include_file_paths": "source_file"})
+        self.assertTrue(ETLOrchestrator(extractor=CsvExtractor(), loader=loader).run(multi))
+        for table in ("single", "first", "second"):
+            self.assertEqual(pl.concat(loader.tables[table])["source_file"].n_unique(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Unit tests for adapters/loaders/file_loader.py."""
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import polars as pl
+from src.adapters.loaders.file_loader import FileLoader, MANIFEST_NAME, read_manifest
+
+
+def load_batches(path, batches):
+    """Load small batches into path with a loader of this process."""
+    loader = FileLoader()
+    return all(loader.load(pl.DataFrame({"batch": [i]}), {"path": path}) for i in range(batches))
+
+
+class TestFileLoader(unittest.TestCase):
+    """Test cases for the columnar file loader."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "users")
+        self.loader = FileLoader()
+        self.df = pl.DataFrame({
+            "user_id": [1, 2, 3, 4],
+            "year": [2025, 2026, 2026, None],
+            "name": ["a", "b", "c", "d"],
+        })
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_batches_append_to_one_dataset(self):
+        """Test every batch adds part files listed in the manifest."""
+        config = {"path": self.path}
+        self.assertTrue(self.loader.load(self.df.lazy(), config))
+        self.assertTrue(self.loader.load(self.df, config))
+
+        manifest = read_manifest(self.path)
+        self.assertEqual(manifest["format"], "parquet")
+        self.assertEqual(len(manifest["files"]), 2)
+        self.assertEqual(sum(f["rows"] for f in manifest["files"]), 8)
+        self.assertEqual(list(manifest["schema"]), ["user_id", "year", "name"])
+        self.assertEqual(pl.read_parquet(os.path.join(self.path, "*.parquet")).height, 8)
+
+    def test_concurrent_processes_share_the_manifest(self):
+        """Test loaders in several processes writing one dataset keep every manifest entry."""
+        with ProcessPoolExecutor(max_workers=4, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(load_batches, [self.path] * 4, [10] * 4))
+        self.assertTrue(all(results))
+        manifest = read_manifest(self.path)
+        self.assertEqual(len(manifest["files"]), 40)
+        self.assertEqual(sum(f["rows"] for f in manifest["files"]), 40)
+
+    def test_hive_partitioning(self):
+        """Test partition_by writes key=value directories readable as one dataset."""
+        config = {"path": self.path, "partition_by": ["year"], "row_group_size": 2}
+        self.assertTrue(self.loader.load(self.df.lazy(), config))
+        self.assertTrue(self.loader.load(self.df.lazy(), config))
+
+        self.assertEqual(
+            sorted(d for d in os.listdir(self.path) if d != MANIFEST_NAME),
+            ["year=2025", "year=2026", "year=__HIVE_DEFAULT_PARTITION__"]
+        )
+        self.assertEqual(len(os.listdir(os.path.join(self.path, "year=2026"))), 2)
+        result = pl.read_parquet(os.path.join(self.path, "year=*", "*.parquet"), hive_partitioning=True)
+        self.assertEqual(
+            result.group_by("year").len().sort("year").rows(),
+            [(None, 2), (2025, 2), (2026, 4)]
+        )
+
+    def test_ipc_and_csv_formats(self):
+        """Test Arrow IPC and compressed CSV datasets."""
+        ipc_path = os.path.join(self.tmp_dir.name, "ipc")
+        self.assertTrue(self.loader.load(self.df.lazy(), {"path": ipc_path, "format": "ipc", "compression": "lz4"}))
+        self.assertTrue(pl.read_ipc(os.path.join(ipc_path, read_manifest(ipc_path)["files"][0]["path"])).equals(self.df))
+
+        csv_path = os.path.join(self.tmp_dir.name, "csv")
+        self.assertTrue(self.loader.load(self.df, {"path": csv_path, "format": "csv", "compression": "gzip"}))
+        files = read_manifest(csv_path)["files"]
+        self.assertTrue(files[0]["path"].endswith(".csv.gz"))
+        self.assertEqual(pl.read_csv(os.path.join(csv_path, files[0]["path"])).height, 4)
+
+    def test_invalid_config(self):
+        """Test missing path, unknown format and a format mismatch."""
+        with self.assertRaises(ValueError):
+            self.loader.load(self.df, {})
+        with self.assertRaises(ValueError):
+            self.loader.load(self.df, {"path": self.path, "format": "xlsx"})
+
+        self.assertTrue(self.loader.load(self.df, {"path": self.path}))
+        self.assertFalse(self.loader.load(self.df, {"path": self.path, "format": "ipc"}))
+
+    def test_validate_connection(self):
+        """Test the dataset directory is created on validation."""
+        self.assertTrue(self.loader.validate_connection({"path": self.path}))
+        self.assertTrue(os.path.isdir(self.path))
+        self.assertFalse(self.loader.validate_connection({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Unit tests for adapters/extractors/json_array_reader.py."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import polars as pl
+from src.adapters.extractors import json_array_reader
+from src.adapters.extractors.json_array_reader import infer_schema, iter_json_objects, iter_record_batches
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.domain.entities import ETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from tests.test_orchestrator import MemoryLoader
+
+ROWS = [
+    {"user_id": f"u{i}", "name": "Ünïcødé 名前" * (i % 3), "age": 20 + i, "tags": ["a", "b"][:i % 3]}
+    for i in range(20)
+]
+
+
+class TestJsonArrayReader(unittest.TestCase):
+    """Test cases for the incremental JSON parser."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        return path
+
+    def test_values_split_across_chunks(self):
+        """Test arrays and concatenated objects parse the same for any chunk size."""
+        sources = {
+            "array": self.write("array.json", "﻿" + json.dumps(ROWS, ensure_ascii=False, indent=2)),
+            "escaped": self.write("escaped.json", json.dumps(ROWS + [{"quote": 'say "hi"\\'}])),
+            "concatenated": self.write("objects.json", "".join(json.dumps(row, ensure_ascii=False) for row in ROWS)),
+            "ndjson": self.write("rows.ndjson", "\n".join(json.dumps(row) for row in ROWS) + "\n"),
+        }
+        for name, path in sources.items():
+            for chunk_bytes in (1, 7, 64, 1 << 20):
+                with self.subTest(source=name, chunk_bytes=chunk_bytes):
+                    expected = ROWS + [{"quote": 'say "hi"\\'}] if name == "escaped" else ROWS
+                    self.assertEqual(list(iter_json_objects(path, chunk_bytes)), expected)
+
+    def test_numbers_at_chunk_boundary(self):
+        """Test a number cut by the chunk boundary is not split in two."""
+        path = self.write("numbers.json", "[12345, 678]")
+        for chunk_bytes in range(1, 13):
+            with self.subTest(chunk_bytes=chunk_bytes):
+                self.assertEqual(list(iter_json_objects(path, chunk_bytes)), [12345, 678])
+
+    def test_empty_sources(self):
+        """Test empty files and arrays yield nothing."""
+        self.assertEqual(list(iter_json_objects(self.write("empty.json", ""))), [])
+        self.assertEqual(list(iter_json_objects(self.write("array.json", " [ ]\n"))), [])
+
+    def test_invalid_documents(self):
+        """Test malformed documents raise ValueError."""
+        for text in ('[{"a": 1},]', '[{"a": 1} {"a": 2}]', '[{"a": 1}', '[{"a": 1}] {}', '{"a": '):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    list(iter_json_objects(self.write("bad.json", text), chunk_bytes=4))
+
+    def test_invalid_element_fails_without_reading_on(self):
+        """Test a malformed element raises without pulling the rest of the file into memory."""
+        path = self.write("bad.json", '[{"a": tru}, ' + ", ".join(json.dumps(row) for row in ROWS * 50) + "]")
+        decoder = json_array_reader.codecs.getincrementaldecoder("utf-8-sig")()
+        with mock.patch.object(json_array_reader.codecs, "getincrementaldecoder", return_value=lambda: decoder), \
+                mock.patch.object(decoder, "decode", wraps=decoder.decode) as decode:
+            with self.assertRaises(ValueError):
+                list(iter_json_objects(path, chunk_bytes=16))
+        self.assertLessEqual(decode.call_count, 2)
+
+    def test_batches_are_bounded(self):
+        """Test record batches hold at most batch_size rows with the inferred schema."""
+        path = self.write("array.json", json.dumps(ROWS))
+        schema = infer_schema([path], infer_schema_length=5)
+        batches = list(iter_record_batches([path], schema, batch_size=8))
+        self.assertEqual([batch.num_rows for batch in batches], [8, 8, 4])
+        self.assertEqual(pl.from_arrow(batches[0]).schema, schema)
+
+    def test_scalars_rejected_as_rows(self):
+        """Test top-level values that are not objects cannot become rows."""
+        path = self.write("scalars.json", "[1, 2]")
+        with self.assertRaises(ValueError):
+            infer_schema([path])
+
+
+class TestJsonArrayExtraction(unittest.TestCase):
+    """Test cases for JsonExtractor on JSON arrays."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "users.json")
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(ROWS, handle, indent=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_array_detected_and_pushed_down(self):
+        """Test arrays are detected and projections and filters reach the reader."""
+        plan = JsonExtractor().extract(self.path, {"json_batch_size": 6, "include_file_paths": "source_file"})
+        query = plan.filter(pl.col("age") > 35).select("user_id", "source_file")
+        self.assertIn('SELECTION: col("age") > 35', query.explain())
+        result = query.collect()
+        self.assertEqual(result["user_id"].to_list(), ["u16", "u17", "u18", "u19"])
+        self.assertEqual(result["source_file"].unique().to_list(), [self.path])
+        self.assertEqual(plan.head(3).collect().height, 3)
+
+    def test_json_format_option(self):
+        """Test json_format forces a reader and rejects unknown formats."""
+        concatenated = os.path.join(self.tmp_dir.name, "objects.json")
+        with open(concatenated, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(json.dumps(row, indent=2) for row in ROWS[:3]))
+        records = JsonExtractor().extract(concatenated, {"json_format": "array"}).collect()
+        self.assertEqual(records["user_id"].to_list(), ["u0", "u1", "u2"])
+        with self.assertRaises(ValueError):
+            JsonExtractor().extract(self.path, {"json_format": "xml"})
+
+    def test_schema_overrides(self):
+        """Test overrides and the schema registry apply to arrays."""
+        config = {"schema_overrides": {"age": "Float64"},
+                  "schema_registry": os.path.join(self.tmp_dir.name, "schemas.json")}
+        for _ in range(2):
+            self.assertEqual(JsonExtractor().extract(self.path, config).collect_schema()["age"], pl.Float64)
+
+    def test_orchestrator_batches(self):
+        """Test a batched run loads every row of an array."""
+        config = ETLConfig(
+            source_type=DataSourceType.JSON,
+            source_path=self.path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": "users"},
+            transformer_config={"columns_to_select": ["user_id", "age"]},
+            source_config={"json_batch_size": 4},
+            execution_config={"batch_size": 5},
+        )
+        loader = MemoryLoader()
+        self.assertTrue(ETLOrchestrator(extractor=JsonExtractor(), loader=loader).run(config))
+        self.assertEqual(pl.concat(loader.tables["users"])["age"].to_list(), list(range(20, 40)))
+
+
+if __name__ == '__main__':
+    unittest.main()
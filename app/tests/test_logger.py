@@ -0,0 +1,142 @@
+"""Unit tests for utils/logger.py."""
+
+import io
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from src.etl.pipeline import Pipeline, Stage
+from src.etl.scheduler import ETLScheduler
+from tests.test_scheduler import make_job
+from src.utils.logger import ETLLogger, RateLimitFilter, get_logger, log_context
+
+
+def log_value(value):
+    get_logger("tests.worker").info(f"worker got {value}")
+    return value
+
+
+def log_warning(message):
+    get_logger("tests.worker").warning(message)
+    return True
+
+
+def log_job(config):
+    return log_warning(f"job {config.storage_config['table_name']}")
+
+
+class SlowStream(io.StringIO):
+    def write(self, text):
+        time.sleep(0.05)
+        return super().write(text)
+
+
+class TestETLLogger(unittest.TestCase):
+    """Test cases for queued, JSON and rate limited logging."""
+
+    def configure(self, stream, **options):
+        with mock.patch("sys.stdout", stream):
+            ETLLogger.configure("INFO", **options)
+
+    def tearDown(self):
+        ETLLogger.configure("INFO")
+
+    def records(self, stream):
+        ETLLogger.shutdown()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_logging_does_not_wait_for_the_stream(self):
+        """Test records are written by the listener, not the logging thread."""
+        stream = SlowStream()
+        self.configure(stream)
+        start = time.perf_counter()
+        for i in range(10):
+            get_logger("tests").warning(f"message {i}")
+        self.assertLess(time.perf_counter() - start, 0.25)
+        ETLLogger.shutdown()
+        self.assertEqual(len(stream.getvalue().splitlines()), 10)
+
+    def test_json_format_with_context(self):
+        """Test JSON records carry the job, run and batch of the log context."""
+        stream = io.StringIO()
+        self.configure(stream, json_format=True)
+        with log_context(job="users", run="r1"):
+            get_logger("tests").info("started")
+            with log_context(batch=3):
+                try:
+                    raise ValueError("bad row")
+                except ValueError:
+                    get_logger("tests").exception("failed")
+        first, second = self.records(stream)
+        self.assertEqual((first["job"], first["run"], first["message"]), ("users", "r1", "started"))
+        self.assertNotIn("batch", first)
+        self.assertEqual((second["level"], second["batch"]), ("ERROR", 3))
+        self.assertIn("ValueError: bad row", second["exception"])
+
+    def test_process_workers_log_through_the_parent(self):
+        """Test records of process pool workers reach the parent's stream."""
+        stream = io.StringIO()
+        self.configure(stream, json_format=True)
+        with log_context(job="jobs"):
+            pipeline = Pipeline([Stage("log", log_value, workers=2, executor="process")])
+            self.assertEqual(list(pipeline.run(["a", "b"])), ["a", "b"])
+        records = sorted(self.records(stream), key=lambda record: record["batch"])
+        self.assertEqual([(r["message"], r["job"], r["batch"]) for r in records],
+                         [("worker got a", "jobs", 0), ("worker got b", "jobs", 1)])
+
+    def forked_output(self, work):
+        """Console output of the parent and forked workers while running work."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "stdout.log")
+            with open(path, "w") as stream:
+                self.configure(stream)
+                work()
+                ETLLogger.shutdown()
+            with open(path) as stream:
+                return stream.read()
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_forked_pool_workers_log(self):
+        """Test workers of a pool without a logging initializer still write their records."""
+        def work():
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork")) as pool:
+                self.assertTrue(pool.submit(log_warning, "from a forked worker").result())
+        self.assertIn("WARNING - from a forked worker", self.forked_output(work))
+
+    def test_scheduler_workers_log_through_the_parent(self):
+        """Test jobs on the scheduler's process pool reach the parent's console."""
+        def work():
+            report = ETLScheduler(max_workers=2, runner=log_job).run([make_job("users"), make_job("tests")])
+            self.assertTrue(report.success)
+        output = self.forked_output(work)
+        self.assertIn("WARNING - job users", output)
+        self.assertIn("WARNING - job tests", output)
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    """Test cases for dropping repetitive records."""
+
+    def record(self, msg, level=logging.INFO):
+        return logging.LogRecord("tests", level, __file__, 1, msg, None, None)
+
+    def test_similar_messages_are_limited(self):
+        """Test messages differing in numbers share a limit, warnings never drop."""
+        limiter = RateLimitFilter(limit=2, interval=0.2)
+        passed = [limiter.filter(self.record(f"loaded batch {i}")) for i in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(limiter.filter(self.record("other message")))
+        self.assertTrue(limiter.filter(self.record("loaded batch 9", logging.WARNING)))
+
+        time.sleep(0.2)
+        record = self.record("loaded batch 5")
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.getMessage(), "loaded batch 5 (3 similar messages suppressed)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Unit tests for utils/metrics.py and the metrics recorded by ETLOrchestrator."""
+
+import json
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from src.utils.decorators import time_execution
+from src.utils.metrics import METRICS, Histogram, MetricsRegistry
+from tests.test_orchestrator import MemoryLoader
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for histograms, counters and their exports."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_histogram_buckets(self):
+        """Test observations land in cumulative buckets ending with +Inf."""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertEqual((histogram.count, histogram.sum), (4, 3.65))
+
+    def test_stage_records_events_and_series(self):
+        """Test a timed stage records its duration, counts and a batch event."""
+        for rows in (10, 20):
+            with self.registry.stage("job", "load", table="users") as counts:
+                counts.update(rows_in=rows, bytes_out=rows * 8)
+        events = self.registry.events()
+        self.assertEqual([(e["batch"], e["rows_in"], e["bytes"]) for e in events], [(0, 10, 80), (1, 20, 160)])
+        counters = {c["name"]: c["value"] for c in self.registry.snapshot()["counters"]}
+        self.assertEqual(counters, {"etl_stage_rows_in_total": 30, "etl_stage_bytes_total": 240})
+
+    def test_prometheus_textfile(self):
+        """Test the textfile follows the exposition format and escapes labels."""
+        self.registry.observe("etl_stage_seconds", 0.2, job='say "hi"', stage="load")
+        self.registry.inc("etl_stage_rows_in_total", 5, job="j", stage="load")
+        path = os.path.join(self.tmp_dir.name, "textfile", "etl.prom")
+        self.registry.write_prometheus(path)
+        with open(path) as handle:
+            text = handle.read()
+        self.assertIn("# TYPE etl_stage_seconds histogram", text)
+        self.assertIn('etl_stage_seconds_bucket{job="say \\"hi\\"",stage="load",le="0.25"} 1', text)
+        self.assertIn('etl_stage_seconds_count{job="say \\"hi\\"",stage="load"} 1', text)
+        self.assertIn('etl_stage_rows_in_total{job="j",stage="load"} 5', text)
+
+    def test_json_lines(self):
+        """Test events are appended once, followed by every series."""
+        with self.registry.stage("job", "extract") as counts:
+            counts["rows_out"] = 3
+        path = os.path.join(self.tmp_dir.name, "metrics.jsonl")
+        self.registry.write_json_lines(path)
+        self.registry.write_json_lines(path)
+        with open(path) as handle:
+            lines = [json.loads(line) for line in handle]
+        self.assertEqual([line["type"] for line in lines], ["batch", "histogram", "counter", "histogram", "counter"])
+        self.assertEqual(lines[0]["rows_out"], 3)
+
+
+class TestOrchestratorMetrics(unittest.TestCase):
+    """Test cases for the stages ETLOrchestrator records."""
+
+    def setUp(self):
+        METRICS.reset()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.tmp_dir.name, "users.csv")
+        pl.DataFrame({"user_id": ["u1", "u2", "u3"], "age": [31, 17, 45]}).write_csv(self.source_path)
+
+    def tearDown(self):
+        METRICS.reset()
+        self.tmp_dir.cleanup()
+
+    def config(self, table_name, **execution_config):
+        return ETLConfig(
+            source_type=DataSourceType.CSV,
+            source_path=self.source_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": table_name},
+            transformer_config={"columns_to_select": ["user_id"]},
+            execution_config={"batch_size": 2, **execution_config},
+        )
+
+    def stages(self):
+        return [(event["stage"], event["table"], event["rows_in"], event["rows_out"]) for event in METRICS.events()]
+
+    def test_single_target_stages_and_exports(self):
+        """Test a fused run records plan and load batches and exports them."""
+        prom_path = os.path.join(self.tmp_dir.name, "etl.prom")
+        jsonl_path = os.path.join(self.tmp_dir.name, "etl.jsonl")
+        config = self.config("users", job_name="nightly", metrics_prometheus=prom_path, metrics_jsonl=jsonl_path)
+        self.assertTrue(ETLOrchestrator(extractor=CsvExtractor(), loader=MemoryLoader()).run(config))
+
+        with open(prom_path) as handle:
+            text = handle.read()
+        self.assertIn('etl_stage_rows_in_total{job="nightly",stage="load",table="users"} 3', text)
+        self.assertIn('etl_function_seconds_count{function="ETL.Orchestrator.run",outcome="ok"} 1', text)
+        with open(jsonl_path) as handle:
+            batches = [json.loads(line) for line in handle if '"type": "batch"' in line]
+        self.assertEqual({batch["stage"] for batch in batches}, {"plan", "load"})
+        self.assertEqual(sum(batch["rows_out"] for batch in batches if batch["stage"] == "plan"), 3)
+
+    def test_multi_target_stages(self):
+        """Test per-batch extract, transform and per-table load stages."""
+        config = MultiTargetETLConfig(targets=[self.config("users"), self.config("ages")],
+                                      execution_config={"batch_size": 2})
+        self.assertTrue(ETLOrchestrator(extractor=CsvExtractor(), loader=MemoryLoader()).run(config))
+        self.assertEqual(self.stages()[:5], [
+            ("extract", None, None, 2),
+            ("transform", None, 2, 4),
+            ("load", "users", 2, None),
+            ("load", "ages", 2, None),
+            ("extract", None, None, 1),
+        ])
+        self.assertEqual({event["job"] for event in METRICS.events()}, {"users,ages"})
+
+    def test_time_execution_records_errors(self):
+        """Test failing decorated calls are observed with their outcome."""
+        @time_execution(func_path="tests.boom")
+        def boom():
+            raise KeyError("x")
+
+        with self.assertRaises(KeyError):
+            boom()
+        series = [h for h in METRICS.snapshot()["histograms"] if h["labels"].get("function") == "tests.boom"]
+        self.assertEqual([(s["labels"]["outcome"], s["count"]) for s in series], [("error", 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
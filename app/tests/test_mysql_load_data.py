@@ -0,0 +1,150 @@
+"""Unit tests for adapters/loaders/mysql_load_data.py and DatabaseLoader load methods."""
+
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+import polars as pl
+from unittest import mock
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from src.adapters.loaders.mysql_load_data import write_load_data_file, load_data_statement, load_data_refused
+from tests.test_database_loader import SQLiteTestCase
+
+UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r", "0": "\x00"}
+
+
+def read_load_data_file(path):
+    """Parse a file the way LOAD DATA with default escaping would."""
+    rows = []
+    with open(path, encoding="utf-8", newline="") as handle:
+        for line in handle.read().split("\n")[:-1]:
+            row = []
+            for field in line.split("\t"):
+                if field == "\\N":
+                    row.append(None)
+                    continue
+                value, i = [], 0
+                while i < len(field):
+                    if field[i] == "\\":
+                        value.append(UNESCAPES[field[i + 1]])
+                        i += 2
+                    else:
+                        value.append(field[i])
+                        i += 1
+                row.append("".join(value))
+            rows.append(row)
+    return rows
+
+
+class TestLoadDataFile(unittest.TestCase):
+    """Test cases for the LOAD DATA text rendering."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "batch.tsv")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_escaping_and_nulls(self):
+        """Test tabs, newlines, backslashes, literal \\N and NULLs round-trip."""
+        values = ["plain", "tab\there", "line\nbreak", "back\\slash", "\\N", "", None, "cr\rnul\x00"]
+        write_load_data_file(pl.DataFrame({"name": values}), self.path)
+        self.assertEqual([row[0] for row in read_load_data_file(self.path)], values)
+
+    def test_types(self):
+        """Test binary, boolean, date and timestamp rendering."""
+        records = pl.DataFrame({
+            "password": [b"gAAAA\x00\xff", None],
+            "is_claimed": [True, False],
+            "dob": [date(2001, 1, 1), None],
+            "created_at": [datetime(2024, 1, 15, 10, 30, 0, 123456), datetime(2024, 1, 15)],
+            "paid_amount": [12.34, None],
+        })
+        columns, assignments = write_load_data_file(records, self.path)
+        rows = read_load_data_file(self.path)
+        self.assertEqual(rows[0], [b"gAAAA\x00\xff".hex(), "1", "2001-01-01", "2024-01-15 10:30:00.123456", "12.34"])
+        self.assertEqual(rows[1], [None, "0", None, "2024-01-15 00:00:00.000000", None])
+        self.assertEqual(columns, ["@v0", "`is_claimed`", "`dob`", "`created_at`", "`paid_amount`"])
+        self.assertEqual(assignments, ["`password` = UNHEX(@v0)"])
+
+    def test_nested_columns_rejected(self):
+        """Test columns without a text form are refused."""
+        with self.assertRaises(ValueError):
+            write_load_data_file(pl.DataFrame({"phones": [["1", "2"]]}), self.path)
+
+    def test_statement(self):
+        """Test the statement matches the file layout."""
+        statement = load_data_statement("users", "/tmp/b.tsv", ["`name`", "@v0"], ["`password` = UNHEX(@v0)"])
+        self.assertEqual(
+            statement,
+            "LOAD DATA LOCAL INFILE '/tmp/b.tsv' INTO TABLE `users` CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            "(`name`, @v0) SET `password` = UNHEX(@v0)"
+        )
+
+
+class TestLoadMethods(SQLiteTestCase):
+    """Test cases for DatabaseLoader load_method selection."""
+
+    def setUp(self):
+        super().setUp()
+        with self.loader.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE users (user_id TEXT, password BLOB, created_at TIMESTAMP)"))
+        self.records = pl.DataFrame({
+            "user_id": [f"u{i}" for i in range(25)],
+            "password": [b"token"] * 25,
+            "created_at": [datetime(2024, 1, 15, 10, 30)] * 25,
+        })
+
+    def test_executemany_in_chunks(self):
+        """Test chunked executemany inserts every row."""
+        config = {"table_name": "users", "load_method": "executemany", "chunk_size": 10}
+        self.assertTrue(self.loader.load(self.records, config))
+        self.assertEqual(self.fetch("SELECT COUNT(*), MIN(password) FROM users"), [(25, b"token")])
+
+    def test_load_data_falls_back(self):
+        """Test load_data uses executemany where LOAD DATA is not possible."""
+        self.assertTrue(self.loader.load(self.records, {"table_name": "users", "load_method": "load_data"}))
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM users"), [(25,)])
+
+    def load_with_load_data_error(self, error):
+        """Load with LOAD DATA failing with error, as if the backend were MySQL."""
+        def refuse(records, table_name, connection):
+            raise error
+
+        with mock.patch.object(self.loader, "_can_load_data", lambda: self.loader._load_data_available), \
+                mock.patch.object(self.loader, "_load_data_infile", refuse):
+            return self.loader.load(self.records, {"table_name": "users", "load_method": "load_data"})
+
+    def test_refused_load_data_falls_back_for_good(self):
+        """Test a server refusing LOAD DATA LOCAL switches the loader to executemany."""
+        refused = OperationalError("LOAD DATA", {}, Exception(1148, "The used command is not allowed"))
+        self.assertTrue(self.load_with_load_data_error(refused))
+        self.assertFalse(self.loader._load_data_available)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM users"), [(25,)])
+
+    def test_other_load_data_errors_propagate(self):
+        """Test data and connection errors fail the load instead of retrying with executemany."""
+        duplicate = IntegrityError("LOAD DATA", {}, Exception(1062, "Duplicate entry"))
+        self.assertFalse(self.load_with_load_data_error(duplicate))
+        self.assertTrue(self.loader._load_data_available)
+        self.assertEqual(self.fetch("SELECT COUNT(*) FROM users"), [(0,)])
+
+    def test_refusal_codes(self):
+        """Test refusals are recognised from PyMySQL args and mysql-connector errno."""
+        connector_error = Exception("rejected")
+        connector_error.errno = 2068
+        self.assertTrue(load_data_refused(connector_error))
+        self.assertTrue(load_data_refused(OperationalError("x", {}, Exception(3948, "disabled"))))
+        self.assertFalse(load_data_refused(OperationalError("x", {}, Exception(2013, "Lost connection"))))
+
+    def test_unknown_method(self):
+        """Test unknown load methods are rejected."""
+        with self.assertRaises(ValueError):
+            self.loader.load(self.records, {"table_name": "users", "load_method": "copy"})
+
+
+if __name__ == "__main__":
+    unittest.main()
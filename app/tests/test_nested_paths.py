@@ -0,0 +1,126 @@
+"""Unit tests for utils/nested_paths.py."""
+
+import os
+import unittest
+import polars as pl
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.domain.entities import MultiTargetETLConfig
+from src.etl.orchestrator import ETLOrchestrator
+from src.utils.nested_paths import NestedPath, compile_path, flatten
+from tests.test_orchestrator import USERS, MemoryLoader, user_targets, write_ndjson
+
+RECORDS = pl.DataFrame([
+    {
+        "user_id": "u1",
+        "country": "LK",
+        "user_details": {"name": "Ann", "telephone_numbers": ["111", "112"]},
+        "jobs_history": [
+            {"occupation": "dev", "is_fulltime": True, "skills": [{"skill": "sql"}, {"skill": "go"}]},
+        ],
+    },
+    {
+        "user_id": "u2",
+        "country": "NZ",
+        "user_details": {"name": "Bob", "telephone_numbers": ["221"]},
+        "jobs_history": [
+            {"occupation": "ops", "is_fulltime": False, "skills": [{"skill": "bash"}]},
+            {"occupation": "qa", "is_fulltime": True, "skills": []},
+        ],
+    },
+])
+
+
+class TestNestedPath(unittest.TestCase):
+    """Test cases for parsing and applying nested paths."""
+
+    def test_parse(self):
+        """Test segments, explode markers and the trailing unnest."""
+        path = NestedPath("jobs_history[].skills[].*")
+        self.assertEqual([(s.name, s.explode) for s in path.segments],
+                         [("jobs_history", True), ("skills", True)])
+        self.assertTrue(path.unnest)
+        self.assertEqual(path.root, "jobs_history")
+        self.assertIs(compile_path("a.b[]"), compile_path("a.b[]"))
+
+    def test_invalid_paths(self):
+        """Test malformed paths are rejected."""
+        for path in ("", "*", "a..b", "a[].[]", "a[0]", "a.*.b"):
+            with self.subTest(path=path):
+                with self.assertRaises(ValueError):
+                    NestedPath(path)
+
+    def test_struct_field_then_explode(self):
+        """Test a list inside a struct keeps only the parent key."""
+        result = flatten(RECORDS, "user_details.telephone_numbers[]", keep=["user_id"])
+        self.assertEqual(result.columns, ["user_id", "telephone_numbers"])
+        self.assertEqual(result.rows(), [("u1", "111"), ("u1", "112"), ("u2", "221")])
+
+    def test_explode_then_unnest_used_fields(self):
+        """Test `.*` only takes the struct fields that are used later."""
+        result = flatten(RECORDS.lazy(), "jobs_history[].*", columns=["user_id", "occupation"]).collect()
+        self.assertEqual(result.columns, ["user_id", "occupation"])
+        self.assertEqual(result["occupation"].to_list(), ["dev", "ops", "qa"])
+
+        everything = flatten(RECORDS, "jobs_history[].*", keep=["user_id"])
+        self.assertEqual(everything.columns, ["user_id", "occupation", "is_fulltime", "skills"])
+
+    def test_arbitrary_depth(self):
+        """Test lists nested in lists are exploded level by level."""
+        result = flatten(RECORDS, "jobs_history[].skills[].skill", keep=["user_id"])
+        self.assertEqual(result.rows(), [("u1", "sql"), ("u1", "go"), ("u2", "bash")])
+        unnested = flatten(RECORDS, "jobs_history[].skills[].*", keep=["user_id"])
+        self.assertTrue(unnested.equals(result))
+
+    def test_unnest_struct_keeps_other_columns(self):
+        """Test the default keep carries every other top-level column."""
+        result = flatten(RECORDS, "user_details.*")
+        self.assertEqual(result.columns, ["user_id", "country", "jobs_history", "name", "telephone_numbers"])
+
+    def test_only_used_columns_reach_the_explode(self):
+        """Test the lazy plan projects the scan down to the used columns."""
+        plan = flatten(RECORDS.lazy(), "jobs_history[].occupation", columns=["user_id", "occupation"]).explain()
+        self.assertIn('PROJECT["user_id", "jobs_history"] 2/4 COLUMNS', plan)
+
+    def test_schema_errors(self):
+        """Test unknown columns/fields and wrong types are reported."""
+        for path in ("missing[]", "user_details.missing", "user_id[]", "user_details.name.*", "country.code"):
+            with self.subTest(path=path):
+                with self.assertRaises(ValueError):
+                    flatten(RECORDS, path, keep=["user_id"])
+        with self.assertRaises(ValueError):
+            flatten(RECORDS, "user_details.*", keep=["user_id", "name"])
+
+
+class TestOrchestratorNestedPaths(unittest.TestCase):
+    """Test cases for unnest_config paths in the orchestrator."""
+
+    def setUp(self):
+        self.source_path = write_ndjson(USERS)
+
+    def tearDown(self):
+        os.remove(self.source_path)
+
+    def test_paths_match_legacy_operations(self):
+        """Test path configs load the same tables as the operations configs, single and multi-target."""
+        paths = ["user_details.*", "user_details.telephone_numbers[]", "jobs_history[].*"]
+        path_targets = user_targets(self.source_path)
+        for target, path in zip(path_targets, paths):
+            target.unnest_config = {"path": path}
+
+        legacy = MemoryLoader()
+        ETLOrchestrator(extractor=JsonExtractor(), loader=legacy).run(
+            MultiTargetETLConfig(targets=user_targets(self.source_path)))
+        single = MemoryLoader()
+        for target in path_targets:
+            ETLOrchestrator(extractor=JsonExtractor(), loader=single).run(target)
+        multi = MemoryLoader()
+        ETLOrchestrator(extractor=JsonExtractor(), loader=multi).run(MultiTargetETLConfig(targets=path_targets))
+
+        for name in ("users", "telephone_numbers", "jobs_history"):
+            expected = pl.concat(legacy.tables[name])
+            self.assertTrue(pl.concat(single.tables[name]).equals(expected), name)
+            self.assertTrue(pl.concat(multi.tables[name]).equals(expected), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
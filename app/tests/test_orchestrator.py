@@ -0,0 +1,221 @@
+"""Unit tests for etl/orchestrator.py."""
+
+import json
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from src.ports.loader import Loader
+from src.utils.metrics import METRICS
+
+USERS = [
+    {
+        "user_id": "u1",
+        "user_details": {"name": "Ann", "telephone_numbers": ["111", "112"]},
+        "jobs_history": [{"occupation": "dev", "is_fulltime": True}],
+    },
+    {
+        "user_id": "u2",
+        "user_details": {"name": "Bob", "telephone_numbers": ["221"]},
+        "jobs_history": [{"occupation": "ops", "is_fulltime": False},
+                         {"occupation": "qa", "is_fulltime": True}],
+    },
+]
+
+
+class MemoryLoader(Loader):
+    """Loader keeping every loaded frame per table, in load order."""
+
+    def __init__(self):
+        self.tables = {}
+        self.load_order = []
+
+    def load(self, records, config):
+        self.tables.setdefault(config["table_name"], []).append(records)
+        self.load_order.append(config["table_name"])
+        return True
+
+    def validate_connection(self, config):
+        return True
+
+
+class CountingJsonExtractor(JsonExtractor):
+    """JsonExtractor counting how often the source is scanned."""
+
+    def __init__(self):
+        self.extract_calls = 0
+
+    def extract(self, source_path, source_config=None):
+        self.extract_calls += 1
+        return super().extract(source_path, source_config)
+
+
+def write_ndjson(rows):
+    handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    with handle:
+        for row in rows:
+            handle.write(json.dumps(row) + "\n")
+    return handle.name
+
+
+def user_targets(source_path):
+    """The users / telephone_numbers / jobs_history targets from main.py."""
+    def target(table_name, unnest_config, transformer_config):
+        return ETLConfig(
+            source_type=DataSourceType.JSON,
+            source_path=source_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": table_name},
+            unnest_config=unnest_config,
+            transformer_config=transformer_config,
+        )
+    return [
+        target("users",
+               {"column_to_extract": "user_details", "operations": {"0": "unnest"}},
+               {"columns_to_select": ["user_id", "name"]}),
+        target("telephone_numbers",
+               {"preop": {"column_to_extract": "user_details", "operations": {"0": "unnest"}},
+                "column_to_extract": "telephone_numbers", "operations": {"0": "explode"}},
+               {"columns_to_select": ["user_id", "telephone_numbers"],
+                "field_mappings": {"telephone_numbers": "telephone_number"}}),
+        target("jobs_history",
+               {"column_to_extract": "jobs_history", "operations": {"0": "explode", "1": "unnest"}},
+               {"columns_to_select": ["user_id", "occupation"]}),
+    ]
+
+
+class TestMultiTargetRun(unittest.TestCase):
+    """Test cases for running several targets over one scan."""
+
+    def setUp(self):
+        self.source_path = write_ndjson(USERS)
+        self.extractor = CountingJsonExtractor()
+        self.loader = MemoryLoader()
+        self.orchestrator = ETLOrchestrator(extractor=self.extractor, loader=self.loader)
+
+    def tearDown(self):
+        os.remove(self.source_path)
+
+    def test_single_scan_feeds_all_targets(self):
+        """Test one extract produces every target table in declared order."""
+        config = MultiTargetETLConfig(targets=user_targets(self.source_path))
+        self.assertTrue(self.orchestrator.run(config))
+        self.assertEqual(self.extractor.extract_calls, 1)
+        self.assertEqual(self.loader.load_order, ["users", "telephone_numbers", "jobs_history"])
+
+        tables = {name: pl.concat(frames) for name, frames in self.loader.tables.items()}
+        self.assertEqual(tables["users"].rows(), [("u1", "Ann"), ("u2", "Bob")])
+        self.assertEqual(tables["telephone_numbers"].columns, ["user_id", "telephone_number"])
+        self.assertEqual(tables["telephone_numbers"].height, 3)
+        self.assertEqual(tables["jobs_history"]["occupation"].to_list(), ["dev", "ops", "qa"])
+
+    def test_matches_separate_runs(self):
+        """Test fan-out gives the same tables as one run per target."""
+        targets = user_targets(self.source_path)
+        self.orchestrator.run(MultiTargetETLConfig(targets=targets))
+        fan_out = {name: pl.concat(frames) for name, frames in self.loader.tables.items()}
+
+        separate = MemoryLoader()
+        for target in targets:
+            ETLOrchestrator(extractor=JsonExtractor(), loader=separate).run(target)
+        for name, frames in separate.tables.items():
+            self.assertTrue(pl.concat(frames).equals(fan_out[name]))
+
+    def test_pipelined_matches_serial(self):
+        """Test the pipelined runner loads the same tables in the same order."""
+        config = MultiTargetETLConfig(
+            targets=user_targets(self.source_path),
+            execution_config={"pipelined": True, "batch_size": 1, "transform_workers": 2}
+        )
+        self.assertTrue(self.orchestrator.run(config))
+        self.assertEqual(self.loader.load_order, ["users", "telephone_numbers", "jobs_history"] * 2)
+        users = pl.concat(self.loader.tables["users"])
+        self.assertEqual(users.rows(), [("u1", "Ann"), ("u2", "Bob")])
+
+    def test_targets_must_share_source(self):
+        """Test targets over different sources are rejected."""
+        targets = user_targets(self.source_path)
+        targets[1].source_path = "other.json"
+        with self.assertRaises(ValueError):
+            MultiTargetETLConfig(targets=targets)
+
+
+class PlanCapturingOrchestrator(ETLOrchestrator):
+    """Orchestrator remembering the plans handed to collect_batches."""
+
+    def collect_batches(self, records, execution_config=None):
+        self.plans = getattr(self, "plans", []) + [records]
+        return super().collect_batches(records, execution_config)
+
+
+class TestLazyPlan(unittest.TestCase):
+    """Test cases for composing extract, unnest and transform into one plan."""
+
+    def setUp(self):
+        self.source_path = write_ndjson(USERS)
+        self.loader = MemoryLoader()
+
+    def tearDown(self):
+        os.remove(self.source_path)
+
+    def test_transformer_keeps_lazy_frames(self):
+        """Test the transformer extends a LazyFrame without collecting it."""
+        records = pl.LazyFrame({"a": [1, 2], "b": ["x", "y"], "c": [0, 0]})
+        result = ETLOrchestrator()._transformer.transform(
+            records, {"columns_to_select": ["a", "b"], "field_mappings": {"b": "name"}}
+        )
+        self.assertIsInstance(result, pl.LazyFrame)
+        self.assertEqual(result.collect().columns, ["a", "name"])
+
+    def test_unused_csv_columns_pruned_in_scan(self):
+        """Test columns_to_select is pushed down into scan_csv."""
+        handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        with handle:
+            handle.write("id,name,unused_1,unused_2\n1,Ann,x,y\n2,Bob,x,y\n")
+        self.addCleanup(os.remove, handle.name)
+        config = ETLConfig(
+            source_type=DataSourceType.CSV,
+            source_path=handle.name,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": "people"},
+            transformer_config={"columns_to_select": ["id", "name"], "field_mappings": {"name": "full_name"}},
+        )
+        orchestrator = PlanCapturingOrchestrator(extractor=CsvExtractor(), loader=self.loader)
+        self.assertTrue(orchestrator.run(config))
+
+        plan = orchestrator.plans[0].explain()
+        self.assertIn("PROJECT 2/4 COLUMNS", plan[plan.index("SCAN"):])
+        self.assertEqual(pl.concat(self.loader.tables["people"]).rows(), [(1, "Ann"), (2, "Bob")])
+
+    def test_single_target_batches_are_prepared_in_plan(self):
+        """Test unnest/explode/transform run inside the batched plan."""
+        target = user_targets(self.source_path)[2]
+        target.execution_config = {"batch_size": 1}
+        loader = MemoryLoader()
+        orchestrator = PlanCapturingOrchestrator(extractor=JsonExtractor(), loader=loader)
+        self.assertTrue(orchestrator.run(target))
+        self.assertEqual(orchestrator.plans[0].collect_schema().names(), ["user_id", "occupation"])
+        jobs = pl.concat(loader.tables["jobs_history"])
+        self.assertEqual(jobs["occupation"].to_list(), ["dev", "ops", "qa"])
+
+    def test_pipelined_single_target_has_a_transform_stage(self):
+        """Test pipelined runs transform source batches in their own stage, with its workers."""
+        target = user_targets(self.source_path)[2]
+        target.execution_config = {"batch_size": 1, "pipelined": True, "transform_workers": 2}
+        loader = MemoryLoader()
+        orchestrator = PlanCapturingOrchestrator(extractor=JsonExtractor(), loader=loader)
+        METRICS.reset()
+        self.assertTrue(orchestrator.run(target))
+        self.assertEqual(orchestrator.plans[0].collect_schema().names(), ["user_id", "user_details", "jobs_history"])
+        self.assertIn(("transform", "jobs_history"), {(e["stage"], e["table"]) for e in METRICS.events()})
+        jobs = pl.concat(loader.tables["jobs_history"])
+        self.assertEqual(jobs["occupation"].to_list(), ["dev", "ops", "qa"])
+        METRICS.reset()
+
+
+if __name__ == "__main__":
+    unittest.main()
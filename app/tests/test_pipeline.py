@@ -0,0 +1,85 @@
+"""Unit tests for etl/pipeline.py."""
+
+import random
+import threading
+import time
+import unittest
+from src.etl.pipeline import Pipeline, Stage
+
+
+def square(value):
+    return value * value
+
+
+def jitter(value):
+    time.sleep(random.random() / 200)
+    return value
+
+
+class TestPipeline(unittest.TestCase):
+    """Test cases for the bounded-queue stage pipeline."""
+
+    def test_ordered_with_many_workers(self):
+        """Test results keep source order with parallel workers."""
+        pipeline = Pipeline([Stage("jitter", jitter, workers=4), Stage("square", square, workers=3)])
+        self.assertEqual(list(pipeline.run(range(50))), [i * i for i in range(50)])
+
+    def test_unordered_completes_every_item(self):
+        """Test unordered mode yields every result once."""
+        pipeline = Pipeline([Stage("jitter", jitter, workers=4)], ordered=False)
+        self.assertEqual(sorted(pipeline.run(range(50))), list(range(50)))
+
+    def test_process_stage(self):
+        """Test stages can run on a process pool."""
+        pipeline = Pipeline([Stage("square", square, workers=2, executor="process")])
+        self.assertEqual(list(pipeline.run(range(10))), [i * i for i in range(10)])
+
+    def test_back_pressure(self):
+        """Test the source cannot run far ahead of a slow stage."""
+        produced = []
+        lock = threading.Lock()
+
+        def source():
+            for i in range(20):
+                with lock:
+                    produced.append(i)
+                yield i
+
+        def slow(value):
+            time.sleep(0.01)
+            with lock:
+                # queue_size items per queue plus one in the worker's hands
+                self.assertLessEqual(len(produced) - value, 2 * 2 + 2)
+            return value
+
+        pipeline = Pipeline([Stage("slow", slow)], queue_size=2)
+        self.assertEqual(list(pipeline.run(source())), list(range(20)))
+
+    def test_stage_error_propagates(self):
+        """Test an exception in a stage is re-raised and stops the pipeline."""
+        def fail_on_five(value):
+            if value == 5:
+                raise ValueError("bad batch")
+            return value
+
+        pipeline = Pipeline([Stage("check", fail_on_five, workers=2)])
+        with self.assertRaisesRegex(ValueError, "bad batch"):
+            list(pipeline.run(range(1000)))
+
+    def test_source_error_propagates(self):
+        """Test an exception while extracting is re-raised."""
+        def source():
+            yield 1
+            raise IOError("truncated file")
+
+        with self.assertRaises(IOError):
+            list(Pipeline([Stage("square", square)]).run(source()))
+
+    def test_invalid_executor(self):
+        """Test unknown executors are rejected."""
+        with self.assertRaises(ValueError):
+            Pipeline([Stage("square", square, executor="fiber")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Unit tests for etl/profiling.py and ETLOrchestrator.run(profile=...)."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.domain.entities import ETLConfig, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.orchestrator import ETLOrchestrator
+from src.etl.profiling import _categorize, report_dir_for
+from src.utils.metrics import METRICS
+from tests.test_orchestrator import MemoryLoader
+
+
+def slow_upper(value):
+    time.sleep(0.002)
+    return value.upper()
+
+
+class SlowLoader(MemoryLoader):
+    def load(self, records, config):
+        time.sleep(0.05)
+        return super().load(records, config)
+
+
+class TestCategorize(unittest.TestCase):
+    """Test cases for the cost category of sampled stacks."""
+
+    def stack(self, *files):
+        return [(os.path.join(os.sep, "lib", *f.split("/")), "f", 1) for f in files]
+
+    def test_categories(self):
+        """Test idle, database, loader, UDF and engine stacks are told apart."""
+        self.assertEqual(_categorize(self.stack("threading.py", "app.py"), True), "idle")
+        self.assertEqual(_categorize(self.stack("sqlalchemy/engine/base.py", "loaders/db.py"), True), "sqlalchemy")
+        self.assertEqual(_categorize(self.stack("polars/frame.py", "loaders/db.py"), True), "loader")
+        self.assertEqual(_categorize(self.stack("udf.py"), False), "udf")
+        self.assertEqual(_categorize(self.stack("src/utils/transform_helpers.py", "polars/series.py"), True), "udf")
+        self.assertEqual(_categorize(self.stack("polars/lazyframe/frame.py", "app.py"), True), "polars")
+        self.assertEqual(_categorize(self.stack("app.py"), True), "python")
+
+    def test_report_dir(self):
+        """Test True names a directory per job and run, a string is used as is."""
+        self.assertEqual(report_dir_for("out/run", "users"), "out/run")
+        self.assertRegex(report_dir_for(True, "users,jobs"), r"^profiles.users_jobs-\d{8}-\d{6}$")
+
+
+class TestOrchestratorProfile(unittest.TestCase):
+    """Test cases for profiled runs."""
+
+    def setUp(self):
+        METRICS.reset()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.report_dir = os.path.join(self.tmp_dir.name, "profile")
+        self.source_path = os.path.join(self.tmp_dir.name, "users.csv")
+        pl.DataFrame({
+            "user_id": [f"u{i}" for i in range(40)],
+            "name": [f"name{i}" for i in range(40)],
+        }).write_csv(self.source_path)
+
+    def tearDown(self):
+        METRICS.reset()
+        self.tmp_dir.cleanup()
+
+    def config(self, table_name, **transformer_config):
+        return ETLConfig(
+            source_type=DataSourceType.CSV,
+            source_path=self.source_path,
+            storage_type=StorageType.DATABASE,
+            storage_config={"table_name": table_name},
+            transformer_config={"columns_to_select": ["user_id", "name"], **transformer_config},
+            execution_config={"batch_size": 20},
+        )
+
+    def read(self, name):
+        with open(os.path.join(self.report_dir, name)) as handle:
+            return json.load(handle) if name.endswith(".json") else handle.read()
+
+    def test_single_target_report(self):
+        """Test the report holds the plan, batch stages and sampled UDF and loader time."""
+        config = self.config("users", value_transforms={"name": slow_upper}, value_transform_strategy="direct")
+        orchestrator = ETLOrchestrator(extractor=CsvExtractor(), loader=SlowLoader())
+        self.assertTrue(orchestrator.run(config, profile=self.report_dir))
+        self.assertIsNone(orchestrator.profiler)
+
+        plans = self.read("plans.json")
+        self.assertEqual([uses for uses in plans.values()], [["plan"]])
+        (digest,) = plans
+        self.assertIn("Csv SCAN", self.read(os.path.join("plans", f"{digest}.txt")))
+
+        stages = self.read("stages.json")
+        self.assertEqual([(s["stage"], s["rows_in"] or s["rows_out"]) for s in stages],
+                         [("plan", 20), ("load", 20), ("plan", 20), ("load", 20)])
+
+        samples = self.read("samples.json")
+        self.assertGreater(samples["categories"]["loader"], 0)
+        self.assertGreater(samples["categories"]["udf"], 0)
+        self.assertTrue(any(f["function"] == "slow_upper" for f in samples["functions"]))
+
+        summary = self.read("summary.txt")
+        self.assertIn("Profile of job 'users'", summary)
+        self.assertIn("python UDFs", summary)
+        self.assertRegex(summary, r"load +users +2")
+
+    def test_multi_target_plans_per_target(self):
+        """Test per-batch transform plans are stored once per target."""
+        config = MultiTargetETLConfig(targets=[self.config("users"), self.config("names")],
+                                      execution_config={"batch_size": 20})
+        self.assertTrue(ETLOrchestrator(extractor=CsvExtractor(), loader=MemoryLoader()).run(config, profile=self.report_dir))
+        uses = sorted(label for labels in self.read("plans.json").values() for label in labels)
+        self.assertEqual(uses, ["extract"] + ["transform names"] * 2 + ["transform users"] * 2)
+
+    def test_off_by_default(self):
+        """Test a run without profile writes no report."""
+        orchestrator = ETLOrchestrator(extractor=CsvExtractor(), loader=MemoryLoader())
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        try:
+            self.assertTrue(orchestrator.run(self.config("users")))
+        finally:
+            os.chdir(cwd)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, "profiles")))
+
+
+if __name__ == '__main__':
+    unittest.main()
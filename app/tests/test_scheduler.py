@@ -0,0 +1,142 @@
+"""Unit tests for etl/scheduler.py."""
+
+import multiprocessing
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.source_extractor_factory import SourceExtractorFactory
+from src.adapters.loaders.file_loader import FileLoader
+from src.adapters.loaders.storage_loader_factory import StorageLoaderFactory
+from src.domain.entities import ETLConfig, ETLJob, MultiTargetETLConfig, DataSourceType, StorageType
+from src.etl.scheduler import ETLScheduler, _init_worker
+from src.utils import crypto
+from src.utils.logger import ETLLogger
+
+
+def make_job(name, depends_on=(), storage_type=StorageType.DATABASE, fail=False, table_name=None):
+    config = ETLConfig(
+        source_type=DataSourceType.JSON,
+        source_path=f"{name}.json",
+        storage_type=storage_type,
+        storage_config={"table_name": table_name or name, "fail": fail},
+    )
+    return ETLJob(name, config, list(depends_on))
+
+
+def worker_setup():
+    return (sorted(t.value for t in SourceExtractorFactory._registry),
+            sorted(t.value for t in StorageLoaderFactory._registry),
+            crypto.ENCRYPTION_WORKERS)
+
+
+def sleepy_runner(config):
+    time.sleep(0.05)
+    return not config.storage_config["fail"]
+
+
+class RecordingRunner:
+    """Runner recording start order and peak concurrency per storage type."""
+
+    def __init__(self, key=lambda config: config.storage_type.value):
+        self.key = key
+        self.lock = threading.Lock()
+        self.started = []
+        self.active = {}
+        self.peak = {}
+
+    def __call__(self, config):
+        key = self.key(config)
+        with self.lock:
+            self.started.append(config.storage_config["table_name"])
+            self.active[key] = self.active.get(key, 0) + 1
+            self.peak[key] = max(self.peak.get(key, 0), self.active[key])
+        time.sleep(0.05)
+        with self.lock:
+            self.active[key] -= 1
+        return not config.storage_config["fail"]
+
+
+class TestETLScheduler(unittest.TestCase):
+    """Test cases for dependency-aware job scheduling."""
+
+    def test_dependencies_run_first(self):
+        """Test dependent tables start only after the table they reference."""
+        runner = RecordingRunner()
+        jobs = [make_job("telephone_numbers", ["users"]),
+                make_job("jobs_history", ["users"]),
+                make_job("users")]
+        report = ETLScheduler(max_workers=3, executor="thread", runner=runner).run(jobs)
+        self.assertTrue(report.success)
+        self.assertEqual(runner.started[0], "users")
+        self.assertEqual(runner.peak["database"], 2)
+
+    def test_target_limit(self):
+        """Test concurrency per storage target is capped."""
+        runner = RecordingRunner()
+        jobs = [make_job(f"t{i}") for i in range(4)] + [make_job("f", storage_type=StorageType.FILE)]
+        ETLScheduler(max_workers=4, target_limits={"database": 1}, executor="thread", runner=runner).run(jobs)
+        self.assertEqual(runner.peak["database"], 1)
+        self.assertEqual(runner.peak["file"], 1)
+
+    def test_limits_per_database_and_table(self):
+        """Test a table limit serializes writers of one table, not of the database."""
+        runner = RecordingRunner(key=lambda config: config.storage_config["table_name"])
+        jobs = [make_job(f"u{i}", table_name="users") for i in range(3)] + [make_job("tests")]
+        limits = {("database", "default"): 2, ("database", "default", "users"): 1}
+        ETLScheduler(max_workers=4, target_limits=limits, executor="thread", runner=runner).run(jobs)
+        self.assertEqual(runner.peak, {"users": 1, "tests": 1})
+        self.assertEqual(sorted(runner.started[:2]), ["tests", "users"])
+
+    def test_storage_targets(self):
+        """Test jobs name the database and table, or dataset, they write."""
+        users = make_job("users").config
+        users.storage_config["database_uri"] = "mysql://db1/etl"
+        files = ETLConfig(source_type=DataSourceType.JSON, source_path="users.json", storage_type=StorageType.FILE,
+                          storage_config={"path": "/data/users"})
+        job = ETLJob("both", MultiTargetETLConfig(targets=[users, files]))
+        self.assertEqual(job.storage_targets, [("database", "mysql://db1/etl", "users"), ("file", "/data/users")])
+        self.assertEqual(make_job("jobs").storage_targets, [("database", "default", "jobs")])
+
+    def test_spawned_workers_get_adapters_and_encryption_share(self):
+        """Test the pool initializer registers the parent's adapters and sizes the encryption pool."""
+        extractors = {DataSourceType.CSV: CsvExtractor}
+        loaders = {StorageType.FILE: FileLoader}
+        log_initializer, log_args = ETLLogger.process_logging()
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker,
+                                 initargs=(extractors, loaders, 3, log_initializer, log_args)) as pool:
+            self.assertEqual(pool.submit(worker_setup).result(), (["csv"], ["file"], 3))
+
+    def test_failed_dependency_skips_dependents(self):
+        """Test jobs depending on a failed job are skipped."""
+        jobs = [make_job("users", fail=True), make_job("telephone_numbers", ["users"]), make_job("tests")]
+        report = ETLScheduler(executor="thread", runner=sleepy_runner).run(jobs)
+        statuses = {name: result.status for name, result in report.jobs.items()}
+        self.assertEqual(statuses, {"users": "failed", "telephone_numbers": "skipped", "tests": "succeeded"})
+        self.assertFalse(report.success)
+
+    def test_critical_path(self):
+        """Test the critical path follows the longest dependency chain."""
+        jobs = [make_job("a"), make_job("b", ["a"]), make_job("c", ["b"]), make_job("d")]
+        report = ETLScheduler(max_workers=2, runner=sleepy_runner).run(jobs)
+        self.assertEqual(report.critical_path, ["a", "b", "c"])
+        self.assertGreaterEqual(report.critical_path_time, 0.15)
+        self.assertLessEqual(report.critical_path_time, report.wall_time)
+        for result in report.jobs.values():
+            self.assertGreaterEqual(result.wall_time, 0.05)
+
+    def test_invalid_graphs(self):
+        """Test cycles, unknown dependencies and duplicate names are rejected."""
+        scheduler = ETLScheduler(executor="thread", runner=sleepy_runner)
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            scheduler.run([make_job("a", ["b"]), make_job("b", ["a"])])
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            scheduler.run([make_job("a", ["missing"])])
+        with self.assertRaisesRegex(ValueError, "Duplicate"):
+            scheduler.run([make_job("a"), make_job("a")])
+
+
+if __name__ == "__main__":
+    unittest.main()
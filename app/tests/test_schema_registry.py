@@ -0,0 +1,146 @@
+"""Unit tests for adapters/extractors/schema_registry.py."""
+
+import json
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.adapters.extractors.schema_registry import SchemaRegistry, cached_schema, decode_dtype, encode_dtype
+
+
+class TestDtypeEncoding(unittest.TestCase):
+    """Test cases for the JSON dtype encoding."""
+
+    def test_round_trip(self):
+        """Test flat, temporal and nested dtypes survive JSON."""
+        dtypes = [
+            pl.Int64(), pl.String(), pl.Boolean(), pl.Date(), pl.Datetime("us", "UTC"), pl.Duration("ms"),
+            pl.Decimal(38, 2), pl.Enum(["a", "b"]), pl.Array(pl.Int8, 3),
+            pl.List(pl.Struct({"occupation": pl.String, "start": pl.Date})),
+        ]
+        for dtype in dtypes:
+            with self.subTest(dtype=dtype):
+                self.assertEqual(decode_dtype(json.loads(json.dumps(encode_dtype(dtype)))), dtype)
+
+    def test_names_from_config(self):
+        """Test dtype names and classes are accepted, unknown names rejected."""
+        self.assertEqual(decode_dtype("Float64"), pl.Float64)
+        self.assertEqual(decode_dtype(pl.String), pl.String)
+        for value in ("Nope", "col", {"tuple": "Int64"}):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    decode_dtype(value)
+
+
+class TestCachedSchemas(unittest.TestCase):
+    """Test cases for extractors using the schema registry."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "payments.csv")
+        self.registry_path = os.path.join(self.tmp_dir.name, "schemas.json")
+        self.write_csv("id,code,amount\n1,007,1.5\n2,010,3\n")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_csv(self, text):
+        with open(self.csv_path, "w") as handle:
+            handle.write(text)
+
+    def extract(self, **source_config):
+        source_config = {"schema_registry": self.registry_path, **source_config}
+        return CsvExtractor().extract(self.csv_path, source_config).collect()
+
+    def test_cached_schema_keeps_dtypes_stable(self):
+        """Test later runs reuse the cached dtypes instead of re-inferring."""
+        first = self.extract(schema_overrides={"code": "String"})
+        self.assertEqual(first.schema, pl.Schema({"id": pl.Int64, "code": pl.String, "amount": pl.Float64}))
+        self.assertEqual(first["code"].to_list(), ["007", "010"])
+
+        self.write_csv("id,code,amount\n3,011,4\n")
+        self.assertEqual(pl.read_csv(self.csv_path).schema["amount"], pl.Int64)
+        second = self.extract()
+        self.assertEqual(second.schema, first.schema)
+        self.assertEqual(second.rows(), [(3, "011", 4.0)])
+        self.assertEqual(SchemaRegistry(self.registry_path).get(self.csv_path), first.schema)
+
+    def test_overrides_apply_to_cached_schema(self):
+        """Test overrides added later win over the cached dtype."""
+        self.extract()
+        result = self.extract(schema_overrides={"amount": pl.Decimal(10, 2)})
+        self.assertEqual(result.schema["amount"], pl.Decimal(10, 2))
+
+    def test_column_drift(self):
+        """Test changed CSV columns are updated, warned about or rejected."""
+        self.extract()
+        self.write_csv("id,code,amount,currency\n3,011,4.5,LKR\n")
+
+        with self.assertRaisesRegex(ValueError, r"added \['currency'\]"):
+            self.extract(schema_drift="error")
+        with self.assertLogs("Adapters.Extractor.SchemaRegistry", level="WARNING"):
+            updated = self.extract()
+        self.assertEqual(updated.columns, ["id", "code", "amount", "currency"])
+        self.assertIn("currency", SchemaRegistry(self.registry_path).get(self.csv_path))
+
+    def test_warn_drift_scans_with_a_fresh_schema(self):
+        """Test 'warn' re-infers for the run without replacing the cached schema."""
+        first = self.extract()
+        self.write_csv("id,code,amount,currency\n3,011,4.5,LKR\n")
+        with self.assertLogs("Adapters.Extractor.SchemaRegistry", level="WARNING"):
+            result = self.extract(schema_drift="warn")
+        self.assertEqual(result.rows(), [(3, 11, 4.5, "LKR")])
+        self.assertEqual(SchemaRegistry(self.registry_path).get(self.csv_path), first.schema)
+
+    def test_headers_read_once_per_file_version(self):
+        """Test unchanged files are checked against cached headers without reading them."""
+        reads = []
+
+        def columns_of(path):
+            reads.append(path)
+            return pl.scan_csv(path, infer_schema_length=0).collect_schema().names()
+
+        def run():
+            return cached_schema(self.csv_path, [self.csv_path], {"schema_registry": self.registry_path},
+                                 infer=lambda overrides: pl.scan_csv(self.csv_path).collect_schema(),
+                                 columns_of=columns_of, strict_columns=True)
+
+        for _ in range(3):
+            run()
+        self.assertEqual(reads, [self.csv_path])
+        self.write_csv("id,code,amount\n3,011,4.5\n4,012,5.5\n")
+        run()
+        self.assertEqual(len(reads), 2)
+
+    def test_verify_schema_reports_dtype_drift(self):
+        """Test verify_schema re-infers and reports changed dtypes."""
+        self.extract()
+        self.write_csv("id,code,amount\nx1,007,1.5\n")
+        with self.assertRaisesRegex(ValueError, "column 'id' is String, cached Int64"):
+            self.extract(schema_drift="error", verify_schema=True)
+
+    def test_ndjson_new_keys_are_drift(self):
+        """Test NDJSON keys missing from the cache are reported."""
+        path = os.path.join(self.tmp_dir.name, "users.ndjson")
+        pl.DataFrame({"user_id": ["u1"], "age": [31]}).write_ndjson(path)
+        config = {"schema_registry": self.registry_path, "schema_drift": "error"}
+        self.assertEqual(JsonExtractor().extract(path, config).collect()["age"].to_list(), [31])
+
+        pl.DataFrame({"user_id": ["u2"]}).write_ndjson(path)
+        self.assertEqual(JsonExtractor().extract(path, config).collect()["age"].to_list(), [None])
+
+        pl.DataFrame({"user_id": ["u3"], "country": ["LK"]}).write_ndjson(path)
+        with self.assertRaisesRegex(ValueError, r"added \['country'\]"):
+            JsonExtractor().extract(path, config)
+
+    def test_overrides_without_registry(self):
+        """Test schema_overrides work without a registry."""
+        records = CsvExtractor().extract(self.csv_path, {"schema_overrides": {"code": "String"}}).collect()
+        self.assertEqual(records["code"].to_list(), ["007", "010"])
+        self.assertFalse(os.path.exists(self.registry_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
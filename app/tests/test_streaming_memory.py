@@ -0,0 +1,133 @@
+"""Memory ceiling tests for streaming runs of ETLOrchestrator.run."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import polars as pl
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Documented target: with streaming on, peak anonymous memory grows by less
+# than this when the input grows 8x (it is bounded by batch_size, not file size).
+MAX_GROWTH_MB = 40
+
+RUN_SCRIPT = """
+import json, sys, threading, time
+from src.domain.entities import ETLConfig, DataSourceType, StorageType
+from src.adapters.extractors.csv_extractor import CsvExtractor
+from src.adapters.extractors.json_extractor import JsonExtractor
+from src.etl.orchestrator import ETLOrchestrator
+from src.ports.loader import Loader
+from src.utils.logger import ETLLogger
+from src.utils.transform_helpers import handle_paid_amount, str_to_bool
+
+class NullLoader(Loader):
+    rows = 0
+    def load(self, records, config):
+        NullLoader.rows += records.height
+        return True
+    def validate_connection(self, config):
+        return True
+
+def rss_anon_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("RssAnon"):
+                return int(line.split()[1]) / 1024
+
+peak = [0.0]
+done = threading.Event()
+def sample():
+    while not done.is_set():
+        peak[0] = max(peak[0], rss_anon_mb())
+        time.sleep(0.005)
+sampler = threading.Thread(target=sample, daemon=True)
+sampler.start()
+
+source_type = DataSourceType(sys.argv[2])
+extractor = CsvExtractor() if source_type == DataSourceType.CSV else JsonExtractor()
+config = ETLConfig(
+    source_type=source_type,
+    source_path=sys.argv[1],
+    storage_type=StorageType.DATABASE,
+    storage_config={"table_name": "tests"},
+    unnest_config={},
+    transformer_config={"value_transforms": {"paid_amount": handle_paid_amount,
+                                             "is_claimed": str_to_bool}},
+    execution_config={"streaming": True, "batch_size": 50000},
+)
+ETLOrchestrator(extractor=extractor, loader=NullLoader()).run(config)
+done.set()
+sampler.join()
+# flush queued log lines first, the result must be the last line of stdout
+ETLLogger.shutdown()
+print(json.dumps({"rows": NullLoader.rows, "peak_mb": peak[0]}))
+"""
+
+
+def sample_frame(rows):
+    return pl.DataFrame({
+        "id": pl.int_range(rows, eager=True),
+        "name": pl.Series(["alice", "bob", "carol", "dave"] * (rows // 4)),
+        "address": "12 Long Road, Springfield",
+        "paid_amount": pl.Series(["12.345", "abc", "99.999", ""] * (rows // 4)),
+        "is_claimed": pl.Series(["true", "f@lse", "TRUE!", "no"] * (rows // 4)),
+    })
+
+
+def write_csv(path, rows):
+    sample_frame(rows).write_csv(path)
+
+
+def write_json_array(path, rows):
+    sample_frame(rows).write_json(path)
+
+
+def run_streaming(path, source_type="csv"):
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT, path, source_type],
+        cwd=APP_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@unittest.skipUnless(os.path.exists("/proc/self/status"), "needs /proc to sample memory")
+class TestStreamingMemory(unittest.TestCase):
+    """Peak memory of a streaming run does not depend on input size."""
+
+    def test_peak_memory_flat_with_input_size(self):
+        """Test an 8x larger file stays within the documented memory target."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            small_path = os.path.join(tmp_dir, "small.csv")
+            large_path = os.path.join(tmp_dir, "large.csv")
+            write_csv(small_path, 250000)
+            write_csv(large_path, 2000000)
+
+            small = run_streaming(small_path)
+            large = run_streaming(large_path)
+
+        self.assertEqual(small["rows"], 250000)
+        self.assertEqual(large["rows"], 2000000)
+        self.assertLess(large["peak_mb"] - small["peak_mb"], MAX_GROWTH_MB)
+
+    def test_json_array_memory_flat_with_input_size(self):
+        """Test an 8x larger JSON array is parsed without holding the document."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            small_path = os.path.join(tmp_dir, "small.json")
+            large_path = os.path.join(tmp_dir, "large.json")
+            write_json_array(small_path, 200000)
+            write_json_array(large_path, 1600000)
+
+            small = run_streaming(small_path, "json")
+            large = run_streaming(large_path, "json")
+
+        self.assertEqual(small["rows"], 200000)
+        self.assertEqual(large["rows"], 1600000)
+        self.assertLess(large["peak_mb"] - small["peak_mb"], MAX_GROWTH_MB)
+
+
+if __name__ == "__main__":
+    unittest.main()
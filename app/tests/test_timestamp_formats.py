@@ -0,0 +1,82 @@
+"""Unit tests for utils/timestamp_formats.py and learned formats in DefaultTransformer."""
+
+import os
+import tempfile
+import unittest
+import polars as pl
+from src.adapters.transformers.default_transformer import DefaultTransformer
+from src.utils.timestamp_formats import FormatCache, LearnedFormats, learn_formats
+from src.utils.transform_helpers import convert_to_timestamp
+
+VALUES = (
+    ["2024-01-15 10:30:00", "2024-02-01 08:00:00"] * 20
+    + ["1st Jan 2020", "15th March 2021"] * 10
+    + ["05/06/2020", "12/25/2020"] * 5
+    + ["2020-01-01TEST", "garbage", None]
+)
+
+
+class TestLearnFormats(unittest.TestCase):
+    """Test cases for learning formats from a sample."""
+
+    def test_dominant_formats_first(self):
+        """Test formats are ordered by the rows they parse."""
+        learned = learn_formats(pl.Series("created_at", VALUES))
+        self.assertEqual(learned.formats, ["%Y-%m-%d %H:%M:%S%.f", "%d %B %Y", "%m/%d/%Y", "%Y-%m-%d"])
+        self.assertEqual(learned.sampled, len(VALUES) - 1)
+        self.assertAlmostEqual(learned.coverage, 1 - 1 / learned.sampled)
+
+    def test_disagreeing_formats_wait_their_turn(self):
+        """Test a format is only tried once it agrees with dateutil on the rest."""
+        learned = learn_formats(pl.Series("d", ["05/06/2020", "25/12/2020", "03/04/2021"]))
+        self.assertEqual(learned.formats, ["%m/%d/%Y", "%d/%m/%Y"])
+        self.assertEqual(learned.coverage, 1.0)
+
+    def test_nothing_to_learn(self):
+        """Test empty and unparseable samples learn no formats."""
+        self.assertEqual(learn_formats(pl.Series("d", [None], dtype=pl.String)), LearnedFormats())
+        self.assertEqual(learn_formats(pl.Series("d", ["soon", "later"])).formats, [])
+
+
+class TestLearnedTimestampTransforms(unittest.TestCase):
+    """Test cases for convert_to_timestamp with learned formats."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "formats.json")
+        self.df = pl.DataFrame({"created_at": VALUES[:-2]})
+        self.config = {
+            "value_transforms": {"created_at": convert_to_timestamp},
+            "learn_timestamp_formats": True,
+            "timestamp_format_cache": self.cache_path,
+            "timestamp_format_key": "events.csv",
+        }
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parity_with_scalar(self):
+        """Test learned formats give the scalar helper's values, for frames and plans."""
+        expected = [convert_to_timestamp(value) for value in self.df["created_at"]]
+        for records in (self.df, self.df.lazy()):
+            with self.subTest(lazy=isinstance(records, pl.LazyFrame)):
+                result = DefaultTransformer().transform(records, self.config).lazy().collect()
+                self.assertEqual(result["created_at"].to_list(), expected)
+
+    def test_learned_once_and_cached(self):
+        """Test formats are reported once, then reused by batches and later runs."""
+        transformer = DefaultTransformer()
+        with self.assertLogs("Adapters.Transformer.DefaultTransformer", level="INFO") as logs:
+            transformer.transform(self.df, self.config)
+            transformer.transform(self.df.head(3), self.config)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("'created_at' learned timestamp formats", logs.output[0])
+
+        cached = FormatCache(self.cache_path).get("events.csv:created_at")
+        self.assertEqual(cached.formats[0], "%Y-%m-%d %H:%M:%S%.f")
+        with self.assertNoLogs("Adapters.Transformer.DefaultTransformer", level="INFO"):
+            DefaultTransformer().transform(self.df, self.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
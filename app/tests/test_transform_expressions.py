@@ -0,0 +1,145 @@
+"""Parity tests for utils/transform_expressions.py against utils/transform_helpers.py."""
+
+import random
+import unittest
+from datetime import datetime
+import polars as pl
+from src.utils.transform_helpers import (
+    safe_number,
+    truncate_amount,
+    handle_paid_amount,
+    str_to_bool,
+    convert_to_timestamp,
+    convert_date
+)
+from src.utils.transform_expressions import (
+    safe_number_expr,
+    truncate_amount_expr,
+    handle_paid_amount_expr,
+    str_to_bool_expr,
+    convert_to_timestamp_expr,
+    convert_date_expr
+)
+
+NOW = datetime(2030, 6, 1, 12, 0, 0)
+
+
+def evaluate(expr, values, dtype=pl.Utf8):
+    """Evaluate an expression over a single column named 'v'."""
+    df = pl.DataFrame({"v": values}, schema={"v": dtype})
+    return df.select(expr).to_series().to_list()
+
+
+class TestSafeNumberExpr(unittest.TestCase):
+    """Test cases for safe_number_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test numeric strings, garbage and nulls match safe_number."""
+        values = ["123.45", "0.5", "-10.5", "123", "-10", " 7 ", "abc", "", None, "1e3",
+                  "1_000", "1_0_0_0.5", "1__0", "_1", "1_", "inf", "+1.5", "0x10", "1,5"]
+        self.assertEqual(evaluate(safe_number_expr("v"), values),
+                         [safe_number(v) for v in values])
+
+    def test_numeric_column(self):
+        """Test numeric input columns are passed through as floats."""
+        values = [123.45, 0.0, -10.0, None]
+        self.assertEqual(evaluate(safe_number_expr("v"), values, pl.Float64),
+                         [safe_number(v) for v in values])
+
+
+class TestTruncateAmountExpr(unittest.TestCase):
+    """Test cases for truncate_amount_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test flooring to 2 decimals, including negatives."""
+        values = [123.456, 123.459, 123.45, 10.999, 5.123456, -123.456, -10.999, 0.0]
+        self.assertEqual(evaluate(truncate_amount_expr("v"), values, pl.Float64),
+                         [truncate_amount(v) for v in values])
+
+    def test_parity_on_many_values(self):
+        """Test bit-for-bit parity on a large column (vectorized kernels)."""
+        rng = random.Random(42)
+        values = [rng.uniform(-1e6, 1e6) for _ in range(10000)]
+        self.assertEqual(evaluate(truncate_amount_expr("v"), values, pl.Float64),
+                         [truncate_amount(v) for v in values])
+
+
+class TestHandlePaidAmountExpr(unittest.TestCase):
+    """Test cases for handle_paid_amount_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test dirty amount strings match handle_paid_amount."""
+        values = ["19.999", "abc", "", None, "-3.456", "100", "0.01"]
+        self.assertEqual(evaluate(handle_paid_amount_expr("v"), values),
+                         [handle_paid_amount(v) for v in values])
+
+
+class TestStrToBoolExpr(unittest.TestCase):
+    """Test cases for str_to_bool_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test true/false detection after regex cleaning."""
+        values = ["true", "TRUE", "this is true", "false", "FALSEe", "no", "",
+                  "random text", "true123", "123true456", "t-r-u-e", "tr ue"]
+        self.assertEqual(evaluate(str_to_bool_expr("v"), values),
+                         [str_to_bool(v) for v in values])
+
+    def test_null_stays_null(self):
+        """Test nulls are not converted (the scalar helper raises on None)."""
+        self.assertEqual(evaluate(str_to_bool_expr("v"), [None]), [None])
+
+
+class TestConvertToTimestampExpr(unittest.TestCase):
+    """Test cases for convert_to_timestamp_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test native formats and the scalar fallback give the same values."""
+        values = ["2024-01-15 10:30:00", "2024-01-15th 10:30:00", "2024-01-1st 10:30:00",
+                  "20001-01-01", "2024-01-15", "2024-01-15TEST", "Jan 15, 2024",
+                  "1st Jan 2020", "2024-01-15T10:30:00.999"]
+        self.assertEqual(evaluate(convert_to_timestamp_expr("v", now=NOW), values),
+                         [convert_to_timestamp(v) for v in values])
+
+    def test_epoch_uses_now_and_null_stays_null(self):
+        """Test epoch values become the supplied now(), nulls stay null as with map_elements."""
+        result = evaluate(convert_to_timestamp_expr("v", now=NOW), ["1970-01-01", None])
+        self.assertEqual(result, [NOW, None])
+
+    def test_invalid_dates_never_null(self):
+        """Test invalid strings fall back to the current datetime."""
+        start = datetime.now()
+        result = evaluate(convert_to_timestamp_expr("v"), ["invalid date", ""])
+        for value in result:
+            self.assertIsInstance(value, datetime)
+            self.assertGreaterEqual(value, start)
+
+
+class TestConvertDateExpr(unittest.TestCase):
+    """Test cases for convert_date_expr."""
+
+    def test_parity_with_scalar(self):
+        """Test valid dates match convert_date."""
+        values = ["2024-01-15", "2023-12-31", "2000-01-01", "2020-1-1"]
+        self.assertEqual(evaluate(convert_date_expr("v", now=NOW), values),
+                         [convert_date(v) for v in values])
+
+    def test_strict_like_strptime(self):
+        """Test values datetime.strptime refuses fall back to now() here too."""
+        values = [" 2020-01-01", "2020-01-01 ", "+2020-01-01", "20-01-01", "02020-01-01", "2020-02-30"]
+        start = datetime.now()
+        self.assertTrue(all(convert_date(v) >= start for v in values))
+        self.assertEqual(evaluate(convert_date_expr("v", now=NOW), values), [NOW] * len(values))
+
+    def test_invalid_dates_use_now(self):
+        """Test invalid or wrongly formatted dates become now()."""
+        values = ["invalid", "2024-13-45", "01/15/2024", ""]
+        self.assertEqual(evaluate(convert_date_expr("v", now=NOW), values),
+                         [NOW] * len(values))
+
+    def test_null_stays_null(self):
+        """Test nulls are not converted, as with map_elements."""
+        self.assertEqual(evaluate(convert_date_expr("v", now=NOW), [None]), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()